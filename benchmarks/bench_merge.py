@@ -0,0 +1,88 @@
+"""Benchmarks parser.merge_coverage_items across increasing class counts.
+
+Usage:
+    python -m benchmarks.bench_merge
+"""
+
+import time
+from typing import List
+
+from cobertura_console_reporter.coverage_item import CoverageItem
+from cobertura_console_reporter.line_hits import LineHits
+from cobertura_console_reporter.line_set import LineSet
+from cobertura_console_reporter.parser import merge_coverage_items
+
+CLASS_COUNTS = [1_000, 10_000, 100_000]
+SPLITS_PER_CLASS = 3
+REPEAT = 3
+
+
+def _build_line_hits(split: int) -> LineHits:
+    line_hits = LineHits()
+    first_line = split * 10 + 1
+
+    for line_number in range(first_line, first_line + 10):
+        # the first two lines of each split are not covered
+        line_hits.add_line(line_number, int(line_number > first_line + 1))
+
+    line_hits.add_branch(first_line, 1, 2)
+    line_hits.add_branch(first_line + 2, 2, 2)
+    return line_hits
+
+
+def _build_items(class_count: int) -> List[CoverageItem]:
+    # every class appears several times, as Coverlet does for compiler-generated
+    # state machines (e.g. "SomeController/<Run>d__3"); like parsed objects they
+    # carry per-line hit data, so the per-line merge is measured
+    return [
+        CoverageItem(
+            name=f"SampleApp.Namespace{i % 100}.Class{i}",
+            file_name=f"Namespace{i % 100}\\Class{i}.cs",
+            coverable_lines=10,
+            covered_lines=8,
+            uncovered_line_numbers=LineSet([split * 10 + 1, split * 10 + 2]),
+            branches=4,
+            covered_branches=3,
+            uncovered_branch_line_numbers=LineSet([split * 10 + 1]),
+            line_hits={f"Namespace{i % 100}\\Class{i}.cs": _build_line_hits(split)},
+        )
+        for split in range(SPLITS_PER_CLASS)
+        for i in range(class_count)
+    ]
+
+
+def _time_merge(class_count: int) -> float:
+    best = float("inf")
+
+    for _ in range(REPEAT):
+        items = _build_items(class_count)
+
+        start = time.perf_counter()
+        results = merge_coverage_items(items)
+        best = min(best, time.perf_counter() - start)
+
+        assert len(results) == class_count
+        assert results[0].line_hits is not None
+        assert results[0].coverable_lines == 10 * SPLITS_PER_CLASS
+
+    return best
+
+
+def main():
+    """Benchmark entry function"""
+    print(f"{'Classes':>10}  {'Seconds':>10}  {'us/class':>10}  {'Scale':>8}")
+
+    baseline = None
+    for class_count in CLASS_COUNTS:
+        elapsed = _time_merge(class_count)
+        per_class = elapsed / class_count * 1_000_000
+        baseline = baseline or per_class
+
+        print(
+            f"{class_count:>10}  {elapsed:>10.4f}  {per_class:>10.3f}  "
+            f"{per_class / baseline:>7.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""Benchmarks the parser backends against a synthetic coverage file, parsed whole
+and split into spans parsed by a worker process per processor.
+
+Usage:
+    python -m benchmarks.bench_parse
+"""
+
+import os
+import tempfile
+import time
+
+from benchmarks.synthetic import SyntheticConfig, write_report
+from cobertura_console_reporter import parser
+
+REPEAT = 3
+
+
+def _time_parse(file_path: str, backend: str, split: bool) -> float:
+    best = float("inf")
+
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        if split:
+            parser.parse_split_files([file_path], backend=backend, min_span_size=0)
+        else:
+            parser.parse(file_path, backend=backend)
+        best = min(best, time.perf_counter() - start)
+
+    return best
+
+
+def main():
+    """Benchmark entry function"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        file_path = os.path.join(temp_dir, "coverage.cobertura.xml")
+        with open(file_path, "w", encoding="utf-8") as file:
+            write_report(file, SyntheticConfig(packages=20, classes_per_package=200))
+
+        size_mb = os.path.getsize(file_path) / 1024 / 1024
+        print(f"File size: {size_mb:.1f} MB")
+        print(f"Processors: {os.cpu_count()}")
+        print(f"{'Backend':>10}  {'Mode':>6}  {'Seconds':>10}  {'MB/s':>8}")
+
+        for backend in parser.BACKENDS:
+            for split in (False, True):
+                elapsed = _time_parse(file_path, backend, split)
+                mode = "split" if split else "whole"
+                print(
+                    f"{backend:>10}  {mode:>6}  {elapsed:>10.3f}  "
+                    + f"{size_mb / elapsed:>8.1f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""Benchmarks the startup time of ccr invocations against a small coverage file.
+
+Each command is run several times in a fresh process and the best and median wall
+times are reported. Built binaries can be compared against each other and against
+the Python module, e.g. the one-file and one-directory distributions:
+
+Usage:
+    python -m benchmarks.bench_startup
+    python -m benchmarks.bench_startup --command ./ccr-onefile --command dist/ccr/ccr
+"""
+
+import argparse
+import os
+import shlex
+import statistics
+import subprocess
+import sys
+import time
+from typing import List
+
+SAMPLE_FILE = "sample_data/coverage.cobertura.single-package.xml"
+DEFAULT_COMMAND = f"{sys.executable} -m cobertura_console_reporter"
+DEFAULT_RUNS = 20
+
+
+def _time_command(command: List[str], runs: int) -> List[float]:
+    timings = []
+
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(command, check=True, stdout=subprocess.DEVNULL)
+        timings.append(time.perf_counter() - start)
+
+    return timings
+
+
+def main():
+    """Benchmark entry function"""
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument(
+        "--command",
+        dest="commands",
+        action="append",
+        help=f"Command to benchmark, may be repeated (defaults to {DEFAULT_COMMAND}).",
+    )
+    arg_parser.add_argument(
+        "--coverage-file",
+        default=SAMPLE_FILE,
+        help="Coverage file passed to each command.",
+    )
+    arg_parser.add_argument("--runs", type=int, default=DEFAULT_RUNS)
+    args = arg_parser.parse_args()
+
+    commands = args.commands or [DEFAULT_COMMAND]
+    scenarios = [
+        ("--version", ["--version"]),
+        ("report", ["--coverage-file", args.coverage_file]),
+        ("report -o", ["--coverage-file", args.coverage_file, "--output", os.devnull]),
+    ]
+
+    print(f"{'Command':<40}  {'Scenario':<10}  {'Best ms':>8}  {'Median ms':>9}")
+
+    for command in commands:
+        for scenario, scenario_args in scenarios:
+            timings = _time_command(shlex.split(command) + scenario_args, args.runs)
+            print(
+                f"{command[-40:]:<40}  {scenario:<10}  {min(timings) * 1000:>8.1f}  "
+                + f"{statistics.median(timings) * 1000:>9.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,226 @@
+"""Runs the parse, merge and format benchmarks against synthetic reports.
+
+Each stage is measured in a fresh process. Memory is reported twice: the peak of
+Python allocations made by the stage itself (traced with `tracemalloc` in a second,
+untimed run) and the peak RSS of the whole process, which also includes preparing
+the stage's input (e.g. parsing the report that a merge consumes). Results are
+written as JSON and can be compared with a previous run.
+
+Usage:
+    python -m benchmarks.run --sizes 1MB 10MB 100MB --output results.json
+    python -m benchmarks.run --sizes 1MB --compare previous.json
+"""
+
+import argparse
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Optional, Sized
+
+from benchmarks.synthetic import (
+    SyntheticConfig,
+    config_for_size,
+    parse_size,
+    write_report,
+)
+from cobertura_console_reporter import formatter, parser
+from cobertura_console_reporter.formatter_config import FormatterConfig
+
+STAGES = ("parse", "merge", "format")
+DEFAULT_SIZES = ("1MB", "10MB", "100MB")
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Peak resident set size of the current process in MB (None where unsupported)"""
+    try:
+        import resource  # pylint: disable=import-outside-toplevel
+    except ImportError:
+        return None
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # reported in bytes on macOS and in kilobytes elsewhere
+    return peak / 1024 / 1024 if sys.platform == "darwin" else peak / 1024
+
+
+def _prepare_stage(file_path: str, stage: str, backend: str) -> Callable[[], Sized]:
+    if stage == "parse":
+        return lambda: list(parser.iter_parse(file_path, backend=backend))
+
+    if stage == "merge":
+        raw_items = list(parser.iter_parse(file_path, backend=backend))
+        return lambda: parser.merge_coverage_items(raw_items)
+
+    items = parser.parse(file_path, backend=backend)
+
+    def write():
+        formatter.write_coverage_items(items, FormatterConfig.no_color(), io.StringIO())
+        return items
+
+    return write
+
+
+def measure_stage(file_path: str, stage: str, backend: str) -> Dict:
+    """Measures a single stage in the current process.
+
+    The stage runs twice: once timed, and once with `tracemalloc` tracing its
+    allocations, which would otherwise slow down the timed run.
+
+    Args:
+        file_path (str): path to the coverage.cobertura.xml file
+        stage (str): one of `STAGES`
+        backend (str): parser backend
+
+    Returns:
+        Dict: wall time, item throughput and peak traced memory of the stage, and
+            peak RSS of the process.
+    """
+    run_stage = _prepare_stage(file_path, stage, backend)
+
+    start = time.perf_counter()
+    items = run_stage()
+    seconds = time.perf_counter() - start
+    del items
+
+    tracemalloc.start()
+    try:
+        items = run_stage()
+        stage_peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "stage": stage,
+        "backend": backend,
+        "items": len(items),
+        "seconds": seconds,
+        "items_per_second": len(items) / seconds if seconds > 0 else None,
+        "stage_peak_mb": stage_peak / 1024 / 1024,
+        "process_peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def _ensure_report(data_dir: str, size: str, config: SyntheticConfig) -> str:
+    file_path = os.path.join(data_dir, f"coverage.synthetic.{size}.xml")
+
+    if not os.path.exists(file_path):
+        sized_config = config_for_size(parse_size(size), config)
+        with open(file_path, "w", encoding="utf-8", buffering=1024 * 1024) as file:
+            write_report(file, sized_config)
+
+    return file_path
+
+
+def _run_stage_subprocess(file_path: str, stage: str, backend: str) -> Dict:
+    output = subprocess.run(
+        [
+            sys.executable,
+            "-m",
+            "benchmarks.run",
+            "--measure",
+            file_path,
+            "--stage",
+            stage,
+            "--backend",
+            backend,
+        ],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    return json.loads(output)
+
+
+def _print_results(results: List[Dict], previous: Optional[List[Dict]]):
+    previous_by_key = {
+        (r["size"], r["stage"], r["backend"]): r for r in (previous or [])
+    }
+
+    print(
+        f"{'Size':>8}  {'Stage':>7}  {'Backend':>7}  {'Items':>9}  {'Seconds':>9}  "
+        f"{'Items/s':>10}  {'Stage MB':>8}  {'RSS MB':>8}  {'vs prev':>8}"
+    )
+
+    for result in results:
+        before = previous_by_key.get(
+            (result["size"], result["stage"], result["backend"])
+        )
+        change = f"{result['seconds'] / before['seconds']:.2f}x" if before else ""
+        rss = result["process_peak_rss_mb"]
+
+        print(
+            f"{result['size']:>8}  {result['stage']:>7}  {result['backend']:>7}  "
+            f"{result['items']:>9}  {result['seconds']:>9.3f}  "
+            f"{result['items_per_second'] or 0:>10.0f}  "
+            f"{result['stage_peak_mb']:>8.1f}  "
+            f"{rss if rss is not None else float('nan'):>8.1f}  {change:>8}"
+        )
+
+
+def main():
+    """Benchmark entry function"""
+    arg_parser = argparse.ArgumentParser(description="Cobertura Console Reporter")
+    arg_parser.add_argument("--sizes", nargs="+", default=list(DEFAULT_SIZES))
+    arg_parser.add_argument("--stages", nargs="+", choices=STAGES, default=STAGES)
+    arg_parser.add_argument(
+        "--backends", nargs="+", choices=parser.BACKENDS, default=parser.BACKENDS
+    )
+    arg_parser.add_argument("--data-dir", default=".benchmark-data")
+    arg_parser.add_argument("--output", default="benchmark-results.json")
+    arg_parser.add_argument("--compare", default=None)
+    arg_parser.add_argument("--lines-per-class", type=int, default=50)
+    arg_parser.add_argument("--branch-density", type=float, default=0.2)
+    arg_parser.add_argument("--split-class-ratio", type=float, default=0.3)
+    # internal: measure one stage and print its result as JSON
+    arg_parser.add_argument("--measure", help=argparse.SUPPRESS)
+    arg_parser.add_argument("--stage", help=argparse.SUPPRESS)
+    arg_parser.add_argument("--backend", help=argparse.SUPPRESS)
+    args = arg_parser.parse_args()
+
+    if args.measure:
+        print(json.dumps(measure_stage(args.measure, args.stage, args.backend)))
+        return
+
+    config = SyntheticConfig(
+        lines_per_class=args.lines_per_class,
+        branch_density=args.branch_density,
+        split_class_ratio=args.split_class_ratio,
+    )
+    os.makedirs(args.data_dir, exist_ok=True)
+
+    results = []
+    for size in args.sizes:
+        file_path = _ensure_report(args.data_dir, size, config)
+
+        for stage in args.stages:
+            for backend in args.backends:
+                result = _run_stage_subprocess(file_path, stage, backend)
+                result.update(size=size, file_bytes=os.path.getsize(file_path))
+                results.append(result)
+
+    previous = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as file:
+            previous = json.load(file)["results"]
+
+    _print_results(results, previous)
+
+    with open(args.output, "w", encoding="utf-8") as file:
+        json.dump(
+            {
+                "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "results": results,
+            },
+            file,
+            indent=2,
+        )
+
+
+if __name__ == "__main__":
+    main()
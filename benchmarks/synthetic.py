@@ -0,0 +1,170 @@
+"""Writes deterministic synthetic coverage.cobertura.xml files for benchmarks.
+
+Usage:
+    python -m benchmarks.synthetic --size 100MB --output coverage.cobertura.xml
+"""
+
+import argparse
+import io
+import math
+import random
+import re
+from dataclasses import dataclass, replace
+from typing import TextIO
+
+SIZE_UNITS = {"B": 1, "KB": 1024, "MB": 1024**2, "GB": 1024**3}
+
+
+@dataclass
+class SyntheticConfig:
+    """Shape of a synthetic Cobertura report."""
+
+    packages: int = 10
+    classes_per_package: int = 100
+    lines_per_class: int = 50
+    branch_density: float = 0.2
+    split_class_ratio: float = 0.3
+    seed: int = 0
+
+    @property
+    def classes(self) -> int:
+        """Total number of .NET classes (excluding compiler-generated splits)"""
+        return self.packages * self.classes_per_package
+
+
+def write_report(stream: TextIO, config: SyntheticConfig):
+    """Writes a synthetic Cobertura report.
+
+    The same config always produces the same file. A share of the classes
+    (`split_class_ratio`) is followed by a compiler-generated state machine class
+    (e.g. "Class1/<Run>d__3"), some of whose lines overlap the parent class, the way
+    Coverlet reports async methods.
+
+    Args:
+        stream (TextIO): Stream to write to.
+        config (SyntheticConfig): Shape of the report.
+    """
+    rng = random.Random(config.seed)
+    write = stream.write
+
+    write('<?xml version="1.0" encoding="utf-8"?>\n')
+    write('<coverage line-rate="0" branch-rate="0" version="1.9">\n  <packages>\n')
+
+    for package in range(config.packages):
+        write(f'    <package name="Synthetic.Package{package}">\n      <classes>\n')
+
+        for cls in range(config.classes_per_package):
+            name = f"Synthetic.Package{package}.Namespace{cls % 10}.Class{cls}"
+            file_name = f"Namespace{cls % 10}\\Class{cls}.cs"
+            _write_class(write, rng, config, name, file_name, 1)
+
+            if rng.random() < config.split_class_ratio:
+                first_line = config.lines_per_class // 2
+                _write_class(
+                    write, rng, config, f"{name}/&lt;Run&gt;d__3", file_name, first_line
+                )
+
+        write("      </classes>\n    </package>\n")
+
+    write("  </packages>\n</coverage>\n")
+
+
+def config_for_size(target_bytes: int, config: SyntheticConfig) -> SyntheticConfig:
+    """Scales the number of classes of a config so the report is about a given size.
+
+    Args:
+        target_bytes (int): Approximate file size to produce.
+        config (SyntheticConfig): Config providing every other setting.
+
+    Returns:
+        SyntheticConfig: Config with `classes_per_package` adjusted.
+    """
+    sample_classes = 50
+    sample = io.StringIO()
+    write_report(
+        sample, replace(config, packages=1, classes_per_package=sample_classes)
+    )
+    bytes_per_class = len(sample.getvalue().encode()) / sample_classes
+
+    classes = max(1, round(target_bytes / bytes_per_class))
+    packages = max(1, min(config.packages, classes))
+
+    return replace(
+        config,
+        packages=packages,
+        classes_per_package=math.ceil(classes / packages),
+    )
+
+
+def parse_size(value: str) -> int:
+    """Parses a size such as "512KB", "100MB" or "2GB" into a number of bytes."""
+    match = re.fullmatch(r"\s*(\d+(?:\.\d+)?)\s*([KMG]?B)?\s*", value.upper())
+    if not match:
+        raise ValueError(f"Invalid size: {value}")
+
+    return int(float(match.group(1)) * SIZE_UNITS[match.group(2) or "B"])
+
+
+# pylint: disable-next=too-many-arguments,too-many-positional-arguments
+def _write_class(write, rng, config, name, file_name, first_line):
+    lines = _build_lines(rng, config, first_line)
+
+    write(f'        <class name="{name}" filename="{file_name}">\n')
+    write('          <methods>\n            <method name="Run">\n')
+    write(f"              <lines>\n{lines}              </lines>\n")
+    write("            </method>\n          </methods>\n")
+    write(f"          <lines>\n{lines}          </lines>\n")
+    write("        </class>\n")
+
+
+def _build_lines(rng: random.Random, config: SyntheticConfig, first_line: int) -> str:
+    lines = []
+
+    for number in range(first_line, first_line + config.lines_per_class):
+        hits = rng.choice((0, 1, 2, 5))
+
+        if rng.random() >= config.branch_density:
+            lines.append(f'<line number="{number}" hits="{hits}" branch="False" />')
+            continue
+
+        covered = rng.randint(0, 2)
+        lines.append(
+            f'<line number="{number}" hits="{hits}" branch="True" '
+            f'condition-coverage="{covered * 50}% ({covered}/2)">'
+            f'<conditions><condition number="0" type="jump" '
+            f'coverage="{covered * 50}%" /></conditions></line>'
+        )
+
+    return "".join(f"                {line}\n" for line in lines)
+
+
+def main():
+    """Generator entry function"""
+    arg_parser = argparse.ArgumentParser(description="Synthetic Cobertura generator")
+    arg_parser.add_argument("--output", "-o", required=True)
+    arg_parser.add_argument("--size", type=parse_size, default=None)
+    arg_parser.add_argument("--packages", type=int, default=10)
+    arg_parser.add_argument("--classes-per-package", type=int, default=100)
+    arg_parser.add_argument("--lines-per-class", type=int, default=50)
+    arg_parser.add_argument("--branch-density", type=float, default=0.2)
+    arg_parser.add_argument("--split-class-ratio", type=float, default=0.3)
+    arg_parser.add_argument("--seed", type=int, default=0)
+    args = arg_parser.parse_args()
+
+    config = SyntheticConfig(
+        packages=args.packages,
+        classes_per_package=args.classes_per_package,
+        lines_per_class=args.lines_per_class,
+        branch_density=args.branch_density,
+        split_class_ratio=args.split_class_ratio,
+        seed=args.seed,
+    )
+    if args.size is not None:
+        config = config_for_size(args.size, config)
+
+    with open(args.output, "w", encoding="utf-8", buffering=1024 * 1024) as file:
+        write_report(file, config)
+
+
+if __name__ == "__main__":
+    main()
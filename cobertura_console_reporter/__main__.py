@@ -1,34 +1,433 @@
 """Application entrypoint"""
+
 import argparse
+import contextlib
+import glob
+import io
+import itertools
 import os
 import sys
-import importlib.metadata
+from typing import (
+    TYPE_CHECKING,
+    Callable,
+    ContextManager,
+    Dict,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    TextIO,
+)
 
 from cobertura_console_reporter import parser as coverage_parser
-from cobertura_console_reporter import formatter
+from cobertura_console_reporter import formatter, profiling, renderers, top
+from cobertura_console_reporter.coverage_input import STDIN_PATH, is_file_path
+from cobertura_console_reporter.coverage_item import CoverageItem
+from cobertura_console_reporter.coverage_table import CoverageTable
+from cobertura_console_reporter.diff import CoverageDiff, diff_coverage_items
 from cobertura_console_reporter.formatter_config import FormatterConfig
+from cobertura_console_reporter.metrics import ReportMetrics, compute_metrics
+from cobertura_console_reporter.namespace_tree import collapse_namespace
+from cobertura_console_reporter.patch import (
+    PatchCoverage,
+    compute_patch_coverage,
+    parse_unified_diff,
+)
+from cobertura_console_reporter.thresholds import (
+    Thresholds,
+    ThresholdViolation,
+    exit_code,
+    load_thresholds,
+    parse_threshold_spec,
+)
+
+if TYPE_CHECKING:  # pragma: no cover
+    from cobertura_console_reporter.cache import ParseCache
+
+OUTPUT_BUFFER_SIZE = 1024 * 1024
+CLEAR_SCREEN = "\033[2J\033[H"
+CONSOLE_FORMAT = "console"
+INDEX_COMMAND = "index"
+SERVE_COMMAND = "serve"
+
+# parses coverage files for the arguments of a report, e.g. through a server cache
+ParseEach = Callable[[argparse.Namespace, List[str]], Dict[str, List[CoverageItem]]]
+
 
 def _get_version() -> str:
+    # importlib.metadata scans installed distributions, so it is only imported when
+    # the version is displayed.
+    import importlib.metadata  # pylint: disable=import-outside-toplevel
+
     try:
         return importlib.metadata.version("cobertura-console-reporter")
     except importlib.metadata.PackageNotFoundError:
         return "0.0.0+dev"
 
+
+def _expand_coverage_files(patterns: list[str]) -> list[str]:
+    file_paths = []
+
+    for pattern in patterns:
+        if any(char in pattern for char in "*?["):
+            file_paths.extend(sorted(glob.glob(pattern, recursive=True)) or [pattern])
+        else:
+            file_paths.append(pattern)
+
+    return list(dict.fromkeys(file_paths))
+
+
+def _check_search_dirs(arg_parser: argparse.ArgumentParser, args: argparse.Namespace):
+    if not args.coverage_files and not args.search_dirs:
+        arg_parser.error("one of --coverage-file or --search-dir is required")
+
+    if args.newest_per_project and not args.search_dirs:
+        arg_parser.error("--newest-per-project requires --search-dir")
+
+    for directory in args.search_dirs or []:
+        if not os.path.isdir(directory):
+            print(f"Directory not found: {directory}")
+            sys.exit(1)
+
+
+def _check_report_options(
+    arg_parser: argparse.ArgumentParser,
+    args: argparse.Namespace,
+    coverage_files: List[str],
+):
+    baseline_files = [args.baseline_file] if args.baseline_file is not None else []
+    patch_files = [args.patch_file] if args.patch_file is not None else []
+
+    if args.watch and STDIN_PATH in coverage_files + baseline_files + patch_files:
+        arg_parser.error("--watch cannot read coverage or patch files from stdin")
+
+    if (coverage_files + baseline_files + patch_files).count(STDIN_PATH) > 1:
+        arg_parser.error("stdin (-) can only be read once")
+
+    if args.baseline_file is not None and args.output_format != CONSOLE_FORMAT:
+        arg_parser.error("--baseline only supports the console format")
+
+    if args.patch_file is not None and args.output_format != CONSOLE_FORMAT:
+        arg_parser.error("--patch only supports the console format")
+
+    if args.patch_file is not None and args.top is not None:
+        arg_parser.error("--top cannot be combined with --patch")
+
+    if args.depth is not None and args.depth < 1:
+        arg_parser.error("--depth must be at least 1")
+
+    if args.jobs is not None and args.jobs < 1:
+        arg_parser.error("--jobs must be at least 1")
+
+    if args.top is not None and args.top < 1:
+        arg_parser.error("--top must be at least 1")
+
+
+def _list_coverage_files(args: argparse.Namespace) -> List[str]:
+    file_paths = _expand_coverage_files(args.coverage_files or [])
+    if args.search_dirs:
+        # pylint: disable-next=import-outside-toplevel
+        from cobertura_console_reporter.discovery import find_coverage_files
+
+        file_paths += find_coverage_files(args.search_dirs, args.newest_per_project)
+
+    return list(dict.fromkeys(file_paths))
+
+
 def main():
     """Application entry function"""
+    argv = sys.argv[1:]
+
+    if argv[:1] == [INDEX_COMMAND]:
+        _index(argv[1:])
+    elif argv[:1] == [SERVE_COMMAND]:
+        _serve(argv[1:])
+    else:
+        _run(argv)
+
+
+def _run(argv: List[str], parse_each: Optional[ParseEach] = None):
+    arg_parser = _build_arg_parser()
+    args = arg_parser.parse_args(argv)
+
+    if parse_each is not None and args.watch:
+        arg_parser.error("--watch cannot be used through a report server")
+
+    if parse_each is None and args.server is not None and _can_use_server(args, argv):
+        _exit_with_server_report(args, argv)
+
+    if args.watch and (args.profile is not None or args.profile_dump is not None):
+        arg_parser.error("--profile cannot be combined with --watch")
+
+    profiler = _start_profiler(args)
+
+    try:
+        report = _run_report(arg_parser, args, parse_each)
+        if report is None:
+            return
+
+        _output_report(report, args)
+    finally:
+        # also on early exits, which would otherwise leave a report server profiling
+        # every later request
+        _stop_profiler(profiler, args)
+
+    sys.exit(_report_violations(report.violations))
+
+
+# pylint: disable-next=too-many-locals
+def _run_report(
+    arg_parser: argparse.ArgumentParser,
+    args: argparse.Namespace,
+    parse_each: Optional[ParseEach],
+) -> Optional["_Report"]:
+    _check_search_dirs(arg_parser, args)
+
+    with profiling.stage(profiling.STAGE_READ) as record:
+        coverage_files = _list_coverage_files(args)
+        record.items += len(coverage_files)
+
+    if not coverage_files:
+        print(f"No coverage files found in: {', '.join(args.search_dirs)}")
+        sys.exit(1)
+
+    baseline_files = [args.baseline_file] if args.baseline_file is not None else []
+    patch_files = [args.patch_file] if args.patch_file is not None else []
+
+    _check_report_options(arg_parser, args, coverage_files)
+
+    for file_path in coverage_files + baseline_files + patch_files:
+        if is_file_path(file_path) and not os.path.exists(file_path):
+            print(f"File not found: {file_path}")
+            sys.exit(1)
+
+    thresholds = _build_thresholds(arg_parser, args)
+
+    cache = None
+    if args.cache_dir is not None:
+        # pylint: disable-next=import-outside-toplevel
+        from cobertura_console_reporter.cache import ParseCache, default_cache_dir
+
+        cache = ParseCache(
+            args.cache_dir or default_cache_dir(), hash_content=args.cache_hash
+        )
+
+    if args.watch:
+        _watch(args, cache, thresholds)
+        return None
+
+    def parse_files(file_paths):
+        if parse_each is not None:
+            parsed = parse_each(args, file_paths)
+            with profiling.stage(profiling.STAGE_MERGE) as record:
+                coverage_items = coverage_parser.merge_coverage_items(
+                    itertools.chain.from_iterable(
+                        parsed[file_path] for file_path in file_paths
+                    )
+                )
+                record.items += len(coverage_items)
+            return coverage_items
+
+        return coverage_parser.parse_files(
+            file_paths,
+            args.package_name,
+            args.jobs,
+            cache,
+            args.parser_backend,
+            args.split,
+            args.class_pattern,
+        )
+
+    try:
+        return _create_report(args, coverage_files, parse_files, thresholds)
+    except ValueError as ex:
+        # e.g. a zstd-compressed file without the zstandard package installed
+        print(ex, file=sys.stderr)
+        sys.exit(1)
+
+
+class _VersionAction(argparse.Action):
+    """Prints the version, which is only resolved when requested."""
+
+    def __init__(self, option_strings, dest=argparse.SUPPRESS, **kwargs):
+        super().__init__(
+            option_strings, dest=dest, default=argparse.SUPPRESS, nargs=0, **kwargs
+        )
+
+    def __call__(self, parser, namespace, values, option_string=None):
+        print(f"{parser.prog} {_get_version()}")
+        parser.exit()
+
+
+def _index(argv: List[str]):
+    # pylint: disable-next=import-outside-toplevel
+    from cobertura_console_reporter.file_index import index_path, write_index
+
+    arg_parser = argparse.ArgumentParser(
+        prog=f"{os.path.basename(sys.argv[0])} {INDEX_COMMAND}",
+        description="Writes a sidecar index of the byte offsets of the packages and "
+        + "classes of coverage files, so --package and --class only read the "
+        + "matching parts of the files. Indexes are ignored once a file changes.",
+    )
+    arg_parser.add_argument(
+        "coverage_files",
+        nargs="+",
+        help="Path(s) or glob pattern(s) of uncompressed coverage.cobertura.xml "
+        + "files to index.",
+    )
+    args = arg_parser.parse_args(argv)
+
+    for file_path in _expand_coverage_files(args.coverage_files):
+        if not os.path.exists(file_path):
+            print(f"File not found: {file_path}")
+            sys.exit(1)
+
+        try:
+            index = write_index(file_path)
+        except ValueError as ex:
+            print(ex, file=sys.stderr)
+            sys.exit(1)
+
+        print(
+            f"Indexed {len(index.packages)} packages and {index.class_count} classes "
+            + f"of {file_path} to {index_path(file_path)}"
+        )
+
+
+def _serve(argv: List[str]):
+    if not _supports_unix_sockets():
+        print("Serving reports requires Unix domain sockets", file=sys.stderr)
+        sys.exit(1)
+
+    # pylint: disable-next=import-outside-toplevel
+    from cobertura_console_reporter import server
+
+    arg_parser = argparse.ArgumentParser(
+        prog=f"{os.path.basename(sys.argv[0])} {SERVE_COMMAND}",
+        description="Serves reports requested with --server over a Unix domain "
+        + "socket, keeping parsed coverage files in memory between requests.",
+    )
+    arg_parser.add_argument(
+        "--socket",
+        dest="socket_path",
+        required=False,
+        help="[Optional] Path of the socket to listen on (defaults to a socket in "
+        + "the user runtime directory).",
+    )
+    arg_parser.add_argument(
+        "--max-items",
+        dest="max_items",
+        type=int,
+        default=server.DEFAULT_MAX_ITEMS,
+        help="[Optional] Maximum number of parsed classes kept in memory, after "
+        + "which the least recently used files are evicted (defaults to "
+        + f"{server.DEFAULT_MAX_ITEMS}).",
+    )
+    args = arg_parser.parse_args(argv)
+
+    socket_path = args.socket_path or server.default_socket_path()
+    cache = server.ParsedFileCache(args.max_items)
+
+    def parse_each(report_args: argparse.Namespace, file_paths: List[str]):
+        return cache.parse_each(
+            file_paths,
+            report_args.package_name,
+            report_args.class_pattern,
+            lambda missing: coverage_parser.parse_each_file(
+                missing,
+                report_args.package_name,
+                report_args.jobs,
+                None,
+                report_args.parser_backend,
+                report_args.split,
+                report_args.class_pattern,
+            ),
+        )
+
+    print(f"Serving reports on {socket_path}. Press Ctrl+C to stop.")
+    sys.stdout.flush()
+
+    try:
+        server.serve(socket_path, lambda report_argv: _run(report_argv, parse_each))
+    except RuntimeError as error:
+        print(error, file=sys.stderr)
+        sys.exit(1)
+    except KeyboardInterrupt:
+        pass
+
+
+def _supports_unix_sockets() -> bool:
+    # the server module defines its server on socketserver.UnixStreamServer, which
+    # platforms without Unix domain sockets (e.g. Windows) do not have, so it can only
+    # be imported once this returns True
+    # pylint: disable-next=import-outside-toplevel
+    import socket
+
+    return hasattr(socket, "AF_UNIX")
+
+
+def _can_use_server(args: argparse.Namespace, argv: List[str]) -> bool:
+    # the server cannot read the client's stdin, nor keep watching files for it
+    return not args.watch and STDIN_PATH not in argv
+
+
+def _exit_with_server_report(args: argparse.Namespace, argv: List[str]):
+    # returns without output when no server answered, to parse in-process instead
+    if not _supports_unix_sockets():
+        return
+
+    # pylint: disable-next=import-outside-toplevel
+    from cobertura_console_reporter import server
+
+    response = server.request_report(
+        args.server or server.default_socket_path(), argv, os.getcwd()
+    )
+    if response is None:
+        return
+
+    sys.stdout.write(response.stdout)
+    sys.stderr.write(response.stderr)
+    sys.exit(response.exit_code)
+
+
+def _build_arg_parser() -> argparse.ArgumentParser:
     arg_parser = argparse.ArgumentParser(description="Cobertura Console Reporter")
 
     arg_parser.add_argument(
         "--version",
-        action="version",
-        version=f"%(prog)s {_get_version()}",
+        action=_VersionAction,
+        help="show program's version number and exit",
     )
     arg_parser.add_argument(
         "--coverage-file",
         "-f",
-        dest="coverage_file",
-        required=True,
-        help="Path to the coverage.cobertura.xml file produced by Coverlet.",
+        dest="coverage_files",
+        required=False,
+        nargs="+",
+        action="extend",
+        help="Path(s) or glob pattern(s) of coverage.cobertura.xml files produced by "
+        + "Coverlet, or - to read from stdin. gzip, xz and zstd compressed files are "
+        + "decompressed on the fly. Results from multiple files are merged.",
+    )
+    arg_parser.add_argument(
+        "--search-dir",
+        "-d",
+        dest="search_dirs",
+        required=False,
+        nargs="+",
+        action="extend",
+        help="[Optional] Directories searched recursively for coverage.cobertura.xml "
+        + "files (e.g. TestResults directories), skipping bin, obj and node_modules "
+        + "directories. Found files are merged with the --coverage-file files.",
+    )
+    arg_parser.add_argument(
+        "--newest-per-project",
+        dest="newest_per_project",
+        action="store_true",
+        required=False,
+        help="[Optional] Only reports the most recently modified coverage file found "
+        + "with --search-dir for each test project (the parent of a TestResults "
+        + "directory).",
     )
     arg_parser.add_argument(
         "--package",
@@ -37,26 +436,456 @@ def main():
         required=False,
         help="[Optional] Name of the .NET package (project) to display output for.",
     )
+    arg_parser.add_argument(
+        "--class",
+        dest="class_pattern",
+        required=False,
+        help="[Optional] Only displays classes whose full name matches this pattern "
+        + "(e.g. 'App.Services.*').",
+    )
     arg_parser.add_argument(
         "--warning-threshold",
         "-w",
         dest="warning_threshold",
+        type=float,
         required=False,
         help="[Optional] Coverage percentage to display as a warning (defaults to 90).",
         default=90,
     )
-    args = arg_parser.parse_args()
+    arg_parser.add_argument(
+        "--fail-under",
+        dest="fail_under",
+        action="append",
+        default=[],
+        metavar="[LEVEL:]METRIC=PERCENT",
+        help="[Optional] Fails with a non-zero exit code when coverage is below a "
+        + "threshold, e.g. line=80 (report total), package:branch=70, "
+        + "namespace:line=60 or class:line=50. May be repeated.",
+    )
+    arg_parser.add_argument(
+        "--thresholds-file",
+        dest="thresholds_file",
+        required=False,
+        help="[Optional] JSON file of fail thresholds per level, with per-namespace "
+        + "overrides. --fail-under values take precedence.",
+    )
+    arg_parser.add_argument(
+        "--jobs",
+        "-j",
+        dest="jobs",
+        type=int,
+        required=False,
+        help="[Optional] Number of coverage files to parse in parallel "
+        + "(defaults to the number of processors).",
+    )
+    arg_parser.add_argument(
+        "--parser-backend",
+        dest="parser_backend",
+        choices=coverage_parser.BACKENDS,
+        default=coverage_parser.DEFAULT_BACKEND,
+        help="[Optional] XML parser used to read coverage files (defaults to etree).",
+    )
+    arg_parser.add_argument(
+        "--split",
+        dest="split",
+        action="store_true",
+        help="[Optional] Splits large coverage files at package and class boundaries "
+        + "so each file is parsed by several processes.",
+    )
+    arg_parser.add_argument(
+        "--cache-dir",
+        dest="cache_dir",
+        nargs="?",
+        const="",
+        required=False,
+        help="[Optional] Caches parsed coverage files in this directory so unchanged "
+        + "files are not parsed again (defaults to the user cache directory when "
+        + "no directory is given).",
+    )
+    arg_parser.add_argument(
+        "--cache-hash",
+        dest="cache_hash",
+        action="store_true",
+        help="[Optional] Also compares file content hashes when looking up cached "
+        + "results.",
+    )
+    arg_parser.add_argument(
+        "--baseline",
+        "-b",
+        dest="baseline_file",
+        required=False,
+        help="[Optional] Path to a previous coverage.cobertura.xml file. Only classes "
+        + "whose coverage changed since then are displayed, with the change in "
+        + "coverage. Console format only.",
+    )
+    arg_parser.add_argument(
+        "--output",
+        "-o",
+        dest="output_file",
+        required=False,
+        help="[Optional] Writes the report to this file (without colors) instead of "
+        + "the console.",
+    )
+    arg_parser.add_argument(
+        "--format",
+        dest="output_format",
+        choices=(CONSOLE_FORMAT, *renderers.RENDERERS),
+        default=CONSOLE_FORMAT,
+        help="[Optional] Output format: a console table, JSON lines, CSV, a Markdown "
+        + "table or JUnit XML (defaults to console).",
+    )
+    arg_parser.add_argument(
+        "--depth",
+        dest="depth",
+        type=int,
+        required=False,
+        help="[Optional] Collapses namespaces deeper than this number of segments "
+        + "into their parent namespace, whose row then totals its whole subtree.",
+    )
+    arg_parser.add_argument(
+        "--top",
+        dest="top",
+        type=int,
+        required=False,
+        help="[Optional] Only displays the N worst-covered classes (or namespaces, "
+        + "see --top-level), worst first.",
+    )
+    arg_parser.add_argument(
+        "--sort-by",
+        dest="sort_by",
+        choices=tuple(top.SORT_KEYS),
+        default=top.SORT_UNCOVERED_LINES,
+        help="[Optional] Ranking used by --top (defaults to uncovered-lines).",
+    )
+    arg_parser.add_argument(
+        "--top-level",
+        dest="top_level",
+        choices=(renderers.ROW_CLASS, renderers.ROW_NAMESPACE),
+        default=renderers.ROW_CLASS,
+        help="[Optional] Ranks classes or namespaces with --top (defaults to class).",
+    )
+    arg_parser.add_argument(
+        "--patch",
+        dest="patch_file",
+        required=False,
+        help="[Optional] Path to a unified diff (e.g. the output of git diff), or - to "
+        + "read it from stdin. Displays the coverage of the changed lines only.",
+    )
+    arg_parser.add_argument(
+        "--profile",
+        dest="profile",
+        nargs="?",
+        const=profiling.FORMAT_TABLE,
+        choices=profiling.FORMATS,
+        required=False,
+        help="[Optional] Writes the wall time, CPU time, peak memory and item count "
+        + "of each stage (read, parse, merge, aggregate, render, write) to stderr, "
+        + "as a table (default) or JSON.",
+    )
+    arg_parser.add_argument(
+        "--profile-dump",
+        dest="profile_dump",
+        required=False,
+        help="[Optional] Writes cProfile statistics of the run to this file, for "
+        + "pstats or snakeviz.",
+    )
+    arg_parser.add_argument(
+        "--server",
+        dest="server",
+        nargs="?",
+        const="",
+        required=False,
+        help="[Optional] Requests the report from a server started with the serve "
+        + "command, listening on this socket (defaults to the default socket of "
+        + "serve). Falls back to parsing in-process when no server is running.",
+    )
+    arg_parser.add_argument(
+        "--watch",
+        dest="watch",
+        action="store_true",
+        help="[Optional] Keeps running and renders the report again whenever the "
+        + "coverage files change. Only changed files are parsed again.",
+    )
+    return arg_parser
 
-    if not os.path.exists(args.coverage_file):
-        print(f"File not found: {args.coverage_file}")
-        sys.exit(1)
 
-    coverage_items = coverage_parser.parse(args.coverage_file, args.package_name)
-    formatted_result = formatter.format_coverage_items(
-        coverage_items, FormatterConfig.default()
+class _Report(NamedTuple):
+    coverage_table: CoverageTable
+    metrics: Optional[ReportMetrics] = None
+    diff: Optional[CoverageDiff] = None
+    patch_coverage: Optional[List[PatchCoverage]] = None
+    violations: Sequence[ThresholdViolation] = ()
+    top_rows: Optional[List[renderers.ReportRow]] = None
+
+
+def _start_profiler(args: argparse.Namespace) -> Optional[profiling.Profiler]:
+    if args.profile is None and args.profile_dump is None:
+        return None
+
+    profiler = profiling.Profiler(
+        trace_memory=args.profile is not None, cprofile_path=args.profile_dump
     )
+    profiler.start()
+    return profiler
+
+
+def _stop_profiler(profiler: Optional[profiling.Profiler], args: argparse.Namespace):
+    if profiler is None:
+        return
+
+    profiler.stop()
+
+    # written to stderr so the report itself can still be piped
+    if args.profile == profiling.FORMAT_JSON:
+        sys.stderr.write(profiling.format_json(profiler))
+    elif args.profile is not None:
+        sys.stderr.write(profiling.format_table(profiler))
+
+
+def _build_thresholds(
+    arg_parser: argparse.ArgumentParser, args: argparse.Namespace
+) -> Thresholds:
+    try:
+        thresholds = Thresholds()
+        if args.thresholds_file is not None:
+            thresholds = load_thresholds(args.thresholds_file)
+
+        for spec in args.fail_under:
+            thresholds.set(*parse_threshold_spec(spec))
+    except (OSError, ValueError, TypeError) as error:
+        arg_parser.error(str(error))
+
+    return thresholds
+
+
+def _create_report(
+    args: argparse.Namespace,
+    coverage_files: List[str],
+    parse_files: Callable[[List[str]], List[CoverageItem]],
+    thresholds: Thresholds,
+) -> _Report:
+    coverage_items = parse_files(coverage_files)
+
+    with profiling.stage(profiling.STAGE_AGGREGATE) as record:
+        coverage_table = CoverageTable.from_items(coverage_items)
+        # releases the merged objects, the table's columns hold their values
+        del coverage_items
+        metrics = compute_metrics(coverage_table, thresholds, args.depth)
+        record.items += len(coverage_table)
+
+    if args.patch_file is not None:
+        with profiling.stage(profiling.STAGE_READ):
+            with _open_text(args.patch_file) as patch:
+                changed_lines = parse_unified_diff(patch)
+
+        with profiling.stage(profiling.STAGE_AGGREGATE):
+            patch_coverage = compute_patch_coverage(coverage_table, changed_lines)
+
+        return _Report(
+            CoverageTable(),
+            patch_coverage=patch_coverage,
+            violations=metrics.violations,
+        )
+
+    violations = metrics.violations
+    diff = None
+
+    if args.baseline_file is not None:
+        baseline_items = parse_files([args.baseline_file])
+
+        with profiling.stage(profiling.STAGE_AGGREGATE):
+            diff = diff_coverage_items(coverage_table, baseline_items)
+
+    top_rows = None
+    if args.top is not None:
+        with profiling.stage(profiling.STAGE_AGGREGATE):
+            top_rows = _select_top_rows(args, coverage_table, metrics, diff)
+
+    return _Report(
+        coverage_table, metrics, diff, violations=violations, top_rows=top_rows
+    )
+
+
+def _select_top_rows(
+    args: argparse.Namespace,
+    coverage_table: CoverageTable,
+    metrics: ReportMetrics,
+    diff: Optional[CoverageDiff],
+) -> List[renderers.ReportRow]:
+    if args.top_level == renderers.ROW_NAMESPACE:
+        rows = renderers.iter_namespace_rows(metrics, args.depth)
+    else:
+        rows = renderers.iter_class_rows(coverage_table)
+
+    if diff is not None:
+        # only ranks the classes that changed, or the namespaces displaying them
+        if args.top_level == renderers.ROW_NAMESPACE:
+            shown_names = {
+                collapse_namespace(item.class_namespace, args.depth)
+                for item in diff.changed
+            }
+        else:
+            shown_names = {item.name for item in diff.changed}
+        rows = (row for row in rows if row.name in shown_names)
+
+    return top.select_top_rows(rows, args.top, args.sort_by)
+
+
+def _report_violations(violations: Sequence[ThresholdViolation]) -> int:
+    for violation in violations:
+        print(f"Coverage threshold not met: {violation}", file=sys.stderr)
+
+    return exit_code(violations)
+
+
+def _watch(
+    args: argparse.Namespace, cache: Optional["ParseCache"], thresholds: Thresholds
+):
+    # pylint: disable-next=import-outside-toplevel
+    from cobertura_console_reporter.watch import FileWatcher, ParsedFiles
+
+    extra_files = [
+        file_path
+        for file_path in (args.baseline_file, args.patch_file)
+        if file_path is not None
+    ]
+
+    def list_coverage_files():
+        return [
+            file_path
+            for file_path in _list_coverage_files(args)
+            if os.path.exists(file_path)
+        ]
+
+    parsed_files = ParsedFiles(
+        lambda file_paths: coverage_parser.parse_each_file(
+            file_paths,
+            args.package_name,
+            args.jobs,
+            cache,
+            args.parser_backend,
+            args.split,
+            args.class_pattern,
+        )
+    )
+
+    with FileWatcher(lambda: list_coverage_files() + extra_files) as watcher:
+        try:
+            while True:
+                coverage_files = list_coverage_files()
+                parsed_files.retain(coverage_files + extra_files)
+
+                if args.output_file is None and sys.stdout.isatty():
+                    sys.stdout.write(CLEAR_SCREEN)
+
+                try:
+                    report = _create_report(
+                        args, coverage_files, parsed_files.parse, thresholds
+                    )
+                    _output_report(report, args)
+                    _report_violations(report.violations)
+                except Exception as error:  # pylint: disable=broad-exception-caught
+                    print(f"Failed to create report: {error}")
+
+                print(
+                    f"Watching {len(coverage_files)} coverage file(s) for changes. "
+                    + "Press Ctrl+C to stop."
+                )
+                sys.stdout.flush()
+                watcher.wait_for_changes()
+        except KeyboardInterrupt:
+            pass
+
+
+def _output_report(report: _Report, args: argparse.Namespace):
+    if args.output_file is None:
+        colorize = args.output_format == CONSOLE_FORMAT
+        config = FormatterConfig(colorize, args.warning_threshold, args.depth)
+        _render_report(report, config, args.output_format, sys.stdout)
+        if colorize:
+            print()
+        return
+
+    with open(
+        args.output_file, "w", encoding="utf-8", buffering=OUTPUT_BUFFER_SIZE
+    ) as output:
+        _render_report(
+            report,
+            FormatterConfig(False, args.warning_threshold, args.depth),
+            args.output_format,
+            output,
+        )
+
+
+def _open_text(file_path: str) -> ContextManager[TextIO]:
+    if file_path == STDIN_PATH:
+        return contextlib.nullcontext(sys.stdin)
+    return open(file_path, encoding="utf-8", errors="replace")
+
+
+def _render_report(
+    report: _Report, config: FormatterConfig, output_format: str, stream: TextIO
+):
+    if not profiling.is_active():
+        _write_report(report, config, output_format, stream)
+        return
+
+    # rendered to memory first when profiling, to time rendering and writing apart
+    buffer = io.StringIO()
+
+    with profiling.stage(profiling.STAGE_RENDER) as record:
+        _write_report(report, config, output_format, buffer)
+        record.items += (
+            len(report.top_rows)
+            if report.top_rows is not None
+            else len(report.coverage_table)
+        )
+
+    with profiling.stage(profiling.STAGE_WRITE) as record:
+        stream.write(buffer.getvalue())
+        stream.flush()
+        record.items += buffer.tell()
+
+
+def _write_report(
+    report: _Report, config: FormatterConfig, output_format: str, stream: TextIO
+):
+    if report.top_rows is not None:
+        if output_format == CONSOLE_FORMAT:
+            formatter.write_top_rows(report.top_rows, config, stream)
+        else:
+            renderers.render_rows(output_format, report.top_rows, config, stream)
+        return
+
+    if output_format != CONSOLE_FORMAT:
+        renderers.render_report(
+            output_format, report.coverage_table, config, stream, report.metrics
+        )
+        return
+
+    if report.patch_coverage is not None:
+        formatter.write_patch_coverage(report.patch_coverage, config, stream)
+        return
+
+    if report.diff is None:
+        formatter.write_coverage_items(
+            report.coverage_table, config, stream, report.metrics
+        )
+        return
+
+    if report.diff.changed:
+        formatter.write_coverage_items(
+            report.coverage_table,
+            config,
+            stream,
+            report.metrics,
+            baseline=report.diff.baseline,
+            shown_names={item.name for item in report.diff.changed},
+        )
+    else:
+        stream.write("No coverage changes since baseline\n")
 
-    print(formatted_result)
+    formatter.write_removed_items(report.diff.removed, config, stream)
 
 
 if __name__ == "__main__":
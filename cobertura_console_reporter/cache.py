@@ -0,0 +1,199 @@
+"""Contains an on-disk cache of parsed coverage.cobertura.xml files."""
+
+import hashlib
+import marshal
+import os
+import tempfile
+from array import array
+from typing import List, Optional
+
+from cobertura_console_reporter.coverage_item import CoverageItem
+from cobertura_console_reporter.line_hits import LineHits
+from cobertura_console_reporter.line_set import LineSet
+
+CACHE_FORMAT_VERSION = 2
+CACHE_FILE_EXTENSION = ".ccrcache"
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+def default_cache_dir() -> str:
+    """Default cache directory for the current platform
+
+    Returns:
+        str: path to the cache directory
+    """
+    base_dir = (
+        os.environ.get("LOCALAPPDATA")
+        or os.environ.get("XDG_CACHE_HOME")
+        or os.path.join(os.path.expanduser("~"), ".cache")
+    )
+    return os.path.join(base_dir, "cobertura-console-reporter")
+
+
+class ParseCache:
+    """Caches parsed CoverageItems on disk so unchanged files are not parsed again.
+
+    Entries are keyed on the coverage file's absolute path, size and modification
+    time (plus, optionally, a hash of its content) and the package filter. They are
+    stored with `marshal`, and the least recently used entries are evicted once the
+    cache directory grows beyond `max_bytes`.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        hash_content: bool = False,
+    ):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.hash_content = hash_content
+
+    def load(
+        self, file_path: str, package_name: str = None
+    ) -> Optional[List[CoverageItem]]:
+        """Loads the cached parse results of a coverage file.
+
+        Args:
+            file_path (str): path to the coverage.cobertura.xml file
+            package_name (str, optional): Package filter used when parsing. Defaults
+                to None.
+
+        Returns:
+            Optional[List[CoverageItem]]: Cached results, or None if the file has
+                not been cached or has changed since.
+        """
+        entry_path = self._entry_path(file_path, package_name)
+
+        try:
+            with open(entry_path, "rb") as entry:
+                version, records = marshal.load(entry)
+            os.utime(entry_path)
+        except (OSError, EOFError, ValueError, TypeError):
+            return None
+
+        if version != CACHE_FORMAT_VERSION:
+            return None
+
+        return [_from_record(record) for record in records]
+
+    def store(
+        self,
+        file_path: str,
+        coverage_items: List[CoverageItem],
+        package_name: str = None,
+    ):
+        """Stores the parse results of a coverage file.
+
+        Args:
+            file_path (str): path to the coverage.cobertura.xml file
+            coverage_items (List[CoverageItem]): Results of parsing the file.
+            package_name (str, optional): Package filter used when parsing. Defaults
+                to None.
+        """
+        entry_path = self._entry_path(file_path, package_name)
+        data = marshal.dumps(
+            (CACHE_FORMAT_VERSION, [_to_record(item) for item in coverage_items])
+        )
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        with tempfile.NamedTemporaryFile(
+            dir=self.cache_dir, suffix=".tmp", delete=False
+        ) as entry:
+            entry.write(data)
+        os.replace(entry.name, entry_path)
+
+        self._evict()
+
+    def _entry_path(self, file_path: str, package_name: Optional[str]) -> str:
+        stat = os.stat(file_path)
+        key = hashlib.sha256()
+
+        for part in (os.path.abspath(file_path), stat.st_size, stat.st_mtime_ns):
+            key.update(f"{part}\0".encode())
+        key.update(f"{package_name}\0".encode())
+
+        if self.hash_content:
+            with open(file_path, "rb") as file:
+                while chunk := file.read(1024 * 1024):
+                    key.update(chunk)
+
+        return os.path.join(self.cache_dir, key.hexdigest() + CACHE_FILE_EXTENSION)
+
+    def _evict(self):
+        entries = []
+
+        with os.scandir(self.cache_dir) as dir_entries:
+            for dir_entry in dir_entries:
+                if dir_entry.name.endswith(CACHE_FILE_EXTENSION):
+                    stat = dir_entry.stat()
+                    entries.append((stat.st_mtime_ns, stat.st_size, dir_entry.path))
+
+        total_bytes = sum(size for _, size, _ in entries)
+
+        for _, size, path in sorted(entries):
+            if total_bytes <= self.max_bytes:
+                break
+
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total_bytes -= size
+
+
+def _to_record(item: CoverageItem) -> tuple:
+    line_hits = None
+    if item.line_hits is not None:
+        line_hits = tuple(
+            (
+                file_name,
+                hits.line_numbers.tobytes(),
+                hits.hits.tobytes(),
+                hits.branch_line_numbers.tobytes(),
+                hits.covered_branches.tobytes(),
+                hits.branches.tobytes(),
+            )
+            for file_name, hits in item.line_hits.items()
+        )
+
+    return (
+        item.name,
+        item.file_name,
+        item.coverable_lines,
+        item.covered_lines,
+        item.uncovered_line_numbers.bits,
+        item.branches,
+        item.covered_branches,
+        item.uncovered_branch_line_numbers.bits,
+        line_hits,
+        item.package_name,
+    )
+
+
+def _from_record(record: tuple) -> CoverageItem:
+    line_hits = None
+    if record[8] is not None:
+        line_hits = {
+            file_name: LineHits(*(_to_array(column) for column in columns))
+            for file_name, *columns in record[8]
+        }
+
+    return CoverageItem(
+        record[0],
+        record[1],
+        record[2],
+        record[3],
+        LineSet.from_bits(record[4]),
+        record[5],
+        record[6],
+        LineSet.from_bits(record[7]),
+        line_hits,
+        record[9],
+    )
+
+
+def _to_array(data: bytes) -> array:
+    column = array("I")
+    column.frombytes(data)
+    return column
@@ -0,0 +1,84 @@
+"""Contains functions for opening coverage.cobertura.xml input streams."""
+
+import contextlib
+import gzip
+import io
+import lzma
+import sys
+from typing import BinaryIO, Iterator, Union
+
+STDIN_PATH = "-"
+
+GZIP_MAGIC = b"\x1f\x8b"
+XZ_MAGIC = b"\xfd7zXZ\x00"
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+CoverageSource = Union[str, BinaryIO]
+
+
+def is_file_path(source: CoverageSource) -> bool:
+    """Whether a coverage source is a path on disk (rather than stdin or a stream)
+
+    Args:
+        source (CoverageSource): path, "-" for stdin, or a binary file object
+
+    Returns:
+        bool: True if the source is a path on disk.
+    """
+    return isinstance(source, str) and source != STDIN_PATH
+
+
+@contextlib.contextmanager
+def open_coverage_file(source: CoverageSource) -> Iterator[BinaryIO]:
+    """Opens a coverage source for reading, decompressing it on the fly if needed.
+
+    gzip, xz and zstd (requires the optional `zstandard` package) content is
+    detected from its leading bytes, so compressed files and compressed stdin are
+    streamed without being decompressed to disk first. File objects passed in are
+    not closed.
+
+    Args:
+        source (CoverageSource): path, "-" for stdin, or a binary file object
+
+    Yields:
+        BinaryIO: Stream of uncompressed XML.
+    """
+    with contextlib.ExitStack() as stack:
+        if source == STDIN_PATH:
+            stream = sys.stdin.buffer
+        elif isinstance(source, str):
+            stream = stack.enter_context(open(source, "rb"))
+        else:
+            stream = getattr(source, "buffer", source)
+
+        yield _decompress(stream, stack)
+
+
+def _decompress(stream: BinaryIO, stack: contextlib.ExitStack) -> BinaryIO:
+    if not hasattr(stream, "peek"):
+        # e.g. io.BytesIO: buffered so the leading bytes can be looked at, and
+        # detached afterwards so the stream passed in is left open
+        buffered = io.BufferedReader(stream)
+        stack.callback(buffered.detach)
+        stream = buffered
+
+    magic = stream.peek(len(XZ_MAGIC))[: len(XZ_MAGIC)]
+
+    if magic.startswith(GZIP_MAGIC):
+        return stack.enter_context(gzip.GzipFile(fileobj=stream))
+    if magic.startswith(XZ_MAGIC):
+        return stack.enter_context(lzma.LZMAFile(stream))
+    if magic.startswith(ZSTD_MAGIC):
+        try:
+            import zstandard  # pylint: disable=import-outside-toplevel
+        except ImportError as ex:
+            raise ValueError(
+                "Reading zstd-compressed coverage files requires the 'zstandard' "
+                + "package (pip install cobertura-console-reporter[zstd])."
+            ) from ex
+
+        return stack.enter_context(
+            zstandard.ZstdDecompressor().stream_reader(stream, closefd=False)
+        )
+
+    return stream
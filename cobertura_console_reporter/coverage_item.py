@@ -1,36 +1,100 @@
 """Represents a test-covered .NET class."""
 
-from dataclasses import dataclass
-from typing import List
+from typing import Dict, Optional
 
+from cobertura_console_reporter.line_hits import LineHits
+from cobertura_console_reporter.line_set import LineSet
 
-@dataclass
+
+# pylint: disable=too-many-instance-attributes
 class CoverageItem:
-    """Represents a test-covered .NET class."""
+    """Represents a test-covered .NET class.
+
+    Uses `__slots__` to keep per-object overhead low for large reports, and splits
+    the name into namespace and class name once, when the name is assigned.
+    """
+
+    __slots__ = (
+        "_name",
+        "_class_namespace",
+        "_class_name",
+        "file_name",
+        "coverable_lines",
+        "covered_lines",
+        "uncovered_line_numbers",
+        "branches",
+        "covered_branches",
+        "uncovered_branch_line_numbers",
+        "line_hits",
+        "package_name",
+    )
+
+    # pylint: disable-next=too-many-arguments,too-many-positional-arguments
+    def __init__(
+        self,
+        name: str,
+        file_name: str,
+        coverable_lines: int,
+        covered_lines: int,
+        uncovered_line_numbers: LineSet,
+        branches: int,
+        covered_branches: int,
+        uncovered_branch_line_numbers: LineSet,
+        line_hits: Optional[Dict[str, LineHits]] = None,
+        package_name: str = "",
+    ):
+        self.name = name
+        self.file_name = file_name
+        self.coverable_lines = coverable_lines
+        self.covered_lines = covered_lines
+        self.uncovered_line_numbers = LineSet(uncovered_line_numbers)
+        self.branches = branches
+        self.covered_branches = covered_branches
+        self.uncovered_branch_line_numbers = LineSet(uncovered_branch_line_numbers)
+        self.line_hits = line_hits
+        self.package_name = package_name
+
+    @property
+    def name(self) -> str:
+        """Fully qualified class name"""
+        return self._name
+
+    @name.setter
+    def name(self, value: str):
+        self._name = value
 
-    name: str
-    file_name: str
-    coverable_lines: str
-    covered_lines: str
-    uncovered_line_numbers: List[int]
-    branches: str
-    covered_branches: str
-    uncovered_branch_line_numbers: List[int]
+        if "." not in value:
+            self._class_namespace, self._class_name = "", value
+        else:
+            self._class_namespace, self._class_name = value.rsplit(".", 1)
 
     @property
     def class_name(self) -> str:
         """Class name"""
-        if "." not in self.name:
-            return self.name
-
-        _, class_name = self.name.rsplit(".", 1)
-        return class_name
+        return self._class_name
 
     @property
     def class_namespace(self) -> str:
         """Class namespace"""
-        if "." not in self.name:
-            return ""
+        return self._class_namespace
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, CoverageItem):
+            return NotImplemented
+        return all(
+            getattr(self, attr) == getattr(other, attr) for attr in self.__slots__
+        )
+
+    __hash__ = None
 
-        namespace, _ = self.name.rsplit(".", 1)
-        return namespace
+    def __repr__(self) -> str:
+        return (
+            f"CoverageItem(name={self.name!r}, file_name={self.file_name!r}, "
+            f"coverable_lines={self.coverable_lines!r}, "
+            f"covered_lines={self.covered_lines!r}, "
+            f"uncovered_line_numbers={self.uncovered_line_numbers!r}, "
+            f"branches={self.branches!r}, "
+            f"covered_branches={self.covered_branches!r}, "
+            f"uncovered_branch_line_numbers={self.uncovered_branch_line_numbers!r}, "
+            f"package_name={self.package_name!r})"
+        )
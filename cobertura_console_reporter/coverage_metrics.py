@@ -0,0 +1,60 @@
+"""Represents line and branch coverage counts of a class, namespace or report."""
+
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+
+@dataclass
+class CoverageMetrics:
+    """Line and branch coverage counts of a class, namespace or whole report."""
+
+    coverable_lines: int = 0
+    covered_lines: int = 0
+    branches: int = 0
+    covered_branches: int = 0
+
+    @property
+    def line_rate(self) -> Optional[float]:
+        """Ratio of covered lines (None when there are no coverable lines)"""
+        return rate(self.covered_lines, self.coverable_lines)
+
+    @property
+    def branch_rate(self) -> Optional[float]:
+        """Ratio of covered branches (None when there are no branches)"""
+        return rate(self.covered_branches, self.branches)
+
+    @property
+    def line_counts(self) -> Tuple[int, int]:
+        """Covered and coverable lines"""
+        return self.covered_lines, self.coverable_lines
+
+    @property
+    def branch_counts(self) -> Tuple[int, int]:
+        """Covered and total branches"""
+        return self.covered_branches, self.branches
+
+    def add(
+        self,
+        coverable_lines: int,
+        covered_lines: int,
+        branches: int,
+        covered_branches: int,
+    ):
+        """Adds line and branch counts to the totals."""
+        self.coverable_lines += coverable_lines
+        self.covered_lines += covered_lines
+        self.branches += branches
+        self.covered_branches += covered_branches
+
+
+def rate(dividend: int, divisor: int) -> Optional[float]:
+    """Ratio of covered to coverable lines or branches.
+
+    Args:
+        dividend (int): Covered lines or branches.
+        divisor (int): Coverable lines or branches.
+
+    Returns:
+        Optional[float]: The ratio, or None when there is nothing to cover.
+    """
+    return dividend / divisor if divisor > 0 else None
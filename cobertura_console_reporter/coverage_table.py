@@ -0,0 +1,109 @@
+"""Represents a column-oriented collection of test-covered .NET classes."""
+
+import sys
+from array import array
+from typing import Iterable, Iterator, List
+
+from cobertura_console_reporter.coverage_item import CoverageItem
+from cobertura_console_reporter.line_set import LineSet
+
+
+# pylint: disable=too-many-instance-attributes
+class CoverageTable:
+    """Column-oriented collection of test-covered .NET classes.
+
+    Each CoverageItem attribute is stored in its own column: names are interned
+    strings (namespaces and file names repeat heavily), counts are `array` columns
+    and the namespace/class name split is stored once per row, so large reports can
+    be consumed by index without allocating an object per row.
+
+    Parsing and merging still produce CoverageItems; reports convert the merged
+    objects into a table once and only keep the table afterwards.
+    """
+
+    __slots__ = (
+        "names",
+        "class_namespaces",
+        "class_names",
+        "file_names",
+        "coverable_lines",
+        "covered_lines",
+        "branches",
+        "covered_branches",
+        "uncovered_line_numbers",
+        "uncovered_branch_line_numbers",
+        "line_hits",
+        "package_names",
+    )
+
+    def __init__(self):
+        self.names: List[str] = []
+        self.class_namespaces: List[str] = []
+        self.class_names: List[str] = []
+        self.file_names: List[str] = []
+        self.coverable_lines = array("L")
+        self.covered_lines = array("L")
+        self.branches = array("L")
+        self.covered_branches = array("L")
+        self.uncovered_line_numbers: List[LineSet] = []
+        self.uncovered_branch_line_numbers: List[LineSet] = []
+        self.line_hits: List[dict] = []
+        self.package_names: List[str] = []
+
+    @staticmethod
+    def from_items(coverage_items: Iterable[CoverageItem]) -> "CoverageTable":
+        """Creates a table from CoverageItems.
+
+        Args:
+            coverage_items (Iterable[CoverageItem]): Objects to store.
+
+        Returns:
+            CoverageTable: an instance of a CoverageTable
+        """
+        if isinstance(coverage_items, CoverageTable):
+            return coverage_items
+
+        table = CoverageTable()
+        table.extend(coverage_items)
+        return table
+
+    def append(self, item: CoverageItem):
+        """Appends a CoverageItem as a new row."""
+        self.names.append(sys.intern(item.name))
+        self.class_namespaces.append(sys.intern(item.class_namespace))
+        self.class_names.append(item.class_name)
+        self.file_names.append(sys.intern(item.file_name))
+        self.coverable_lines.append(item.coverable_lines)
+        self.covered_lines.append(item.covered_lines)
+        self.branches.append(item.branches)
+        self.covered_branches.append(item.covered_branches)
+        self.uncovered_line_numbers.append(item.uncovered_line_numbers)
+        self.uncovered_branch_line_numbers.append(item.uncovered_branch_line_numbers)
+        self.line_hits.append(item.line_hits)
+        self.package_names.append(sys.intern(item.package_name))
+
+    def extend(self, coverage_items: Iterable[CoverageItem]):
+        """Appends CoverageItems as new rows."""
+        for item in coverage_items:
+            self.append(item)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __getitem__(self, index: int) -> CoverageItem:
+        return CoverageItem(
+            self.names[index],
+            self.file_names[index],
+            self.coverable_lines[index],
+            self.covered_lines[index],
+            self.uncovered_line_numbers[index],
+            self.branches[index],
+            self.covered_branches[index],
+            self.uncovered_branch_line_numbers[index],
+            self.line_hits[index],
+            self.package_names[index],
+        )
+
+    def __iter__(self) -> Iterator[CoverageItem]:
+        for index in range(len(self)):
+            yield self[index]
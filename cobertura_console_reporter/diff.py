@@ -0,0 +1,58 @@
+"""Contains functions comparing CoverageItems with those of a baseline report."""
+
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List
+
+from cobertura_console_reporter.coverage_item import CoverageItem
+
+
+@dataclass
+class CoverageDiff:
+    """Differences between a report and a baseline report."""
+
+    changed: List[CoverageItem] = field(default_factory=list)
+    baseline: Dict[str, CoverageItem] = field(default_factory=dict)
+    removed: List[CoverageItem] = field(default_factory=list)
+
+
+def diff_coverage_items(
+    coverage_items: Iterable[CoverageItem], baseline_items: Iterable[CoverageItem]
+) -> CoverageDiff:
+    """Finds the classes whose coverage changed since a baseline report.
+
+    Baseline items are indexed by class name, so comparing two reports takes
+    linear time.
+
+    Args:
+        coverage_items (Iterable[CoverageItem]): Objects of the current report.
+        baseline_items (Iterable[CoverageItem]): Objects of the baseline report.
+
+    Returns:
+        CoverageDiff: Current objects that were added or whose counts or uncovered
+            lines changed (in report order), the baseline objects by class name and
+            the baseline objects of classes no longer reported.
+    """
+    diff = CoverageDiff(baseline={item.name: item for item in baseline_items})
+    seen = set()
+
+    for item in coverage_items:
+        seen.add(item.name)
+        before = diff.baseline.get(item.name)
+
+        if before is None or _has_changed(before, item):
+            diff.changed.append(item)
+
+    diff.removed = [item for name, item in diff.baseline.items() if name not in seen]
+
+    return diff
+
+
+def _has_changed(before: CoverageItem, after: CoverageItem) -> bool:
+    return (
+        before.coverable_lines != after.coverable_lines
+        or before.covered_lines != after.covered_lines
+        or before.branches != after.branches
+        or before.covered_branches != after.covered_branches
+        or before.uncovered_line_numbers != after.uncovered_line_numbers
+        or before.uncovered_branch_line_numbers != after.uncovered_branch_line_numbers
+    )
@@ -0,0 +1,115 @@
+"""Contains the discovery of coverage files in directory trees, e.g. the TestResults
+directories written by `dotnet test --collect:"XPlat Code Coverage"`."""
+
+import os
+from typing import Dict, Iterable, Iterator, List, NamedTuple
+
+COVERAGE_FILE_NAMES = frozenset(
+    {
+        "coverage.cobertura.xml",
+        "coverage.cobertura.xml.gz",
+        "coverage.cobertura.xml.xz",
+        "coverage.cobertura.xml.zst",
+    }
+)
+PRUNED_DIRECTORIES = frozenset({"bin", "obj", "node_modules", ".git"})
+TEST_RESULTS_DIRECTORY = "testresults"
+
+
+class DiscoveredFile(NamedTuple):
+    """A coverage file found in a directory tree."""
+
+    path: str
+    mtime_ns: int
+
+
+def iter_coverage_files(directory: str) -> Iterator[DiscoveredFile]:
+    """Yields the coverage files in a directory tree.
+
+    Directories are read with `os.scandir`, whose entries carry their type, so only
+    matching files are stat'ed. Build output and package directories (`bin`, `obj`,
+    `node_modules`, `.git`) are not descended into, nor are symbolic links to
+    directories.
+
+    Args:
+        directory (str): Root of the directory tree.
+
+    Yields:
+        DiscoveredFile: Files named `coverage.cobertura.xml`, optionally with a
+            compressed extension, in no particular order.
+    """
+    pending = [directory]
+
+    while pending:
+        try:
+            scanner = os.scandir(pending.pop())
+        except OSError:
+            # e.g. a TestResults directory removed while a test run cleans up
+            continue
+
+        with scanner:
+            for entry in scanner:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name.lower() not in PRUNED_DIRECTORIES:
+                            pending.append(entry.path)
+                    elif entry.name.lower() in COVERAGE_FILE_NAMES:
+                        yield DiscoveredFile(entry.path, entry.stat().st_mtime_ns)
+                except OSError:
+                    continue
+
+
+def project_directory(file_path: str) -> str:
+    """Directory of the test project that wrote a coverage file.
+
+    Test runs write each report to a new folder under `<project>/TestResults/`, so
+    the project is the parent of the innermost TestResults directory. Files outside
+    of a TestResults directory are their own project.
+
+    Args:
+        file_path (str): path to the coverage.cobertura.xml file
+
+    Returns:
+        str: path of the project directory
+    """
+    directory = os.path.dirname(file_path)
+    parent = directory
+
+    while True:
+        if os.path.basename(parent).lower() == TEST_RESULTS_DIRECTORY:
+            return os.path.dirname(parent)
+
+        next_parent = os.path.dirname(parent)
+        if next_parent == parent:
+            return directory
+        parent = next_parent
+
+
+def find_coverage_files(
+    directories: Iterable[str], newest_per_project: bool = False
+) -> List[str]:
+    """Finds the coverage files in directory trees.
+
+    Args:
+        directories (Iterable[str]): Roots of the directory trees to search.
+        newest_per_project (bool, optional): Only keeps the most recently modified
+            file of each test project (see `project_directory`). Defaults to False.
+
+    Returns:
+        List[str]: Sorted paths of the coverage files found.
+    """
+    files = [
+        discovered
+        for directory in directories
+        for discovered in iter_coverage_files(directory)
+    ]
+
+    if newest_per_project:
+        newest: Dict[str, DiscoveredFile] = {}
+        for discovered in sorted(files):
+            project = project_directory(discovered.path)
+            if project not in newest or discovered.mtime_ns > newest[project].mtime_ns:
+                newest[project] = discovered
+        files = list(newest.values())
+
+    return sorted(dict.fromkeys(discovered.path for discovered in files))
@@ -0,0 +1,217 @@
+"""Contains sidecar indexes of the byte offsets of packages and classes in
+coverage.cobertura.xml files."""
+
+import fnmatch
+import marshal
+import mmap
+import os
+from dataclasses import dataclass, field
+from typing import List, NamedTuple, Optional, Tuple
+
+from cobertura_console_reporter.file_spans import (
+    FileSpan,
+    can_split,
+    class_span,
+    iter_class_starts,
+    iter_packages,
+    package_span,
+    tag_name,
+)
+
+INDEX_FORMAT_VERSION = 1
+INDEX_FILE_EXTENSION = ".ccrindex"
+
+
+class IndexedPackage(NamedTuple):
+    """Byte offsets of a <package> element and of each of its <class> elements.
+
+    `classes` holds (class name, start, end) entries in document order, where a
+    class ends where the next one starts.
+    """
+
+    name: str
+    start_tag: bytes
+    start: int
+    end: int
+    classes: List[Tuple[str, int, int]]
+
+
+@dataclass
+class CoverageIndex:
+    """Byte offsets of the packages and classes of a coverage file.
+
+    The size and modification time of the file when it was indexed are kept so a
+    stale index is ignored once the file changes.
+    """
+
+    size: int
+    mtime_ns: int
+    packages: List[IndexedPackage] = field(default_factory=list)
+
+    @property
+    def class_count(self) -> int:
+        """Number of indexed <class> elements"""
+        return sum(len(package.classes) for package in self.packages)
+
+    def find_spans(
+        self, package_name: str = None, class_pattern: str = None
+    ) -> List[FileSpan]:
+        """Spans holding a package, or the classes matching a pattern.
+
+        Consecutive matching classes are read as a single span.
+
+        Args:
+            package_name (str, optional): Name of the package. Defaults to None (all
+                packages).
+            class_pattern (str, optional): fnmatch pattern of class names, e.g.
+                "App.Services.*". Defaults to None (all classes).
+
+        Returns:
+            List[FileSpan]: Spans to parse, in document order.
+        """
+        spans: List[FileSpan] = []
+
+        for package in self.packages:
+            if package_name is not None and package.name != package_name:
+                continue
+
+            if class_pattern is None:
+                spans.append(package_span(package.start, package.end))
+                continue
+
+            for name, start, end in package.classes:
+                if not fnmatch.fnmatchcase(name, class_pattern):
+                    continue
+                # classes of different packages are never adjacent
+                if spans and spans[-1].end == start:
+                    spans[-1] = spans[-1]._replace(end=end)
+                else:
+                    spans.append(class_span(package.start_tag, start, end))
+
+        return spans
+
+
+def index_path(file_path: str) -> str:
+    """Path of the sidecar index of a coverage file
+
+    Args:
+        file_path (str): path to the coverage.cobertura.xml file
+
+    Returns:
+        str: path to the index file, next to the coverage file
+    """
+    return file_path + INDEX_FILE_EXTENSION
+
+
+def build_index(file_path: str) -> CoverageIndex:
+    """Scans a coverage file for the byte offsets of its packages and classes.
+
+    Args:
+        file_path (str): path to an uncompressed coverage.cobertura.xml file
+
+    Raises:
+        ValueError: The file is compressed or not encoded in UTF-8, so its byte
+            offsets cannot be read back.
+
+    Returns:
+        CoverageIndex: an instance of a CoverageIndex
+    """
+    if not can_split(file_path):
+        raise ValueError(
+            f"Cannot index {file_path}: only uncompressed UTF-8 files can be indexed"
+        )
+
+    with open(file_path, "rb") as file:
+        stat = os.fstat(file.fileno())
+        index = CoverageIndex(stat.st_size, stat.st_mtime_ns)
+
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            for package in iter_packages(data):
+                starts = list(iter_class_starts(data, package))
+                ends = starts[1:] + [package.classes_end]
+
+                index.packages.append(
+                    IndexedPackage(
+                        tag_name(package.start_tag),
+                        package.start_tag,
+                        package.start,
+                        package.end,
+                        [
+                            (_class_name(data, start), start, end)
+                            for start, end in zip(starts, ends)
+                        ],
+                    )
+                )
+
+    return index
+
+
+def write_index(file_path: str) -> CoverageIndex:
+    """Indexes a coverage file and writes the index next to it.
+
+    Args:
+        file_path (str): path to an uncompressed coverage.cobertura.xml file
+
+    Raises:
+        ValueError: The file cannot be indexed.
+
+    Returns:
+        CoverageIndex: The index written.
+    """
+    import tempfile  # pylint: disable=import-outside-toplevel
+
+    index = build_index(file_path)
+    target = index_path(file_path)
+    directory = os.path.dirname(os.path.abspath(target))
+
+    # written to a temporary file first so readers never see a partial index
+    with tempfile.NamedTemporaryFile(
+        "wb", dir=directory, suffix=INDEX_FILE_EXTENSION, delete=False
+    ) as index_file:
+        marshal.dump(
+            (
+                INDEX_FORMAT_VERSION,
+                index.size,
+                index.mtime_ns,
+                [tuple(package) for package in index.packages],
+            ),
+            index_file,
+        )
+
+    os.replace(index_file.name, target)
+    return index
+
+
+def load_index(file_path: str) -> Optional[CoverageIndex]:
+    """Loads the sidecar index of a coverage file.
+
+    Args:
+        file_path (str): path to the coverage.cobertura.xml file
+
+    Returns:
+        Optional[CoverageIndex]: The index, or None if the file has no index or has
+            changed since it was indexed.
+    """
+    try:
+        with open(index_path(file_path), "rb") as index_file:
+            version, size, mtime_ns, packages = marshal.load(index_file)
+        stat = os.stat(file_path)
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+
+    if (version, size, mtime_ns) != (
+        INDEX_FORMAT_VERSION,
+        stat.st_size,
+        stat.st_mtime_ns,
+    ):
+        return None
+
+    return CoverageIndex(
+        size, mtime_ns, [IndexedPackage(*package) for package in packages]
+    )
+
+
+def _class_name(data, start: int) -> str:
+    start_tag = data[start : data.find(b">", start) + 1]
+    # compiler-generated classes (e.g. "Class1/<Run>d__3") belong to their parent
+    return tag_name(start_tag).split("/")[0]
@@ -0,0 +1,263 @@
+"""Contains a scan of uncompressed coverage.cobertura.xml files for spans that
+worker processes can parse independently.
+
+The file is memory-mapped and searched for the byte offsets of its <package>
+elements without parsing the XML. Runs of small packages, and runs of <class>
+elements of packages too large to parse at once, become spans. Each span is wrapped
+in the start and end tags of its parent elements so it parses as a standalone
+document.
+
+The scan assumes <package> and <class> tags do not appear in comments or CDATA
+sections, which holds for the reports written by Cobertura tools.
+"""
+
+import mmap
+import re
+import xml.etree.ElementTree as ET
+from typing import Iterator, List, NamedTuple
+
+from cobertura_console_reporter.coverage_input import (
+    GZIP_MAGIC,
+    XZ_MAGIC,
+    ZSTD_MAGIC,
+)
+
+UTF8_BOM = b"\xef\xbb\xbf"
+
+_PACKAGE_START = re.compile(rb"<package[\s/>]")
+_CLASS_START = re.compile(rb"<class[\s/>]")
+_PACKAGE_END = b"</package>"
+_CLASSES_END = b"</classes>"
+_ENCODING = re.compile(rb"""<\?xml[^>]*\sencoding\s*=\s*["']([^"']*)["']""")
+_UTF8_ENCODINGS = ("utf-8", "utf8", "us-ascii", "ascii")
+
+
+class FileSpan(NamedTuple):
+    """Byte range of a coverage file that parses as a standalone XML document once
+    wrapped in `prefix` and `suffix`."""
+
+    start: int
+    end: int
+    prefix: bytes
+    suffix: bytes
+
+
+def can_split(file_path: str) -> bool:
+    """Whether a coverage file can be split into spans.
+
+    Args:
+        file_path (str): path to the coverage.cobertura.xml file
+
+    Returns:
+        bool: True if the file is uncompressed, non-empty and encoded in UTF-8.
+    """
+    with open(file_path, "rb") as file:
+        head = file.read(256)
+
+    if not head or head.startswith((GZIP_MAGIC, XZ_MAGIC, ZSTD_MAGIC)):
+        return False
+
+    # UTF-16 documents start with a byte order mark or a NUL byte
+    if head.startswith((b"\xff\xfe", b"\xfe\xff")) or b"\x00" in head[:4]:
+        return False
+
+    match = _ENCODING.match(head.removeprefix(UTF8_BOM))
+    return match is None or match.group(1).decode("ascii").lower() in _UTF8_ENCODINGS
+
+
+def find_file_spans(
+    file_path: str, span_size: int, package_name: str = None
+) -> List[FileSpan]:
+    """Memory-maps a coverage file and finds its spans.
+
+    Args:
+        file_path (str): path to an uncompressed coverage.cobertura.xml file
+        span_size (int): Number of bytes above which a span is closed.
+        package_name (str, optional): Skips other packages. Defaults to None.
+
+    Returns:
+        List[FileSpan]: Spans of the file, in document order.
+    """
+    with open(file_path, "rb") as file:
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            return find_spans(data, span_size, package_name)
+
+
+def find_spans(data, span_size: int, package_name: str = None) -> List[FileSpan]:
+    """Finds the spans of an uncompressed Cobertura XML document.
+
+    Consecutive packages are grouped until a span holds at least `span_size` bytes,
+    and packages larger than `span_size` are split between <class> elements.
+
+    Args:
+        data (bytes or mmap): Content of the document.
+        span_size (int): Number of bytes above which a span is closed.
+        package_name (str, optional): Skips other packages. Defaults to None.
+
+    Raises:
+        ValueError: A <package> element is not closed.
+
+    Returns:
+        List[FileSpan]: Spans of the document, in document order.
+    """
+    spans: List[FileSpan] = []
+    group_start = group_end = -1
+
+    def close_group():
+        nonlocal group_start
+        if group_start >= 0:
+            spans.append(package_span(group_start, group_end))
+            group_start = -1
+
+    for package in iter_packages(data):
+        if package_name is not None and tag_name(package.start_tag) != package_name:
+            close_group()
+        elif package.end - package.start > span_size:
+            close_group()
+            spans.extend(_class_spans(data, package, span_size))
+        else:
+            if group_start < 0:
+                group_start = package.start
+            group_end = package.end
+            if group_end - group_start >= span_size:
+                close_group()
+
+    close_group()
+    return spans
+
+
+class PackageOffsets(NamedTuple):
+    """Byte offsets of a <package> element and of the <class> elements it holds."""
+
+    start_tag: bytes
+    start: int
+    end: int
+    classes_start: int
+    classes_end: int
+
+
+def iter_packages(data) -> Iterator[PackageOffsets]:
+    """Yields the offsets of the non-empty <package> elements of a document.
+
+    Args:
+        data (bytes or mmap): Content of the document.
+
+    Raises:
+        ValueError: A <package> element is not closed.
+
+    Yields:
+        PackageOffsets: Offsets of a package, in document order.
+    """
+    position = 0
+
+    while match := _PACKAGE_START.search(data, position):
+        start = match.start()
+        content_start = data.find(b">", start) + 1
+        start_tag = data[start:content_start]
+
+        if content_start == 0:
+            raise ValueError(f"Unterminated <package> tag at offset {start}")
+
+        if start_tag.endswith(b"/>"):
+            position = content_start
+            continue
+
+        content_end = data.find(_PACKAGE_END, content_start)
+        if content_end < 0:
+            raise ValueError(f"Unclosed <package> element at offset {start}")
+        position = content_end + len(_PACKAGE_END)
+
+        first_class = _CLASS_START.search(data, content_start, content_end)
+        classes_end = data.rfind(_CLASSES_END, content_start, content_end)
+
+        yield PackageOffsets(
+            start_tag,
+            start,
+            position,
+            first_class.start() if first_class is not None else content_end,
+            classes_end if classes_end >= 0 else content_end,
+        )
+
+
+def iter_class_starts(data, package: PackageOffsets) -> Iterator[int]:
+    """Yields the offsets of the <class> start tags of a package.
+
+    Args:
+        data (bytes or mmap): Content of the document.
+        package (PackageOffsets): Offsets of the package.
+
+    Yields:
+        int: Offset of a <class> start tag, in document order.
+    """
+    for match in _CLASS_START.finditer(
+        data, package.classes_start, package.classes_end
+    ):
+        yield match.start()
+
+
+def package_span(start: int, end: int) -> FileSpan:
+    """Span of consecutive <package> elements.
+
+    Args:
+        start (int): Offset of the first <package> start tag.
+        end (int): Offset following the last </package> end tag.
+
+    Returns:
+        FileSpan: an instance of a FileSpan
+    """
+    return FileSpan(start, end, b"<packages>", b"</packages>")
+
+
+def class_span(package_start_tag: bytes, start: int, end: int) -> FileSpan:
+    """Span of consecutive <class> elements of a package.
+
+    Args:
+        package_start_tag (bytes): Start tag of the package.
+        start (int): Offset of the first <class> start tag.
+        end (int): Offset following the last </class> end tag.
+
+    Returns:
+        FileSpan: an instance of a FileSpan
+    """
+    return FileSpan(
+        start, end, package_start_tag + b"<classes>", b"</classes></package>"
+    )
+
+
+def tag_name(start_tag: bytes) -> str:
+    """Value of the name attribute of a start tag.
+
+    Args:
+        start_tag (bytes): Start tag, e.g. b'<package name="App">'.
+
+    Returns:
+        str: Unescaped name, or "" if the tag has no name.
+    """
+    return ET.fromstring(start_tag.rstrip(b"/> \t\r\n") + b"/>").get("name", "")
+
+
+def _class_spans(data, package: PackageOffsets, span_size: int) -> Iterator[FileSpan]:
+    start = package.classes_start
+
+    while start < package.classes_end:
+        # '<' cannot appear in attribute values, so the next match past the span
+        # size is the start tag of a class
+        next_class = _CLASS_START.search(data, start + span_size, package.classes_end)
+        end = next_class.start() if next_class is not None else package.classes_end
+        yield class_span(package.start_tag, start, end)
+        start = end
+
+
+def read_span(file_path: str, span: FileSpan) -> bytes:
+    """Reads a span of a coverage file, wrapped in its prefix and suffix.
+
+    Args:
+        file_path (str): path to the coverage.cobertura.xml file
+        span (FileSpan): Span to read.
+
+    Returns:
+        bytes: Standalone XML document.
+    """
+    with open(file_path, "rb") as file:
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            return b"".join((span.prefix, data[span.start : span.end], span.suffix))
@@ -1,36 +1,113 @@
 """Contains formatting functions for CoverageItems intended for console output."""
 
-import itertools
-from typing import Iterator, List
-
-from colorama import Fore, Style
+import functools
+import io
+from typing import (
+    TYPE_CHECKING,
+    AbstractSet,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    TextIO,
+    Tuple,
+    Union,
+)
 
 from cobertura_console_reporter.coverage_item import CoverageItem
+from cobertura_console_reporter.coverage_metrics import CoverageMetrics
+from cobertura_console_reporter.coverage_table import CoverageTable
 from cobertura_console_reporter.formatter_config import FormatterConfig
+from cobertura_console_reporter.line_set import LineSet
+from cobertura_console_reporter.namespace_tree import NamespaceGroup
+from cobertura_console_reporter.patch import PatchCoverage
+from cobertura_console_reporter.thresholds import is_below_percent
+from cobertura_console_reporter.metrics import ReportMetrics, compute_metrics
+
+if TYPE_CHECKING:  # pragma: no cover
+    from cobertura_console_reporter.renderers import ReportRow
 
 INDENT_SPACES = 2
 
 
-# pylint: disable=too-many-locals
 def format_coverage_items(
-    coverage_items: Iterator[CoverageItem], config: FormatterConfig
+    coverage_items: Union[Iterable[CoverageItem], CoverageTable],
+    config: FormatterConfig,
 ) -> str:
     """Formats a list of CoverageItems into a string suitable for console output.
 
     Args:
-        coverage_items (Iterator[CoverageItem]): CoverageItems to display.
+        coverage_items (Union[Iterable[CoverageItem], CoverageTable]): CoverageItems
+            to display. Rows are read by index from a CoverageTable, so passing one
+            avoids converting the items.
         config (FormatterConfig): Formatting configuration
 
     Returns:
         str: Formatted string intended for console output.
     """
-    if not coverage_items:
+    output = io.StringIO()
+    write_coverage_items(coverage_items, config, output)
+    return output.getvalue()
+
+
+# pylint: disable=too-many-locals
+# pylint: disable-next=too-many-arguments,too-many-positional-arguments
+def write_coverage_items(
+    coverage_items: Union[Iterable[CoverageItem], CoverageTable],
+    config: FormatterConfig,
+    stream: TextIO,
+    metrics: Optional[ReportMetrics] = None,
+    baseline: Optional[Dict[str, CoverageItem]] = None,
+    shown_names: Optional[AbstractSet[str]] = None,
+):
+    """Writes a list of CoverageItems to a text stream, formatted for console output.
+
+    Rows are written as they are produced, so the report is never held in memory as
+    a whole.
+
+    Args:
+        coverage_items (Union[Iterable[CoverageItem], CoverageTable]): CoverageItems
+            to display. Rows are read by index from a CoverageTable, so passing one
+            avoids converting the items.
+        config (FormatterConfig): Formatting configuration
+        stream (TextIO): Stream to write to (e.g. sys.stdout or an open file).
+        metrics (ReportMetrics, optional): Metrics previously computed for the items.
+            Computed when not given. Defaults to None.
+        baseline (Dict[str, CoverageItem], optional): Baseline objects by class name.
+            When given, the change in line and branch coverage of each class and
+            namespace is displayed. Defaults to None.
+        shown_names (AbstractSet[str], optional): Names of the classes to display,
+            e.g. the classes changed since the baseline. Namespace rows still
+            aggregate every class of the table, and namespaces without displayed
+            classes are skipped. Defaults to None (all classes).
+    """
+    table = CoverageTable.from_items(coverage_items)
+    write = stream.write
+
+    if metrics is None:
+        metrics = compute_metrics(table)
+
+    groups = list(metrics.namespace_tree.groups(config.namespace_depth))
+
+    if shown_names is not None:
+        groups = [
+            group._replace(
+                rows=[row for row in group.rows if table.names[row] in shown_names]
+            )
+            for group in groups
+        ]
+        groups = [group for group in groups if group.rows]
+
+    if not groups:
         if config.colorize:
-            return f"{Fore.RED}No Coverage{Style.RESET_ALL}\n"
-        return "No Coverage\n"
+            colorama = _colorama()
+            write(f"{colorama.Fore.RED}No Coverage{colorama.Style.RESET_ALL}\n")
+        else:
+            write("No Coverage\n")
+        return
 
-    reset_color_val = Style.RESET_ALL if config.colorize is True else ""
-    class_name_length = _calc_class_name_length(coverage_items)
+    reset_color_val = _colorama().Style.RESET_ALL if config.colorize is True else ""
+    class_name_length = _calc_class_name_length(table, groups)
 
     header_names = [
         "Class Name",
@@ -38,6 +115,11 @@ def format_coverage_items(
         "% Branches",
         "Uncovered Line #s",
     ]
+    deltas = None
+    if baseline is not None:
+        deltas = _BaselineDeltas(baseline, config.namespace_depth)
+        header_names[3:3] = ["+/- Lines", "+/- Branches"]
+
     header_lengths = [len(name) for name in header_names]
     header_lengths[0] = max([class_name_length, len(header_names[0])])
     header_format = "  |  ".join(
@@ -45,7 +127,7 @@ def format_coverage_items(
     )
 
     class_name_col_idx = 0
-    uncovered_line_numbers_col_idx = 3
+    uncovered_line_numbers_col_idx = len(header_names) - 1
     row_formats = _build_data_row_format(
         reset_color_val,
         header_names,
@@ -57,27 +139,164 @@ def format_coverage_items(
 
     separator_row = _build_separator_row(header_lengths)
 
-    result = f"{separator_row}\n"
-    result += f"{header_format.format(*header_names)}\n"
-    result += f"{separator_row}\n"
+    write(f"{separator_row}\n")
+    write(f"{header_format.format(*header_names)}\n")
+    write(f"{separator_row}\n")
+
+    for group in groups:
+        if group.name != "":
+            values, color = _build_namespace_data_row(group.name, group.metrics, config)
+            if deltas is not None:
+                values[3:3] = deltas.namespace_values(group.name, group.metrics)
+            write(f"{row_format.format(color=color, *values)}\n")
+
+        for row in group.rows:
+            values, color = _build_data_row(table, metrics, group, row, config)
+            if deltas is not None:
+                values[3:3] = deltas.row_values(table, metrics, row)
+            write(f"{row_format.format(color=color, *values)}\n")
+
+    write(f"{separator_row}\n")
+
 
-    grouped_items = itertools.groupby(
-        sorted(coverage_items, key=lambda x: x.class_namespace),
-        key=lambda x: x.class_namespace,
+def write_removed_items(
+    coverage_items: Iterable[CoverageItem], config: FormatterConfig, stream: TextIO
+):
+    """Writes the names of classes no longer reported since a baseline report.
+
+    Args:
+        coverage_items (Iterable[CoverageItem]): Baseline objects of removed classes.
+        config (FormatterConfig): Formatting configuration
+        stream (TextIO): Stream to write to (e.g. sys.stdout or an open file).
+    """
+    names = sorted(item.name for item in coverage_items)
+    if not names:
+        return
+
+    color, reset_color_val = "", ""
+    if config.colorize:
+        colorama = _colorama()
+        color, reset_color_val = colorama.Fore.RED, colorama.Style.RESET_ALL
+
+    stream.write(f"{color}Removed since baseline:{reset_color_val}\n")
+    for name in names:
+        stream.write(f"{' ' * INDENT_SPACES}{name}\n")
+
+
+def write_patch_coverage(
+    patch_coverage: List[PatchCoverage], config: FormatterConfig, stream: TextIO
+):
+    """Writes the coverage of changed lines per file to a text stream.
+
+    Args:
+        patch_coverage (List[PatchCoverage]): Coverage of the changed lines of each
+            file.
+        config (FormatterConfig): Formatting configuration
+        stream (TextIO): Stream to write to (e.g. sys.stdout or an open file).
+    """
+    write = stream.write
+
+    if not patch_coverage:
+        write("No coverable changed lines\n")
+        return
+
+    reset_color_val = _colorama().Style.RESET_ALL if config.colorize is True else ""
+    header_names = ["File", "% Changed Lines", "Changed Lines", "Uncovered Line #s"]
+    header_lengths = [len(name) for name in header_names]
+    header_lengths[0] = max(
+        [len(header_names[0]), len("Total")]
+        + [len(file.file_name) for file in patch_coverage]
     )
 
-    for key, group in grouped_items:
-        items = list(group)
+    header_format = "  |  ".join(
+        _build_header_row_formats(header_names, header_lengths)
+    )
+    row_format = "  |  ".join(
+        _build_data_row_format(
+            reset_color_val, header_names, header_lengths, 0, len(header_names) - 1
+        )
+    )
+    separator_row = _build_separator_row(header_lengths)
 
-        if key != "":
-            result += _build_namespace_data_row(key, items, row_format, config)
+    write(f"{separator_row}\n")
+    write(f"{header_format.format(*header_names)}\n")
+    write(f"{separator_row}\n")
 
-        for item in items:
-            result += _build_data_row(key, item, row_format, config)
+    for file in patch_coverage:
+        rate = file.covered_lines / file.changed_lines
+        values = [
+            file.file_name,
+            _format_percent(rate),
+            str(file.changed_lines),
+            _compact_number_ranges(file.uncovered_line_numbers),
+        ]
+        color = _get_row_color(config, (file.covered_lines, file.changed_lines))
+        write(f"{row_format.format(color=color, *values)}\n")
 
-    result += f"{separator_row}\n"
+    covered_lines = sum(file.covered_lines for file in patch_coverage)
+    changed_lines = sum(file.changed_lines for file in patch_coverage)
+    rate = covered_lines / changed_lines
 
-    return result
+    write(f"{separator_row}\n")
+    values = ["Total", _format_percent(rate), str(changed_lines), ""]
+    color = _get_row_color(config, (covered_lines, changed_lines))
+    write(f"{row_format.format(color=color, *values)}\n")
+    write(f"{separator_row}\n")
+
+
+def write_top_rows(rows: List["ReportRow"], config: FormatterConfig, stream: TextIO):
+    """Writes a ranked table of class or namespace rows to a text stream.
+
+    Args:
+        rows (List[ReportRow]): Rows to display, in rank order.
+        config (FormatterConfig): Formatting configuration
+        stream (TextIO): Stream to write to (e.g. sys.stdout or an open file).
+    """
+    write = stream.write
+
+    if not rows:
+        write("No Coverage\n")
+        return
+
+    reset_color_val = _colorama().Style.RESET_ALL if config.colorize is True else ""
+    header_names = [
+        "Name",
+        "% Lines",
+        "% Branches",
+        "Uncovered Lines",
+        "Uncovered Branches",
+    ]
+    header_lengths = [len(name) for name in header_names]
+    header_lengths[0] = max([len(header_names[0])] + [len(row.name) for row in rows])
+
+    header_format = "  |  ".join(
+        _build_header_row_formats(header_names, header_lengths)
+    )
+    row_format = "  |  ".join(
+        _build_data_row_format(reset_color_val, header_names, header_lengths, 0, -1)
+    )
+    separator_row = _build_separator_row(header_lengths)
+
+    write(f"{separator_row}\n")
+    write(f"{header_format.format(*header_names)}\n")
+    write(f"{separator_row}\n")
+
+    for row in rows:
+        line_rate = row.metrics.line_rate
+        branch_rate = row.metrics.branch_rate
+        values = [
+            row.name,
+            _format_percent(line_rate),
+            _format_percent(branch_rate),
+            str(row.metrics.coverable_lines - row.metrics.covered_lines),
+            str(row.metrics.branches - row.metrics.covered_branches),
+        ]
+        color = _get_row_color(
+            config, row.metrics.line_counts, row.metrics.branch_counts
+        )
+        write(f"{row_format.format(color=color, *values)}\n")
+
+    write(f"{separator_row}\n")
 
 
 def _build_separator_row(header_lengths: list[int]) -> str:
@@ -96,9 +315,11 @@ def _build_data_row_format(
     uncovered_line_numbers_col_idx,
 ):
     return [
-        f"{{color}}{{:<{header_lengths[i]}}}{reset_color_val}"
-        if i in [class_name_col_idx, uncovered_line_numbers_col_idx]
-        else f"{{color}}{{:>{header_lengths[i]}}}{reset_color_val}"
+        (
+            f"{{color}}{{:<{header_lengths[i]}}}{reset_color_val}"
+            if i in [class_name_col_idx, uncovered_line_numbers_col_idx]
+            else f"{{color}}{{:>{header_lengths[i]}}}{reset_color_val}"
+        )
         for i in range(len(header_names))
     ]
 
@@ -110,111 +331,166 @@ def _build_header_row_formats(header_names, header_lengths):
     ]
 
 
-def _calc_class_name_length(coverage_items):
+def _calc_class_name_length(table: CoverageTable, groups: List[NamespaceGroup]):
     return max(
-        [len(ci.class_name) + _calc_indent(ci) for ci in coverage_items]
-        + [len(ci.class_namespace) for ci in coverage_items]
+        max(
+            len(_display_name(table, group, row)) + _calc_indent(group.name)
+            for group in groups
+            for row in group.rows
+        ),
+        max(len(group.name) for group in groups),
     )
 
 
-def _calc_indent(coverage_item):
-    return INDENT_SPACES if coverage_item.class_namespace != "" else 0
+def _calc_indent(class_namespace: str):
+    return INDENT_SPACES if class_namespace != "" else 0
+
+
+def _display_name(table: CoverageTable, group: NamespaceGroup, row: int) -> str:
+    # class name relative to the group, which includes collapsed child namespaces
+    if group.name == "":
+        return table.names[row]
+    return table.names[row][len(group.name) + 1 :]
 
 
 def _build_namespace_data_row(
-    key: str, items: list[CoverageItem], row_format: str, config: FormatterConfig
-) -> str:
-    covered_line_percent = _format_percent(
-        sum(item.covered_lines for item in items),
-        sum(item.coverable_lines for item in items),
-    )
-    covered_branch_percent = _format_percent(
-        sum(item.covered_branches for item in items),
-        sum(item.branches for item in items),
-    )
+    key: str,
+    namespace_metrics: CoverageMetrics,
+    config: FormatterConfig,
+) -> Tuple[list[str], str]:
+    line_rate = namespace_metrics.line_rate
+    branch_rate = namespace_metrics.branch_rate
 
     ordered_group_column_values = [
         key,
-        covered_line_percent,
-        covered_branch_percent,
+        _format_percent(line_rate),
+        _format_percent(branch_rate),
         "",  # uncovered lines column
     ]
 
-    color = _get_row_color(config, covered_line_percent, covered_branch_percent)
-    return f"{row_format.format(color=color, *ordered_group_column_values)}\n"
+    color = _get_row_color(
+        config, namespace_metrics.line_counts, namespace_metrics.branch_counts
+    )
+    return ordered_group_column_values, color
 
 
 def _build_data_row(
-    key: str, item: CoverageItem, row_format: str, config: FormatterConfig
-) -> str:
-    indent = "  " if key != "" else ""
-    covered_line_percent = _format_percent(item.covered_lines, item.coverable_lines)
-    covered_branch_percent = _format_percent(item.covered_branches, item.branches)
+    table: CoverageTable,
+    metrics: ReportMetrics,
+    group: NamespaceGroup,
+    row: int,
+    config: FormatterConfig,
+) -> Tuple[list[str], str]:
+    indent = " " * _calc_indent(group.name)
+    line_rate = metrics.line_rates[row]
+    branch_rate = metrics.branch_rates[row]
 
     ordered_column_values = [
-        indent + item.class_name,
-        covered_line_percent,
-        covered_branch_percent,
+        indent + _display_name(table, group, row),
+        _format_percent(line_rate),
+        _format_percent(branch_rate),
         _compact_number_ranges(
-            list(set(item.uncovered_line_numbers + item.uncovered_branch_line_numbers))
+            table.uncovered_line_numbers[row] | table.uncovered_branch_line_numbers[row]
         ),
     ]
 
-    color = _get_row_color(config, covered_line_percent, covered_branch_percent)
-    return f"{row_format.format(color=color, *ordered_column_values)}\n"
+    color = _get_row_color(
+        config,
+        (table.covered_lines[row], table.coverable_lines[row]),
+        (table.covered_branches[row], table.branches[row]),
+    )
+    return ordered_column_values, color
 
 
-def _format_percent(dividend: float, divisor: float) -> str:
-    return format(dividend / divisor, ".0%") if divisor > 0 else "n/a"
+def _format_percent(rate: Optional[float]) -> str:
+    return format(rate, ".0%") if rate is not None else "n/a"
 
 
-def _get_row_color(
-    config: FormatterConfig,
-    covered_line_percent_str: str,
-    covered_branch_percent_str: str,
-) -> str:
-    if config.colorize is True:
-        if _below_percent(covered_line_percent_str, config.warning_threshold):
-            return Fore.YELLOW
-        if _below_percent(covered_branch_percent_str, config.warning_threshold):
-            return Fore.YELLOW
+def _format_delta(rate: Optional[float], baseline_rate: Optional[float]) -> str:
+    if rate is None or baseline_rate is None:
+        return "n/a"
+    return format(rate - baseline_rate, "+.0%")
 
-        return Fore.GREEN
 
-    return ""
+class _BaselineDeltas:
+    """Formats changes in coverage relative to a baseline report.
 
+    Namespaces are compared with the aggregates of the whole baseline report, so
+    their changes account for classes that are not displayed.
+    """
 
-def _below_percent(value_percent_str: str, threshold_percent: float) -> bool:
-    if value_percent_str == "n/a" or not threshold_percent:
-        return False
+    def __init__(
+        self,
+        baseline: Dict[str, CoverageItem],
+        namespace_depth: Optional[int] = None,
+    ):
+        baseline_table = CoverageTable.from_items(baseline.values())
+        self.metrics = compute_metrics(baseline_table)
+        self.rows = {name: row for row, name in enumerate(baseline_table.names)}
+        self.tree = self.metrics.namespace_tree
+        self.namespace_depth = namespace_depth
+
+    def row_values(
+        self, table: CoverageTable, metrics: ReportMetrics, row: int
+    ) -> list[str]:
+        """Line and branch coverage changes of a table row"""
+        baseline_row = self.rows.get(table.names[row])
+        if baseline_row is None:
+            return ["new", "new"]
+
+        return [
+            _format_delta(
+                metrics.line_rates[row], self.metrics.line_rates[baseline_row]
+            ),
+            _format_delta(
+                metrics.branch_rates[row], self.metrics.branch_rates[baseline_row]
+            ),
+        ]
+
+    def namespace_values(self, key: str, namespace_metrics: CoverageMetrics):
+        """Line and branch coverage changes of a namespace"""
+        baseline_metrics = self.tree.group_metrics(key, self.namespace_depth)
+        if baseline_metrics is None:
+            return ["new", "new"]
+
+        return [
+            _format_delta(namespace_metrics.line_rate, baseline_metrics.line_rate),
+            _format_delta(namespace_metrics.branch_rate, baseline_metrics.branch_rate),
+        ]
+
+
+@functools.lru_cache(maxsize=None)
+def _colorama():
+    # Only imported when output is colorized, keeping it off the startup path of
+    # uncolored runs.
+    import colorama  # pylint: disable=import-outside-toplevel
+
+    return colorama
 
-    value_percent = float(value_percent_str.rstrip("%"))
 
-    return value_percent < threshold_percent
+def _get_row_color(
+    config: FormatterConfig,
+    line_counts: Tuple[int, int],
+    branch_counts: Tuple[int, int] = (0, 0),
+) -> str:
+    if config.colorize is True:
+        fore = _colorama().Fore
+        threshold = config.warning_threshold or None
+        if is_below_percent(*line_counts, threshold):
+            return fore.YELLOW
+        if is_below_percent(*branch_counts, threshold):
+            return fore.YELLOW
 
+        return fore.GREEN
 
-def _compact_number_ranges(numbers: List[int], max_length=17) -> str:
-    if not numbers:
-        return ""
+    return ""
 
-    ranges = []
-    start = numbers[0]
-    end = numbers[0]
 
-    for i in range(1, len(numbers)):
-        if numbers[i] == end + 1:
-            end = numbers[i]
-        else:
-            ranges.append((start, end))
-            start = end = numbers[i]
-    ranges.append((start, end))
-
-    output = []
-    for rng in ranges:
-        if rng[0] == rng[1]:
-            output.append(str(rng[0]))
-        else:
-            output.append(f"{rng[0]}-{rng[1]}")
+def _compact_number_ranges(numbers: LineSet, max_length=17) -> str:
+    output = [
+        str(start) if start == end else f"{start}-{end}"
+        for start, end in numbers.ranges()
+    ]
 
     result = ", ".join(output)
 
@@ -10,6 +10,7 @@ class FormatterConfig:
 
     colorize: bool = True
     warning_threshold: Optional[float] = None
+    namespace_depth: Optional[int] = None
 
     @staticmethod
     def default() -> "FormatterConfig":  # pragma: no cover
@@ -0,0 +1,70 @@
+"""Represents per-line hit counts for a source file of a test-covered .NET class."""
+
+from array import array
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Tuple
+
+
+@dataclass
+class LineHits:
+    """Per-line hit counts and branch coverage for a single source file.
+
+    Values are stored in parallel `array` columns (one entry per line) to keep large
+    reports compact.
+    """
+
+    line_numbers: array = field(default_factory=lambda: array("I"))
+    hits: array = field(default_factory=lambda: array("I"))
+    branch_line_numbers: array = field(default_factory=lambda: array("I"))
+    covered_branches: array = field(default_factory=lambda: array("I"))
+    branches: array = field(default_factory=lambda: array("I"))
+
+    def add_line(self, line_number: int, hits: int):
+        """Records the hit count of a coverable line."""
+        self.line_numbers.append(line_number)
+        self.hits.append(hits)
+
+    def add_branch(self, line_number: int, covered_branches: int, branches: int):
+        """Records the branch coverage of a line containing conditions."""
+        self.branch_line_numbers.append(line_number)
+        self.covered_branches.append(covered_branches)
+        self.branches.append(branches)
+
+
+def merge_line_hits(line_hits: Iterable[LineHits]) -> LineHits:
+    """Merges hit data for the same source file (e.g. from several test runs).
+
+    Hits of lines reported more than once are summed, and branch coverage keeps the
+    highest covered and total branch counts seen for the line, so a line is only
+    counted once no matter how many reports include it. All inputs are folded in a
+    single pass keyed by line number.
+
+    Args:
+        line_hits (Iterable[LineHits]): Hit data to merge.
+
+    Returns:
+        LineHits: Merged hit data.
+    """
+    lines: Dict[int, int] = {}
+    branch_lines: Dict[int, Tuple[int, int]] = {}
+
+    for item in line_hits:
+        for line_number, hits in zip(item.line_numbers, item.hits):
+            lines[line_number] = lines.get(line_number, 0) + hits
+
+        for line_number, covered, total in zip(
+            item.branch_line_numbers, item.covered_branches, item.branches
+        ):
+            existing = branch_lines.get(line_number)
+            if existing is not None:
+                covered = max(covered, existing[0])
+                total = max(total, existing[1])
+            branch_lines[line_number] = (covered, total)
+
+    return LineHits(
+        array("I", lines.keys()),
+        array("I", lines.values()),
+        array("I", branch_lines.keys()),
+        array("I", (covered for covered, _ in branch_lines.values())),
+        array("I", (total for _, total in branch_lines.values())),
+    )
@@ -0,0 +1,118 @@
+"""Represents a compact, sorted set of source line numbers."""
+
+import sys
+from typing import Iterable, Iterator, Optional, Tuple
+
+# int.bit_count is only available from Python 3.10 onwards
+_HAS_BIT_COUNT = sys.version_info >= (3, 10)
+
+
+class LineSet:
+    """Immutable, sorted set of line numbers backed by an integer bitmap.
+
+    Bit `n` of the bitmap is set when line `n` is a member, so unions are a single
+    bitwise OR and runs of consecutive lines can be read back as ranges without
+    sorting or de-duplicating. Unions and `len` take time linear in the highest line
+    number (one step per machine word, i.e. about 30 lines).
+
+    Testing a bit of an integer copies it (`bits >> n`), so membership is tested on
+    a byte copy of the bitmap instead, made by the first test: every further test
+    is a constant-time index into it.
+    """
+
+    __slots__ = ("_bits", "_bytes")
+
+    def __init__(self, numbers: Iterable[int] = ()):
+        self._bytes: Optional[bytes] = None
+
+        if isinstance(numbers, LineSet):
+            self._bits = numbers._bits
+            self._bytes = numbers._bytes
+            return
+
+        numbers = list(numbers)
+        bitmap = bytearray(max(numbers) // 8 + 1 if numbers else 0)
+
+        for number in numbers:
+            bitmap[number >> 3] |= 1 << (number & 7)
+
+        self._bits = int.from_bytes(bitmap, "little")
+
+    @classmethod
+    def from_bits(cls, bits: int) -> "LineSet":
+        """Creates a LineSet from an existing bitmap.
+
+        Args:
+            bits (int): Bitmap with bit `n` set for each member line `n`.
+
+        Returns:
+            LineSet: an instance of a LineSet
+        """
+        line_set = cls.__new__(cls)
+        line_set._bits = bits
+        line_set._bytes = None
+        return line_set
+
+    @property
+    def bits(self) -> int:
+        """Underlying bitmap"""
+        return self._bits
+
+    def ranges(self) -> Iterator[Tuple[int, int]]:
+        """Yields each run of consecutive line numbers as an inclusive range.
+
+        Yields:
+            Tuple[int, int]: First and last line number of the run.
+        """
+        # reversed binary string, so each character's index is its line number
+        digits = bin(self._bits)[:1:-1]
+        start = digits.find("1")
+
+        while start != -1:
+            end = digits.find("0", start)
+            if end == -1:
+                end = len(digits)
+
+            yield (start, end - 1)
+            start = digits.find("1", end)
+
+    def __contains__(self, number: int) -> bool:
+        if self._bytes is None:
+            self._bytes = self._bits.to_bytes(
+                (self._bits.bit_length() + 7) // 8, "little"
+            )
+
+        index = number >> 3
+        return (
+            number >= 0
+            and index < len(self._bytes)
+            and (self._bytes[index] >> (number & 7)) & 1 == 1
+        )
+
+    def __or__(self, other: "LineSet") -> "LineSet":
+        if not isinstance(other, LineSet):
+            return NotImplemented
+        return LineSet.from_bits(self._bits | other._bits)
+
+    def __iter__(self) -> Iterator[int]:
+        for start, end in self.ranges():
+            yield from range(start, end + 1)
+
+    def __len__(self) -> int:
+        if _HAS_BIT_COUNT:
+            return self._bits.bit_count()
+        return bin(self._bits).count("1")
+
+    def __bool__(self) -> bool:
+        return self._bits != 0
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, LineSet):
+            return NotImplemented
+        return self._bits == other._bits
+
+    def __hash__(self) -> int:
+        return hash(self._bits)
+
+    def __repr__(self) -> str:
+        return f"LineSet({list(self)})"
@@ -0,0 +1,148 @@
+"""Contains functions computing numeric coverage metrics for a report."""
+
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from cobertura_console_reporter.coverage_metrics import CoverageMetrics, rate
+from cobertura_console_reporter.coverage_table import CoverageTable
+from cobertura_console_reporter.namespace_tree import NamespaceTree
+from cobertura_console_reporter.thresholds import (
+    LEVEL_CLASS,
+    LEVEL_NAMESPACE,
+    LEVEL_PACKAGE,
+    LEVEL_TOTAL,
+    LEVELS,
+    Thresholds,
+    ThresholdViolation,
+)
+
+
+@dataclass
+class ReportMetrics:
+    """Coverage ratios for each row of a CoverageTable, plus namespace, package and
+    report totals, and the thresholds they do not meet.
+
+    The totals of every namespace level are held by `namespace_tree`, which report
+    rendering, ranking and namespace thresholds all read.
+    """
+
+    line_rates: List[Optional[float]] = field(default_factory=list)
+    branch_rates: List[Optional[float]] = field(default_factory=list)
+    namespace_tree: NamespaceTree = field(default_factory=NamespaceTree)
+    packages: Dict[str, CoverageMetrics] = field(default_factory=dict)
+    total: CoverageMetrics = field(default_factory=CoverageMetrics)
+    violations: List[ThresholdViolation] = field(default_factory=list)
+
+
+def compute_metrics(  # pylint: disable=too-many-locals
+    table: CoverageTable,
+    thresholds: Optional[Thresholds] = None,
+    namespace_depth: Optional[int] = None,
+) -> ReportMetrics:
+    """Computes the coverage ratios of each row and the aggregates of every namespace
+    level, each package and the whole report in a single pass.
+
+    Class thresholds are checked as each row is read, and namespace, package and
+    total thresholds against the aggregates, so no further pass over the rows is
+    needed. Namespace thresholds are checked against the namespace groups that are
+    displayed, e.g. a parent namespace without classes of its own once deeper
+    namespaces are collapsed into it.
+
+    Args:
+        table (CoverageTable): Rows to compute metrics for.
+        thresholds (Thresholds, optional): Fail thresholds to check. Defaults to
+            None.
+        namespace_depth (int, optional): Depth that namespaces are collapsed to
+            when displayed (see `NamespaceTree.groups`). Defaults to None.
+
+    Returns:
+        ReportMetrics: Numeric metrics, reusable by formatting, coloring and
+            threshold checks.
+    """
+    metrics = ReportMetrics()
+    namespace_tree = metrics.namespace_tree
+    packages = metrics.packages
+    violations = metrics.violations
+    check = thresholds.check if thresholds else None
+
+    for row, (
+        name,
+        class_namespace,
+        package_name,
+        coverable,
+        covered,
+        branches,
+        covered_branches,
+    ) in enumerate(
+        zip(
+            table.names,
+            table.class_namespaces,
+            table.package_names,
+            table.coverable_lines,
+            table.covered_lines,
+            table.branches,
+            table.covered_branches,
+        )
+    ):
+        metrics.line_rates.append(rate(covered, coverable))
+        metrics.branch_rates.append(rate(covered_branches, branches))
+
+        if check is not None:
+            check(
+                violations,
+                LEVEL_CLASS,
+                name,
+                (covered, coverable),
+                (covered_branches, branches),
+                class_namespace,
+            )
+
+        namespace_metrics = namespace_tree.add_row(class_namespace, row).metrics
+
+        package_metrics = packages.get(package_name)
+        if package_metrics is None:
+            package_metrics = packages[package_name] = CoverageMetrics()
+
+        namespace_metrics.add(coverable, covered, branches, covered_branches)
+        package_metrics.add(coverable, covered, branches, covered_branches)
+        metrics.total.add(coverable, covered, branches, covered_branches)
+
+    namespace_tree.aggregate()
+
+    if thresholds:
+        _check_aggregates(metrics, thresholds, namespace_depth)
+
+    return metrics
+
+
+def _check_aggregates(
+    metrics: ReportMetrics, thresholds: Thresholds, namespace_depth: Optional[int]
+):
+    violations = metrics.violations
+
+    for group in metrics.namespace_tree.groups(namespace_depth):
+        if group.name != "":
+            thresholds.check(
+                violations,
+                LEVEL_NAMESPACE,
+                group.name,
+                group.metrics.line_counts,
+                group.metrics.branch_counts,
+                group.name,
+            )
+
+    for key, aggregate in metrics.packages.items():
+        if key != "":
+            thresholds.check(
+                violations,
+                LEVEL_PACKAGE,
+                key,
+                aggregate.line_counts,
+                aggregate.branch_counts,
+            )
+
+    total = metrics.total
+    thresholds.check(
+        violations, LEVEL_TOTAL, "", total.line_counts, total.branch_counts
+    )
+    violations.sort(key=lambda violation: LEVELS.index(violation.level))
@@ -0,0 +1,173 @@
+"""Contains a namespace tree aggregating coverage counts at every namespace level."""
+
+from typing import Dict, Iterator, List, NamedTuple, Optional
+
+from cobertura_console_reporter.coverage_metrics import CoverageMetrics
+
+
+class NamespaceNode:  # pylint: disable=too-few-public-methods
+    """A namespace of a report.
+
+    Holds the table rows of the classes declared directly in the namespace, their
+    line and branch counts (`metrics`) and the counts of the whole subtree, child
+    namespaces included (`total`).
+    """
+
+    __slots__ = ("name", "depth", "children", "rows", "metrics", "total")
+
+    def __init__(self, name: str, depth: int):
+        self.name = name
+        self.depth = depth
+        self.children: Dict[str, "NamespaceNode"] = {}
+        self.rows: List[int] = []
+        self.metrics = CoverageMetrics()
+        self.total = CoverageMetrics()
+
+
+class NamespaceGroup(NamedTuple):
+    """Classes displayed together under a namespace, with their combined counts."""
+
+    name: str
+    metrics: CoverageMetrics
+    rows: List[int]
+
+
+class NamespaceTree:
+    """Trie of the dotted namespaces of a CoverageTable.
+
+    Counts are added to the namespace of each class as rows are read (see
+    `metrics.compute_metrics`), then summed bottom-up once by `aggregate`, so the
+    totals of every namespace level are available without re-summing rows. Walking
+    the trie with sorted children yields namespaces in the same order as sorting
+    their names.
+    """
+
+    def __init__(self):
+        self.root = NamespaceNode("", 0)
+        self._nodes: Dict[str, NamespaceNode] = {"": self.root}
+
+    def add_row(self, namespace: str, row: int) -> NamespaceNode:
+        """Adds a table row to the classes declared directly in a namespace.
+
+        Args:
+            namespace (str): Namespace of the row's class.
+            row (int): Index of the row in the table.
+
+        Returns:
+            NamespaceNode: Node of the namespace, whose `metrics` the row's counts
+                are to be added to.
+        """
+        node = self._nodes.get(namespace) or self._insert(namespace)
+        node.rows.append(row)
+        return node
+
+    def node(self, namespace: str) -> Optional[NamespaceNode]:
+        """Node of a namespace, or None if no class is declared in or below it."""
+        return self._nodes.get(namespace)
+
+    def groups(self, depth: Optional[int] = None) -> Iterator[NamespaceGroup]:
+        """Yields the groups of classes to display, in namespace order.
+
+        Args:
+            depth (int, optional): Namespaces deeper than this number of segments
+                are collapsed into their ancestor at this depth, whose group then
+                holds the classes and totals of its whole subtree. Defaults to None
+                (each namespace is its own group).
+
+        Yields:
+            NamespaceGroup: Groups of classes, skipping namespaces without classes.
+        """
+        stack = [self.root]
+
+        while stack:
+            node = stack.pop()
+
+            if depth is not None and node.depth >= depth:
+                yield NamespaceGroup(node.name, node.total, _subtree_rows(node))
+                continue
+
+            if node.rows:
+                yield NamespaceGroup(node.name, node.metrics, node.rows)
+
+            stack.extend(
+                node.children[key] for key in sorted(node.children, reverse=True)
+            )
+
+    def group_metrics(
+        self, namespace: str, depth: Optional[int] = None
+    ) -> Optional[CoverageMetrics]:
+        """Combined counts of the group of a namespace, as yielded by `groups`.
+
+        Args:
+            namespace (str): Name of the group's namespace.
+            depth (int, optional): Depth passed to `groups`. Defaults to None.
+
+        Returns:
+            Optional[CoverageMetrics]: Counts of the group, or None if the namespace
+                is not in the tree.
+        """
+        node = self._nodes.get(namespace)
+        if node is None:
+            return None
+        if depth is not None and node.depth >= depth:
+            return node.total
+        return node.metrics
+
+    def _insert(self, namespace: str) -> NamespaceNode:
+        parent = self.root
+        name = ""
+
+        for part in namespace.split("."):
+            name = f"{name}.{part}" if name else part
+            node = parent.children.get(part)
+            if node is None:
+                node = parent.children[part] = NamespaceNode(name, parent.depth + 1)
+                self._nodes[name] = node
+            parent = node
+
+        return parent
+
+    def aggregate(self):
+        """Sums the counts of each namespace's subtree into its `total`, once all
+        rows are added."""
+        # parents are created before their children, so reversed creation order
+        # visits every child before its parent
+        for node in reversed(self._nodes.values()):
+            for source in (node.metrics, *(c.total for c in node.children.values())):
+                node.total.add(
+                    source.coverable_lines,
+                    source.covered_lines,
+                    source.branches,
+                    source.covered_branches,
+                )
+
+
+def collapse_namespace(namespace: str, depth: Optional[int] = None) -> str:
+    """Name of the group a namespace is displayed in, as yielded by
+    `NamespaceTree.groups`.
+
+    Args:
+        namespace (str): Namespace of a class.
+        depth (int, optional): Depth passed to `groups`. Defaults to None.
+
+    Returns:
+        str: The ancestor of the namespace at `depth`, or the namespace itself when
+            it is not deeper.
+    """
+    if depth is None:
+        return namespace
+    return ".".join(namespace.split(".")[:depth])
+
+
+def _subtree_rows(node: NamespaceNode) -> List[int]:
+    rows: List[int] = []
+    stack = [node]
+
+    while stack:
+        current = stack.pop()
+        rows.extend(current.rows)
+        stack.extend(
+            current.children[key] for key in sorted(current.children, reverse=True)
+        )
+
+    return rows
@@ -1,62 +1,638 @@
 """Contains parsing functions for coverage.cobertura.xml files."""
 
+import fnmatch
+import functools
+import io
+import itertools
+import operator
+import os
 import xml.etree.ElementTree as ET
-from typing import List
-import re
+from typing import (
+    TYPE_CHECKING,
+    BinaryIO,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Union,
+)
+from xml.parsers import expat
 
+from cobertura_console_reporter import profiling
+from cobertura_console_reporter.coverage_input import (
+    CoverageSource,
+    is_file_path,
+    open_coverage_file,
+)
 from cobertura_console_reporter.coverage_item import CoverageItem
+from cobertura_console_reporter.line_hits import LineHits, merge_line_hits
+from cobertura_console_reporter.line_set import LineSet
 
+if TYPE_CHECKING:  # pragma: no cover
+    from cobertura_console_reporter.cache import ParseCache
+    from cobertura_console_reporter.file_spans import FileSpan
 
-def parse(file_path: str, package_name: str = None) -> List[CoverageItem]:
+BACKENDS = ("etree", "expat")
+DEFAULT_BACKEND = "etree"
+EXPAT_CHUNK_SIZE = 1024 * 1024
+MIN_SPAN_SIZE = 4 * 1024 * 1024
+# spans per worker process, so workers finishing early pick up remaining spans
+SPANS_PER_JOB = 4
+
+
+def parse(
+    file_path: CoverageSource,
+    package_name: str = None,
+    backend: str = DEFAULT_BACKEND,
+    class_pattern: str = None,
+) -> List[CoverageItem]:
     """Parses a target coverage.cobertura.xml file and returns a list of objects.
 
+    gzip, xz and zstd compressed input is decompressed on the fly. When filtering
+    by package or class and the file has an up-to-date sidecar index (see
+    `file_index`), only the byte ranges of the matching elements are read.
+
     Args:
-        file_path (str): path to the coverage.cobertura.xml file
+        file_path (CoverageSource): path to the coverage.cobertura.xml file, "-" for
+            stdin, or a binary file object
         package_name (str, optional): Filters output by package name. Defaults to None.
+        backend (str, optional): XML parser backend, one of `BACKENDS`. Defaults to
+            "etree".
+        class_pattern (str, optional): Filters output by class name with an fnmatch
+            pattern, e.g. "App.Services.*". Defaults to None.
 
     Returns:
         List[CoverageItem]: List of objects representing test-covered .NET classes.
     """
-    tree = ET.parse(file_path)
-    root = tree.getroot()
+    return _merge_parsed(
+        _iter_parse_filtered(file_path, package_name, backend, class_pattern)
+    )
 
-    results: List[CoverageItem] = []
 
-    for package in root.findall(".//package"):
-        if package_name is not None and package.get("name") != package_name:
-            continue
+# pylint: disable-next=too-many-arguments,too-many-positional-arguments
+def parse_files(
+    file_paths: List[CoverageSource],
+    package_name: str = None,
+    jobs: Optional[int] = None,
+    cache: Optional["ParseCache"] = None,
+    backend: str = DEFAULT_BACKEND,
+    split: bool = False,
+    class_pattern: str = None,
+) -> List[CoverageItem]:
+    """Parses several coverage.cobertura.xml files and returns a merged list of objects.
+
+    Files are parsed concurrently in a process pool and classes reported by more than
+    one file are merged into a single object.
+
+    Args:
+        file_paths (List[CoverageSource]): paths to the coverage.cobertura.xml files
+            ("-" for stdin, or binary file objects, which are parsed in-process)
+        package_name (str, optional): Filters output by package name. Defaults to None.
+        jobs (int, optional): Maximum number of worker processes. Defaults to the
+            number of processors on the machine.
+        cache (ParseCache, optional): Cache of previously parsed files. Files found in
+            the cache are not parsed again. Defaults to None.
+        backend (str, optional): XML parser backend, one of `BACKENDS`. Defaults to
+            "etree".
+        split (bool, optional): Also splits large files at <package> and <class>
+            boundaries so a single file is parsed by several worker processes (see
+            `parse_split_files`). Defaults to False.
+        class_pattern (str, optional): Filters output by class name with an fnmatch
+            pattern. Defaults to None.
+
+    Returns:
+        List[CoverageItem]: List of objects representing test-covered .NET classes.
+    """
+    if cache is None and not split and (len(file_paths) <= 1 or jobs == 1):
+        return _merge_parsed(
+            itertools.chain.from_iterable(
+                _iter_parse_filtered(file_path, package_name, backend, class_pattern)
+                for file_path in file_paths
+            )
+        )
+
+    parsed = parse_each_file(
+        file_paths, package_name, jobs, cache, backend, split, class_pattern
+    )
+
+    with profiling.stage(profiling.STAGE_MERGE) as record:
+        coverage_items = merge_coverage_items(
+            itertools.chain.from_iterable(parsed[file_path] for file_path in file_paths)
+        )
+        record.items += len(coverage_items)
+
+    return coverage_items
+
+
+# pylint: disable-next=too-many-arguments,too-many-positional-arguments,too-many-locals
+def parse_each_file(
+    file_paths: List[CoverageSource],
+    package_name: str = None,
+    jobs: Optional[int] = None,
+    cache: Optional["ParseCache"] = None,
+    backend: str = DEFAULT_BACKEND,
+    split: bool = False,
+    class_pattern: str = None,
+) -> Dict[CoverageSource, List[CoverageItem]]:
+    """Parses several coverage.cobertura.xml files without merging their results.
 
-        for classes in package.findall("classes"):
-            for cls in classes.findall("class"):
-                coverage_item = _create_coverage_item(cls)
+    Args:
+        file_paths (List[CoverageSource]): paths to the coverage.cobertura.xml files
+            ("-" for stdin, or binary file objects, which are parsed in-process)
+        package_name (str, optional): Filters output by package name. Defaults to None.
+        jobs (int, optional): Maximum number of worker processes. Defaults to the
+            number of processors on the machine.
+        cache (ParseCache, optional): Cache of previously parsed files. Defaults to
+            None.
+        backend (str, optional): XML parser backend, one of `BACKENDS`. Defaults to
+            "etree".
+        split (bool, optional): Also splits large files so a single file is parsed
+            by several worker processes. Defaults to False.
+        class_pattern (str, optional): Filters output by class name with an fnmatch
+            pattern. Cached results are filtered, but only unfiltered results are
+            stored. Defaults to None.
+
+    Returns:
+        Dict[CoverageSource, List[CoverageItem]]: Objects parsed from each file, keyed
+            by file path.
+    """
+    parsed: Dict[CoverageSource, List[CoverageItem]] = {}
+
+    if cache is not None:
+        with profiling.stage(profiling.STAGE_READ) as record:
+            for file_path in filter(is_file_path, file_paths):
+                cached = cache.load(file_path, package_name)
+                if cached is not None:
+                    parsed[file_path] = list(_filter_classes(cached, class_pattern))
+                    record.items += len(parsed[file_path])
+
+    missing = [file_path for file_path in file_paths if file_path not in parsed]
+    pooled = [file_path for file_path in missing if is_file_path(file_path)]
+
+    if not split and (len(pooled) <= 1 or jobs == 1):
+        pooled = []
+
+    local = [file_path for file_path in missing if file_path not in pooled]
+    results = [
+        parse(file_path, package_name, backend, class_pattern) for file_path in local
+    ]
+
+    if pooled and split:
+        results.extend(
+            parse_split_files(pooled, package_name, jobs, backend, class_pattern)
+        )
+    elif pooled:
+        # pylint: disable-next=import-outside-toplevel
+        from concurrent.futures import ProcessPoolExecutor
 
-                existing = next(
-                    (r for r in results if r.name == coverage_item.name), None
+        # workers are not profiled, so the stage only times waiting for them
+        with profiling.stage(profiling.STAGE_PARSE) as record:
+            with ProcessPoolExecutor(max_workers=jobs) as executor:
+                results.extend(
+                    executor.map(
+                        parse,
+                        pooled,
+                        itertools.repeat(package_name),
+                        itertools.repeat(backend),
+                        itertools.repeat(class_pattern),
+                    )
                 )
+            record.items += sum(map(len, results[len(local) :]))
+
+    for file_path, coverage_items in zip(local + pooled, results):
+        parsed[file_path] = coverage_items
+
+        # cache entries are keyed on the package filter only
+        if cache is not None and class_pattern is None and is_file_path(file_path):
+            cache.store(file_path, coverage_items, package_name)
+
+    return parsed
+
+
+# pylint: disable-next=too-many-arguments,too-many-positional-arguments
+def parse_split_files(
+    file_paths: List[str],
+    package_name: str = None,
+    jobs: Optional[int] = None,
+    backend: str = DEFAULT_BACKEND,
+    class_pattern: str = None,
+    min_span_size: int = MIN_SPAN_SIZE,
+) -> List[List[CoverageItem]]:
+    """Parses coverage.cobertura.xml files split into spans parsed by several workers.
+
+    Each file is memory-mapped and scanned for <package> and <class> boundaries
+    (see `file_spans`), and the spans of all files are queued to the same process
+    pool, so a single large file is parsed on every core and small files are
+    parsed alongside the spans of large ones. Workers return the objects of their
+    span, which are merged per file. Compressed files and files not encoded in
+    UTF-8 are parsed whole by a single worker. When filtering by package or class,
+    the spans of files with an up-to-date sidecar index are read from the index.
+
+    Args:
+        file_paths (List[str]): paths to the coverage.cobertura.xml files
+        package_name (str, optional): Filters output by package name. Defaults to None.
+        jobs (int, optional): Maximum number of worker processes. Defaults to the
+            number of processors on the machine.
+        backend (str, optional): XML parser backend, one of `BACKENDS`. Defaults to
+            "etree".
+        class_pattern (str, optional): Filters output by class name with an fnmatch
+            pattern. Defaults to None.
+        min_span_size (int, optional): Minimum number of bytes parsed by a worker at
+            once. Defaults to 4 MiB.
+
+    Returns:
+        List[List[CoverageItem]]: Objects parsed from each file, in the order of
+            `file_paths`.
+    """
+    jobs = jobs or os.cpu_count() or 1
+    total_size = sum(os.path.getsize(file_path) for file_path in file_paths)
+    span_size = max(min_span_size, total_size // (jobs * SPANS_PER_JOB))
+
+    with profiling.stage(profiling.STAGE_READ) as record:
+        file_spans = [
+            _find_spans(file_path, span_size, package_name, class_pattern)
+            for file_path in file_paths
+        ]
+        record.items += sum(map(len, file_spans))
+
+    units = [
+        (file_path, span)
+        for file_path, spans in zip(file_paths, file_spans)
+        for span in spans
+    ]
+
+    with profiling.stage(profiling.STAGE_PARSE) as record:
+        if len(units) <= 1 or jobs == 1:
+            results = [
+                _parse_span(file_path, span, package_name, backend, class_pattern)
+                for file_path, span in units
+            ]
+        else:
+            # pylint: disable-next=import-outside-toplevel
+            from concurrent.futures import ProcessPoolExecutor
+
+            with ProcessPoolExecutor(max_workers=jobs) as executor:
+                results = list(
+                    executor.map(
+                        _parse_span,
+                        *zip(*units),
+                        itertools.repeat(package_name),
+                        itertools.repeat(backend),
+                        itertools.repeat(class_pattern),
+                    )
+                )
+        record.items += sum(map(len, results))
+
+    parsed = iter(results)
+
+    with profiling.stage(profiling.STAGE_MERGE):
+        return [
+            merge_coverage_items(
+                itertools.chain.from_iterable(itertools.islice(parsed, len(spans)))
+            )
+            for spans in file_spans
+        ]
+
+
+def merge_coverage_items(
+    coverage_items: Iterable[CoverageItem],
+) -> List[CoverageItem]:
+    """Merges objects that describe the same .NET class into a single object.
+
+    Objects are indexed by class name, so grouping is a constant-time lookup per
+    object and results keep the order in which each class was first seen. Objects
+    parsed from a coverage file carry per-line hit data, which is merged line by line
+    so that lines reported by several objects (or several test runs) are only
+    counted once. Input objects are not modified.
+
+    Args:
+        coverage_items (Iterable[CoverageItem]): Objects to merge.
+
+    Returns:
+        List[CoverageItem]: List of objects with one entry per .NET class.
+    """
+    groups: Dict[str, Union[CoverageItem, List[CoverageItem]]] = {}
+
+    for coverage_item in coverage_items:
+        existing = groups.get(coverage_item.name)
+
+        if existing is None:
+            groups[coverage_item.name] = coverage_item
+        elif isinstance(existing, list):
+            existing.append(coverage_item)
+        else:
+            groups[coverage_item.name] = [existing, coverage_item]
+
+    return [
+        _merge_coverage_items(group) if isinstance(group, list) else group
+        for group in groups.values()
+    ]
+
+
+def iter_parse(
+    file_path: CoverageSource, package_name: str = None, backend: str = DEFAULT_BACKEND
+) -> Iterator[CoverageItem]:
+    """Streams a target coverage.cobertura.xml file, yielding an object per class.
+
+    Each <class> element is converted as soon as its end tag is read and then
+    discarded, so memory use stays flat regardless of the size of the file. Classes
+    split across several <class> elements (e.g. compiler-generated state machines)
+    are yielded separately; use `parse` to receive merged results.
+
+    Args:
+        file_path (CoverageSource): path to the coverage.cobertura.xml file, "-" for
+            stdin, or a binary file object
+        package_name (str, optional): Filters output by package name. Defaults to None.
+        backend (str, optional): XML parser backend, one of `BACKENDS`. Defaults to
+            "etree".
+
+    Yields:
+        CoverageItem: Object representing a single <class> element.
+    """
+    if backend == "expat":
+        return _iter_parse_expat(file_path, package_name)
+    if backend == "etree":
+        return _iter_parse_etree(file_path, package_name)
+
+    raise ValueError(f"Unknown parser backend: {backend}")
+
+
+def iter_parse_stream(
+    stream: BinaryIO, package_name: str = None, backend: str = DEFAULT_BACKEND
+) -> Iterator[CoverageItem]:
+    """Streams an uncompressed Cobertura XML document, yielding an object per class.
+
+    Args:
+        stream (BinaryIO): Stream of XML, which may hold any element containing
+            <package> or <class> elements rather than a whole <coverage> report.
+        package_name (str, optional): Filters output by package name. Defaults to None.
+        backend (str, optional): XML parser backend, one of `BACKENDS`. Defaults to
+            "etree".
+
+    Yields:
+        CoverageItem: Object representing a single <class> element.
+    """
+    if backend == "expat":
+        return _iter_parse_expat_stream(stream, package_name)
+    if backend == "etree":
+        return _iter_parse_etree_stream(stream, package_name)
 
-                if existing:
-                    _merge_coverage_items(existing, coverage_item)
-                    continue
+    raise ValueError(f"Unknown parser backend: {backend}")
 
-                results.append(coverage_item)
 
-    return results
+def _merge_parsed(coverage_items: Iterable[CoverageItem]) -> List[CoverageItem]:
+    # parsing is lazy and interleaved with merging, so the parsed objects are only
+    # collected first when profiling, to time both stages apart
+    if profiling.is_active():
+        with profiling.stage(profiling.STAGE_PARSE) as record:
+            coverage_items = list(coverage_items)
+            record.items += len(coverage_items)
+
+    with profiling.stage(profiling.STAGE_MERGE) as record:
+        merged = merge_coverage_items(coverage_items)
+        record.items += len(merged)
+
+    return merged
+
+
+def _iter_parse_filtered(
+    file_path: CoverageSource, package_name: str, backend: str, class_pattern: str
+) -> Iterable[CoverageItem]:
+    index = None
+    if is_file_path(file_path) and (
+        package_name is not None or class_pattern is not None
+    ):
+        # only filtered runs look for an index, keeping it off the startup path
+        # pylint: disable-next=import-outside-toplevel
+        from cobertura_console_reporter.file_index import load_index
+
+        index = load_index(file_path)
+
+    if index is None:
+        coverage_items = iter_parse(file_path, package_name, backend)
+    else:
+        coverage_items = itertools.chain.from_iterable(
+            _parse_span(file_path, span, package_name, backend)
+            for span in index.find_spans(package_name, class_pattern)
+        )
+
+    return _filter_classes(coverage_items, class_pattern)
+
+
+def _filter_classes(
+    coverage_items: Iterable[CoverageItem], class_pattern: Optional[str]
+) -> Iterable[CoverageItem]:
+    if class_pattern is None:
+        return coverage_items
+
+    return (
+        coverage_item
+        for coverage_item in coverage_items
+        if fnmatch.fnmatchcase(coverage_item.name, class_pattern)
+    )
+
+
+def _find_spans(
+    file_path: str, span_size: int, package_name: str, class_pattern: str
+) -> List[Optional["FileSpan"]]:
+    # pylint: disable-next=import-outside-toplevel
+    from cobertura_console_reporter.file_index import load_index
+
+    # pylint: disable-next=import-outside-toplevel
+    from cobertura_console_reporter.file_spans import can_split, find_file_spans
+
+    # a None span stands for the whole file
+    if not can_split(file_path):
+        return [None]
+
+    if package_name is not None or class_pattern is not None:
+        index = load_index(file_path)
+        if index is not None:
+            return index.find_spans(package_name, class_pattern)
+
+    return find_file_spans(file_path, span_size, package_name)
+
+
+def _parse_span(
+    file_path: str,
+    span: Optional["FileSpan"],
+    package_name: str,
+    backend: str,
+    class_pattern: str = None,
+) -> List[CoverageItem]:
+    if span is None:
+        return parse(file_path, package_name, backend, class_pattern)
+
+    # pylint: disable-next=import-outside-toplevel
+    from cobertura_console_reporter.file_spans import read_span
+
+    stream = io.BytesIO(read_span(file_path, span))
+    return list(
+        _filter_classes(iter_parse_stream(stream, package_name, backend), class_pattern)
+    )
+
+
+def _iter_parse_etree(
+    file_path: CoverageSource, package_name: str
+) -> Iterator[CoverageItem]:
+    with open_coverage_file(file_path) as stream:
+        yield from _iter_parse_etree_stream(stream, package_name)
+
+
+def _iter_parse_etree_stream(
+    stream: BinaryIO, package_name: str
+) -> Iterator[CoverageItem]:
+    parents: List[ET.Element] = []
+    current_package = ""
+    skip_package = False
+
+    for event, element in ET.iterparse(stream, events=("start", "end")):
+        if event == "start":
+            if element.tag == "package":
+                current_package = element.get("name", "")
+                skip_package = (
+                    package_name is not None and current_package != package_name
+                )
+            parents.append(element)
+            continue
+
+        parents.pop()
+
+        if element.tag == "class":
+            if not skip_package:
+                yield _create_coverage_item(element, current_package)
+        elif element.tag != "package":
+            continue
+
+        # processed subtrees are detached from the tree so they can be collected
+        element.clear()
+        if parents:
+            parents[-1].remove(element)
+
+
+def _iter_parse_expat(
+    file_path: CoverageSource, package_name: str
+) -> Iterator[CoverageItem]:
+    with open_coverage_file(file_path) as stream:
+        yield from _iter_parse_expat_stream(stream, package_name)
+
+
+def _iter_parse_expat_stream(
+    stream: BinaryIO, package_name: str
+) -> Iterator[CoverageItem]:
+    handler = _ExpatHandler(package_name)
+    xml_parser = expat.ParserCreate()
+    xml_parser.StartElementHandler = handler.start_element
+    xml_parser.EndElementHandler = handler.end_element
+
+    while chunk := stream.read(EXPAT_CHUNK_SIZE):
+        xml_parser.Parse(chunk, False)
+        yield from handler.completed
+        handler.completed.clear()
+
+    xml_parser.Parse(b"", True)
+    yield from handler.completed
+
+
+class _ExpatHandler:
+    """Counts lines and branches straight from expat callbacks, without building
+    elements. <methods> repeat their class' <lines>, so their content is ignored."""
+
+    def __init__(self, package_name: Optional[str]):
+        self.package_name = package_name
+        self.completed: List[CoverageItem] = []
+        self.current_package = ""
+        self.skip_package = False
+        self.in_methods = False
+        self.class_name: Optional[str] = None
+        self.file_name: Optional[str] = None
+        self.line_hits: Optional[LineHits] = None
+
+    def start_element(self, tag: str, attrs: Dict[str, str]):
+        """Handles an element start tag."""
+        if self.in_methods:
+            return
+
+        if tag == "line":
+            if self.line_hits is None:
+                return
+
+            line_number = int(attrs["number"])
+            self.line_hits.add_line(line_number, int(attrs["hits"]))
+
+            if attrs.get("branch") == "True":
+                self.line_hits.add_branch(
+                    line_number,
+                    *_split_conditional_coverage(attrs["condition-coverage"]),
+                )
+        elif tag == "methods":
+            self.in_methods = True
+        elif tag == "class":
+            if not self.skip_package:
+                self.class_name = attrs["name"].split("/")[0]
+                self.file_name = attrs["filename"]
+                self.line_hits = LineHits()
+        elif tag == "package":
+            self.current_package = attrs.get("name", "")
+            self.skip_package = (
+                self.package_name is not None
+                and self.current_package != self.package_name
+            )
+
+    def end_element(self, tag: str):
+        """Handles an element end tag."""
+        if tag == "methods":
+            self.in_methods = False
+        elif tag == "class" and self.line_hits is not None:
+            self.completed.append(
+                _create_coverage_item_from_line_hits(
+                    self.class_name,
+                    self.file_name,
+                    {self.file_name: self.line_hits},
+                    self.current_package,
+                )
+            )
+            self.line_hits = None
 
 
 def _split_conditional_coverage(input_string) -> tuple[int, int]:
-    pattern = r"(\d+)%\s*\((\d+)/(\d+)\)"
-    match = re.search(pattern, input_string)
+    # e.g. "75% (3/4)"
+    covered_branches, branches = input_string[
+        input_string.index("(") + 1 : input_string.rindex(")")
+    ].split("/")
 
-    covered_branches = int(match.group(2))
-    branches = int(match.group(3))
+    return (int(covered_branches), int(branches))
 
-    return (covered_branches, branches)
 
+def _create_coverage_item(cls, package_name: str = "") -> CoverageItem:
+    line_hits = LineHits()
 
-def _create_coverage_item(cls) -> CoverageItem:
-    class_name = cls.get("name").split("/")[0]
-    file_name = cls.get("filename")
+    for lines in cls.findall("lines"):
+        for line in lines.findall("line"):
+            line_number = int(line.get("number"))
+            line_hits.add_line(line_number, int(line.get("hits")))
 
+            if line.get("branch") == "True":
+                conditional_coverage = _split_conditional_coverage(
+                    line.get("condition-coverage")
+                )
+                line_hits.add_branch(line_number, *conditional_coverage)
+
+    return _create_coverage_item_from_line_hits(
+        cls.get("name").split("/")[0],
+        cls.get("filename"),
+        {cls.get("filename"): line_hits},
+        package_name,
+    )
+
+
+def _create_coverage_item_from_line_hits(
+    class_name: str,
+    file_name: str,
+    line_hits: Dict[str, LineHits],
+    package_name: str = "",
+) -> CoverageItem:
     coverable_lines = 0
     covered_lines = 0
     uncovered_line_numbers = []
@@ -64,47 +640,71 @@ def _create_coverage_item(cls) -> CoverageItem:
     covered_branches = 0
     uncovered_branch_line_numbers = []
 
-    for lines in cls.findall("lines"):
-        for line in lines.findall("line"):
-            coverable_lines += 1
-            line_number = int(line.get("number"))
+    for file_line_hits in line_hits.values():
+        coverable_lines += len(file_line_hits.line_numbers)
 
-            if int(line.get("hits")) > 0:
+        for line_number, hits in zip(file_line_hits.line_numbers, file_line_hits.hits):
+            if hits > 0:
                 covered_lines += 1
             else:
                 uncovered_line_numbers.append(line_number)
 
-            if line.get("branch") == "True":
-                conditional_coverage = _split_conditional_coverage(
-                    line.get("condition-coverage")
-                )
-
-                covered_branches += conditional_coverage[0]
-                branches += conditional_coverage[1]
+        for line_number, covered, total in zip(
+            file_line_hits.branch_line_numbers,
+            file_line_hits.covered_branches,
+            file_line_hits.branches,
+        ):
+            covered_branches += covered
+            branches += total
 
-                for _ in line.findall("conditions/condition"):
-                    if (
-                        int(line_number) not in uncovered_branch_line_numbers
-                        and conditional_coverage[0] < conditional_coverage[1]
-                    ):
-                        uncovered_branch_line_numbers.append(int(line_number))
+            if covered < total:
+                uncovered_branch_line_numbers.append(line_number)
 
     return CoverageItem(
         class_name,
         file_name,
         coverable_lines,
         covered_lines,
-        uncovered_line_numbers,
+        LineSet(uncovered_line_numbers),
         branches,
         covered_branches,
-        uncovered_branch_line_numbers,
+        LineSet(uncovered_branch_line_numbers),
+        line_hits,
+        package_name,
     )
 
 
-def _merge_coverage_items(existing: CoverageItem, new: CoverageItem):
-    existing.coverable_lines += new.coverable_lines
-    existing.covered_lines += new.covered_lines
-    existing.branches += new.branches
-    existing.covered_branches += new.covered_branches
-    existing.uncovered_line_numbers += new.uncovered_line_numbers
-    existing.uncovered_branch_line_numbers += new.uncovered_branch_line_numbers
+def _merge_coverage_items(items: List[CoverageItem]) -> CoverageItem:
+    first = items[0]
+
+    if all(item.line_hits is not None for item in items):
+        file_line_hits: Dict[str, List[LineHits]] = {}
+
+        for item in items:
+            for file_name, line_hits in item.line_hits.items():
+                file_line_hits.setdefault(file_name, []).append(line_hits)
+
+        return _create_coverage_item_from_line_hits(
+            first.name,
+            first.file_name,
+            {
+                file_name: merge_line_hits(line_hits)
+                for file_name, line_hits in file_line_hits.items()
+            },
+            first.package_name,
+        )
+
+    # without per-line data, counts can only be summed
+    return CoverageItem(
+        first.name,
+        first.file_name,
+        sum(item.coverable_lines for item in items),
+        sum(item.covered_lines for item in items),
+        functools.reduce(operator.or_, (i.uncovered_line_numbers for i in items)),
+        sum(item.branches for item in items),
+        sum(item.covered_branches for item in items),
+        functools.reduce(
+            operator.or_, (i.uncovered_branch_line_numbers for i in items)
+        ),
+        package_name=first.package_name,
+    )
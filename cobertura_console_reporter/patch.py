@@ -0,0 +1,187 @@
+"""Contains functions computing the coverage of lines changed by a unified diff."""
+
+import bisect
+import re
+from array import array
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, TextIO, Tuple
+
+from cobertura_console_reporter.coverage_item import CoverageItem
+from cobertura_console_reporter.line_hits import LineHits, merge_line_hits
+from cobertura_console_reporter.line_set import LineSet
+
+HUNK_HEADER_PATTERN = re.compile(r"^@@ -\d+(?:,(\d+))? \+(\d+)(?:,(\d+))? @@")
+
+
+class LineIntervals:
+    """Sorted, non-overlapping ranges of line numbers.
+
+    Lookups binary-search the range starts, so checking a line costs O(log n) in
+    the number of ranges no matter how many lines they span.
+    """
+
+    __slots__ = ("starts", "ends")
+
+    def __init__(self, ranges: Iterable[Tuple[int, int]] = ()):
+        self.starts = array("I")
+        self.ends = array("I")
+
+        for start, end in sorted(ranges):
+            if self.ends and start <= self.ends[-1] + 1:
+                self.ends[-1] = max(self.ends[-1], end)
+            else:
+                self.starts.append(start)
+                self.ends.append(end)
+
+    def __contains__(self, line_number: int) -> bool:
+        index = bisect.bisect_right(self.starts, line_number) - 1
+        return index >= 0 and line_number <= self.ends[index]
+
+    def __len__(self) -> int:
+        return sum(end - start + 1 for start, end in zip(self.starts, self.ends))
+
+
+@dataclass
+class PatchCoverage:
+    """Coverage of the coverable lines changed in a source file."""
+
+    file_name: str
+    covered_lines: int
+    uncovered_line_numbers: LineSet
+
+    @property
+    def changed_lines(self) -> int:
+        """Number of changed lines that are coverable"""
+        return self.covered_lines + len(self.uncovered_line_numbers)
+
+
+def parse_unified_diff(stream: TextIO) -> Dict[str, LineIntervals]:
+    """Reads the lines added or modified by a unified diff (e.g. `git diff`).
+
+    Args:
+        stream (TextIO): Unified diff text.
+
+    Returns:
+        Dict[str, LineIntervals]: Changed line ranges in the new version of each
+            file, keyed by normalized file path.
+    """
+    ranges: Dict[str, List[Tuple[int, int]]] = {}
+    file_ranges: Optional[List[Tuple[int, int]]] = None
+    old_remaining = new_remaining = 0
+    line_number = 0
+
+    for line in stream:
+        if old_remaining > 0 or new_remaining > 0:
+            marker = line[:1]
+
+            if marker == "+":
+                if file_ranges is not None:
+                    _append_line(file_ranges, line_number)
+                line_number += 1
+                new_remaining -= 1
+            elif marker == "-":
+                old_remaining -= 1
+            elif marker != "\\":
+                line_number += 1
+                old_remaining -= 1
+                new_remaining -= 1
+            continue
+
+        if line.startswith("+++ "):
+            path = line[4:].rstrip("\r\n").split("\t")[0]
+            file_ranges = None
+            if path != "/dev/null":
+                path = path[2:] if path.startswith("b/") else path
+                file_ranges = ranges.setdefault(normalize_path(path), [])
+            continue
+
+        match = HUNK_HEADER_PATTERN.match(line)
+        if match:
+            old_remaining = int(match.group(1) or 1)
+            line_number = int(match.group(2))
+            new_remaining = int(match.group(3) or 1)
+
+    return {path: LineIntervals(path_ranges) for path, path_ranges in ranges.items()}
+
+
+def compute_patch_coverage(
+    coverage_items: Iterable[CoverageItem], changed_lines: Dict[str, LineIntervals]
+) -> List[PatchCoverage]:
+    """Intersects changed line ranges with per-line hit data of parsed objects.
+
+    Coverage file names are matched with diff paths on their trailing path
+    components (backslashes normalized), since Coverlet reports paths relative to
+    its <source> directories while diffs are relative to the repository root.
+
+    Args:
+        coverage_items (Iterable[CoverageItem]): Parsed objects with line hit data.
+        changed_lines (Dict[str, LineIntervals]): Result of `parse_unified_diff`.
+
+    Returns:
+        List[PatchCoverage]: Coverage of the changed lines of each changed file that
+            has coverable lines, ordered by file name.
+    """
+    paths_by_base_name: Dict[str, List[str]] = {}
+    for path in changed_lines:
+        paths_by_base_name.setdefault(path.rsplit("/", 1)[-1], []).append(path)
+
+    file_line_hits: Dict[str, List[LineHits]] = {}
+    for item in coverage_items:
+        for file_name, line_hits in (item.line_hits or {}).items():
+            path = _match_path(normalize_path(file_name), paths_by_base_name)
+            if path is not None:
+                file_line_hits.setdefault(path, []).append(line_hits)
+
+    results = []
+    for path, line_hits in sorted(file_line_hits.items()):
+        results.append(
+            _intersect(path, merge_line_hits(line_hits), changed_lines[path])
+        )
+
+    return [result for result in results if result.changed_lines > 0]
+
+
+def normalize_path(path: str) -> str:
+    """Normalizes a file path for matching (forward slashes, no leading "./")."""
+    path = path.replace("\\", "/")
+    while path.startswith("./"):
+        path = path[2:]
+    return path
+
+
+def _append_line(file_ranges: List[Tuple[int, int]], line_number: int):
+    if file_ranges and file_ranges[-1][1] + 1 == line_number:
+        file_ranges[-1] = (file_ranges[-1][0], line_number)
+    else:
+        file_ranges.append((line_number, line_number))
+
+
+def _match_path(
+    file_name: str, paths_by_base_name: Dict[str, List[str]]
+) -> Optional[str]:
+    for path in paths_by_base_name.get(file_name.rsplit("/", 1)[-1], ()):
+        longer, shorter = (
+            (file_name, path) if len(file_name) >= len(path) else (path, file_name)
+        )
+        if longer == shorter or longer.endswith("/" + shorter.lstrip("/")):
+            return path
+
+    return None
+
+
+def _intersect(
+    path: str, line_hits: LineHits, intervals: LineIntervals
+) -> PatchCoverage:
+    covered_lines = 0
+    uncovered_line_numbers = []
+
+    for line_number, hits in zip(line_hits.line_numbers, line_hits.hits):
+        if line_number not in intervals:
+            continue
+
+        if hits > 0:
+            covered_lines += 1
+        else:
+            uncovered_line_numbers.append(line_number)
+
+    return PatchCoverage(path, covered_lines, LineSet(uncovered_line_numbers))
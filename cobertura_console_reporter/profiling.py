@@ -0,0 +1,345 @@
+"""Contains per-stage timing and memory instrumentation of report runs."""
+
+import contextlib
+import os
+import time
+from dataclasses import asdict, dataclass
+from typing import Callable, Dict, Iterator, List, Optional
+
+STAGE_READ = "read"
+STAGE_PARSE = "parse"
+STAGE_MERGE = "merge"
+STAGE_AGGREGATE = "aggregate"
+STAGE_RENDER = "render"
+STAGE_WRITE = "write"
+STAGES = (
+    STAGE_READ,
+    STAGE_PARSE,
+    STAGE_MERGE,
+    STAGE_AGGREGATE,
+    STAGE_RENDER,
+    STAGE_WRITE,
+)
+
+FORMAT_TABLE = "table"
+FORMAT_JSON = "json"
+FORMATS = (FORMAT_TABLE, FORMAT_JSON)
+
+
+@dataclass
+class StageStats:
+    """Resources used by a stage, summed over each time the stage ran.
+
+    Times exclude nested stages, so no time is counted in two stages.
+    `peak_memory` is the highest number of bytes allocated by Python above the
+    allocations live when the stage started (None when memory is not traced).
+    """
+
+    name: str
+    calls: int = 0
+    wall_time: float = 0.0
+    cpu_time: float = 0.0
+    peak_memory: Optional[int] = None
+    items: int = 0
+
+
+class StageRecord:  # pylint: disable=too-few-public-methods
+    """A running stage, whose item count is set by the instrumented code."""
+
+    __slots__ = (
+        "name",
+        "items",
+        "wall_start",
+        "cpu_start",
+        "memory_start",
+        "peak_memory",
+        "child_wall_time",
+        "child_cpu_time",
+    )
+
+    def __init__(self, name: str):
+        self.name = name
+        self.items = 0
+        self.wall_start = time.perf_counter()
+        self.cpu_start = time.process_time()
+        self.memory_start = 0
+        self.peak_memory = 0
+        self.child_wall_time = 0.0
+        self.child_cpu_time = 0.0
+
+
+class Profiler:
+    """Records the wall time, CPU time, peak memory and item counts of each stage
+    of a run.
+
+    Code reports its stages with the module-level `stage` function, which does
+    nothing unless a profiler is running. Hooks are called with the stats of each
+    stage run as it ends, e.g. to forward them to a metrics system. Only the current
+    process is profiled, so the CPU time and memory of worker processes are not
+    included (their wall time is, in the stage waiting for them).
+
+    Example:
+        with Profiler() as profiler:
+            coverage_items = parser.parse_files(file_paths)
+        print(format_table(profiler))
+    """
+
+    def __init__(
+        self,
+        trace_memory: bool = True,
+        cprofile_path: Optional[str] = None,
+        hooks: Optional[List[Callable[[StageStats], None]]] = None,
+    ):
+        self.trace_memory = trace_memory
+        self.cprofile_path = cprofile_path
+        self.hooks = list(hooks or [])
+        self.stats: Dict[str, StageStats] = {}
+        self.wall_time = 0.0
+        self.cpu_time = 0.0
+        self._stack: List[StageRecord] = []
+        self._pid = os.getpid()
+        self._start: Optional[StageRecord] = None
+        self._cprofile = None
+
+    def __enter__(self) -> "Profiler":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    @property
+    def active(self) -> bool:
+        """Whether this profiler records the stages of the current process"""
+        return _active is self and os.getpid() == self._pid
+
+    def start(self):
+        """Starts recording stages."""
+        global _active  # pylint: disable=global-statement
+
+        if self.trace_memory:
+            # imported on demand: tracing slows allocations down while it runs
+            import tracemalloc  # pylint: disable=import-outside-toplevel
+
+            tracemalloc.start()
+
+        if self.cprofile_path is not None:
+            import cProfile  # pylint: disable=import-outside-toplevel
+
+            self._cprofile = cProfile.Profile()
+            self._cprofile.enable()
+
+        self._start = StageRecord("")
+        _active = self
+
+    def stop(self):
+        """Stops recording stages, and writes the cProfile dump if requested."""
+        global _active  # pylint: disable=global-statement
+
+        if _active is self:
+            _active = None
+
+        if self._start is not None:
+            self.wall_time += time.perf_counter() - self._start.wall_start
+            self.cpu_time += time.process_time() - self._start.cpu_start
+            self._start = None
+
+        if self._cprofile is not None:
+            self._cprofile.disable()
+            self._cprofile.dump_stats(self.cprofile_path)
+            self._cprofile = None
+
+        if self.trace_memory:
+            import tracemalloc  # pylint: disable=import-outside-toplevel
+
+            tracemalloc.stop()
+
+    @contextlib.contextmanager
+    def stage(self, name: str) -> Iterator[StageRecord]:
+        """Records a stage while the context is open.
+
+        Args:
+            name (str): Name of the stage, e.g. one of `STAGES`.
+
+        Yields:
+            StageRecord: The running stage, whose `items` can be incremented.
+        """
+        record = StageRecord(name)
+        parent = self._stack[-1] if self._stack else None
+
+        if self.trace_memory:
+            import tracemalloc  # pylint: disable=import-outside-toplevel
+
+            current, peak = tracemalloc.get_traced_memory()
+            if parent is not None:
+                parent.peak_memory = max(parent.peak_memory, peak)
+            tracemalloc.reset_peak()
+            record.memory_start = record.peak_memory = current
+
+        self._stack.append(record)
+        try:
+            yield record
+        finally:
+            self._stack.pop()
+            self._end_stage(record, parent)
+
+    def _end_stage(self, record: StageRecord, parent: Optional[StageRecord]):
+        wall_time = time.perf_counter() - record.wall_start
+        cpu_time = time.process_time() - record.cpu_start
+        call = StageStats(
+            record.name,
+            1,
+            wall_time - record.child_wall_time,
+            cpu_time - record.child_cpu_time,
+            items=record.items,
+        )
+
+        if self.trace_memory:
+            import tracemalloc  # pylint: disable=import-outside-toplevel
+
+            peak = max(record.peak_memory, tracemalloc.get_traced_memory()[1])
+            call.peak_memory = peak - record.memory_start
+            if parent is not None:
+                parent.peak_memory = max(parent.peak_memory, peak)
+
+        if parent is not None:
+            parent.child_wall_time += wall_time
+            parent.child_cpu_time += cpu_time
+
+        stats = self.stats.setdefault(record.name, StageStats(record.name))
+        stats.calls += 1
+        stats.wall_time += call.wall_time
+        stats.cpu_time += call.cpu_time
+        stats.items += call.items
+        if call.peak_memory is not None:
+            stats.peak_memory = max(stats.peak_memory or 0, call.peak_memory)
+
+        for hook in self.hooks:
+            hook(call)
+
+
+class _NullRecord:  # pylint: disable=too-few-public-methods
+    """Stands in for a StageRecord when no profiler is running."""
+
+    __slots__ = ("items",)
+
+    def __init__(self):
+        self.items = 0
+
+
+_active: Optional[Profiler] = None  # pylint: disable=invalid-name
+
+
+@contextlib.contextmanager
+def stage(name: str) -> Iterator[StageRecord]:
+    """Records a stage with the running profiler, if any.
+
+    Args:
+        name (str): Name of the stage, e.g. one of `STAGES`.
+
+    Yields:
+        StageRecord: The running stage, whose `items` can be incremented.
+    """
+    if _active is None or not _active.active:
+        yield _NullRecord()
+        return
+
+    with _active.stage(name) as record:
+        yield record
+
+
+def is_active() -> bool:
+    """Whether a profiler records the stages of the current process
+
+    Returns:
+        bool: True while a profiler is running.
+    """
+    return _active is not None and _active.active
+
+
+def ordered_stats(profiler: Profiler) -> List[StageStats]:
+    """Stats of each stage that ran, in pipeline order.
+
+    Args:
+        profiler (Profiler): Profiler of a run.
+
+    Returns:
+        List[StageStats]: Stats of the `STAGES`, followed by other stages.
+    """
+    order = {name: position for position, name in enumerate(STAGES)}
+    return sorted(
+        profiler.stats.values(), key=lambda stats: order.get(stats.name, len(order))
+    )
+
+
+def format_table(profiler: Profiler) -> str:
+    """Formats the stats of a run as a human-readable table.
+
+    Args:
+        profiler (Profiler): Profiler of a run.
+
+    Returns:
+        str: Table with a row per stage and a row for the whole run.
+    """
+    header = ("Stage", "Calls", "Wall ms", "CPU ms", "Peak MiB", "Items")
+    rows = [
+        (
+            stats.name,
+            str(stats.calls),
+            f"{stats.wall_time * 1000:.1f}",
+            f"{stats.cpu_time * 1000:.1f}",
+            _format_memory(stats.peak_memory),
+            str(stats.items),
+        )
+        for stats in ordered_stats(profiler)
+    ]
+    rows.append(
+        (
+            "total",
+            "",
+            f"{profiler.wall_time * 1000:.1f}",
+            f"{profiler.cpu_time * 1000:.1f}",
+            "",
+            "",
+        )
+    )
+
+    widths = [max(len(row[i]) for row in [header, *rows]) for i in range(len(header))]
+    lines = [
+        "  ".join(
+            value.ljust(width) if i == 0 else value.rjust(width)
+            for i, (value, width) in enumerate(zip(row, widths))
+        ).rstrip()
+        for row in [header, *rows]
+    ]
+    lines.insert(1, "  ".join("-" * width for width in widths))
+
+    return "\n".join(lines) + "\n"
+
+
+def format_json(profiler: Profiler) -> str:
+    """Formats the stats of a run as a JSON object.
+
+    Args:
+        profiler (Profiler): Profiler of a run.
+
+    Returns:
+        str: JSON object with the stats of each stage (times in seconds, memory in
+            bytes) and the totals of the run.
+    """
+    import json  # pylint: disable=import-outside-toplevel
+
+    return (
+        json.dumps(
+            {
+                "stages": [asdict(stats) for stats in ordered_stats(profiler)],
+                "wall_time": profiler.wall_time,
+                "cpu_time": profiler.cpu_time,
+            }
+        )
+        + "\n"
+    )
+
+
+def _format_memory(peak_memory: Optional[int]) -> str:
+    return f"{peak_memory / 1024 / 1024:.1f}" if peak_memory is not None else "n/a"
@@ -0,0 +1,428 @@
+"""Contains renderers writing coverage reports in machine-readable formats."""
+
+import functools
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Iterator, Optional, TextIO, Type, Union
+
+from cobertura_console_reporter.coverage_item import CoverageItem
+from cobertura_console_reporter.coverage_metrics import CoverageMetrics
+from cobertura_console_reporter.coverage_table import CoverageTable
+from cobertura_console_reporter.formatter_config import FormatterConfig
+from cobertura_console_reporter.line_set import LineSet
+from cobertura_console_reporter.thresholds import is_below_percent
+from cobertura_console_reporter.metrics import ReportMetrics, compute_metrics
+
+ROW_CLASS = "class"
+ROW_NAMESPACE = "namespace"
+ROW_TOTAL = "total"
+
+
+@dataclass
+class ReportRow:
+    """A class, namespace aggregate or report total of a coverage report.
+
+    `group` is the namespace row a class is listed under, which is an ancestor of
+    its namespace when deeper namespaces are collapsed.
+    """
+
+    kind: str
+    name: str
+    namespace: str
+    metrics: CoverageMetrics
+    class_name: str = ""
+    file_name: str = ""
+    uncovered_line_numbers: LineSet = field(default_factory=LineSet)
+    group: str = ""
+
+    @property
+    def display_name(self) -> str:
+        """Name relative to the group, e.g. "Services.FirstService" in "App"."""
+        if self.kind != ROW_CLASS or self.group == "":
+            return self.name
+        return self.name[len(self.group) + 1 :]
+
+
+def iter_report_rows(
+    coverage_items: Union[Iterable[CoverageItem], CoverageTable],
+    metrics: Optional[ReportMetrics] = None,
+    namespace_depth: Optional[int] = None,
+) -> Iterator[ReportRow]:
+    """Yields the rows of a coverage report in display order.
+
+    Each namespace aggregate is followed by the classes of the namespace, and the
+    report total comes last. Rows are produced one at a time from the table.
+
+    Args:
+        coverage_items (Union[Iterable[CoverageItem], CoverageTable]): CoverageItems
+            to report.
+        metrics (ReportMetrics, optional): Metrics previously computed for the items.
+            Computed when not given. Defaults to None.
+        namespace_depth (int, optional): Collapses deeper namespaces into their
+            ancestor at this depth. Defaults to None.
+
+    Yields:
+        ReportRow: Rows of the report.
+    """
+    table = CoverageTable.from_items(coverage_items)
+    if metrics is None:
+        metrics = compute_metrics(table)
+
+    for group in metrics.namespace_tree.groups(namespace_depth):
+        if group.name != "":
+            yield ReportRow(ROW_NAMESPACE, group.name, group.name, group.metrics)
+
+        for row in group.rows:
+            yield _class_row(table, row, group.name)
+
+    yield ReportRow(ROW_TOTAL, "Total", "", metrics.total)
+
+
+def iter_class_rows(
+    coverage_items: Union[Iterable[CoverageItem], CoverageTable],
+) -> Iterator[ReportRow]:
+    """Yields a row per class, in table order.
+
+    Args:
+        coverage_items (Union[Iterable[CoverageItem], CoverageTable]): CoverageItems
+            to report.
+
+    Yields:
+        ReportRow: Class rows.
+    """
+    table = CoverageTable.from_items(coverage_items)
+    for row in range(len(table)):
+        yield _class_row(table, row, table.class_namespaces[row])
+
+
+def iter_namespace_rows(
+    metrics: ReportMetrics, namespace_depth: Optional[int] = None
+) -> Iterator[ReportRow]:
+    """Yields a row per namespace aggregate, excluding the global namespace.
+
+    Args:
+        metrics (ReportMetrics): Metrics of a report.
+        namespace_depth (int, optional): Collapses deeper namespaces into their
+            ancestor at this depth, as the report displays them. Defaults to None.
+
+    Yields:
+        ReportRow: Namespace rows.
+    """
+    for group in metrics.namespace_tree.groups(namespace_depth):
+        if group.name != "":
+            yield ReportRow(ROW_NAMESPACE, group.name, group.name, group.metrics)
+
+
+class Renderer:
+    """Writes report rows to a text stream as they are produced.
+
+    Subclasses implement `write_row`, and optionally `begin` and `end` to write
+    content before the first and after the last row.
+    """
+
+    def __init__(self, stream: TextIO, config: FormatterConfig):
+        self.stream = stream
+        self.config = config
+
+    def render(self, rows: Iterable[ReportRow]):
+        """Writes a whole report.
+
+        Args:
+            rows (Iterable[ReportRow]): Rows of the report, as produced by
+                `iter_report_rows`.
+        """
+        self.begin()
+        for row in rows:
+            self.write_row(row)
+        self.end()
+
+    def begin(self):
+        """Writes content preceding the first row."""
+
+    def write_row(self, row: ReportRow):
+        """Writes a single row.
+
+        Args:
+            row (ReportRow): Row to write.
+        """
+        raise NotImplementedError
+
+    def end(self):
+        """Writes content following the last row."""
+
+
+class JsonLinesRenderer(Renderer):
+    """Writes each row as a JSON object on its own line."""
+
+    def __init__(self, stream: TextIO, config: FormatterConfig):
+        super().__init__(stream, config)
+        # modules of each format are imported on demand, keeping them off the
+        # startup path of console reports
+        import json  # pylint: disable=import-outside-toplevel
+
+        self._dumps = json.dumps
+
+    def write_row(self, row: ReportRow):
+        record = {
+            "type": row.kind,
+            "name": row.name,
+            "namespace": row.namespace,
+            "class_name": row.class_name,
+            "file_name": row.file_name,
+            "coverable_lines": row.metrics.coverable_lines,
+            "covered_lines": row.metrics.covered_lines,
+            "line_rate": row.metrics.line_rate,
+            "branches": row.metrics.branches,
+            "covered_branches": row.metrics.covered_branches,
+            "branch_rate": row.metrics.branch_rate,
+            "uncovered_lines": [
+                list(line_range) for line_range in row.uncovered_line_numbers.ranges()
+            ],
+        }
+        self.stream.write(self._dumps(record, separators=(",", ":")))
+        self.stream.write("\n")
+
+
+class CsvRenderer(Renderer):
+    """Writes each row as a line of comma-separated values, after a header line."""
+
+    HEADER = [
+        "type",
+        "name",
+        "namespace",
+        "class_name",
+        "file_name",
+        "coverable_lines",
+        "covered_lines",
+        "line_rate",
+        "branches",
+        "covered_branches",
+        "branch_rate",
+        "uncovered_lines",
+    ]
+
+    def __init__(self, stream: TextIO, config: FormatterConfig):
+        super().__init__(stream, config)
+        import csv  # pylint: disable=import-outside-toplevel
+
+        self._writer = csv.writer(stream, lineterminator="\n")
+
+    def begin(self):
+        self._writer.writerow(self.HEADER)
+
+    def write_row(self, row: ReportRow):
+        self._writer.writerow(
+            [
+                row.kind,
+                row.name,
+                row.namespace,
+                row.class_name,
+                row.file_name,
+                row.metrics.coverable_lines,
+                row.metrics.covered_lines,
+                _format_rate(row.metrics.line_rate),
+                row.metrics.branches,
+                row.metrics.covered_branches,
+                _format_rate(row.metrics.branch_rate),
+                _format_ranges(row.uncovered_line_numbers),
+            ]
+        )
+
+
+class MarkdownRenderer(Renderer):
+    """Writes rows as a Markdown table, e.g. for pull request comments."""
+
+    def begin(self):
+        self.stream.write("| Class Name | % Lines | % Branches | Uncovered Line #s |\n")
+        self.stream.write("|:-----------|--------:|-----------:|:------------------|\n")
+
+    def write_row(self, row: ReportRow):
+        if row.kind == ROW_CLASS:
+            indent = "&nbsp;&nbsp;" if row.group != "" else ""
+            name = indent + _escape_markdown(row.display_name)
+        else:
+            name = f"**{_escape_markdown(row.name)}**"
+
+        self.stream.write(
+            f"| {name} | {_format_percent(row.metrics.line_rate)} | "
+            + f"{_format_percent(row.metrics.branch_rate)} | "
+            + f"{_format_ranges(row.uncovered_line_numbers)} |\n"
+        )
+
+
+class JUnitRenderer(Renderer):
+    """Writes rows as a JUnit XML report, with a test suite per namespace and a test
+    case per class. Classes below the warning threshold are reported as failures.
+    """
+
+    def __init__(self, stream: TextIO, config: FormatterConfig):
+        super().__init__(stream, config)
+        self._suite_name: Optional[str] = None
+
+    def begin(self):
+        self.stream.write('<?xml version="1.0" encoding="utf-8"?>\n')
+        self.stream.write('<testsuites name="coverage">\n')
+
+    def write_row(self, row: ReportRow):
+        if row.kind == ROW_TOTAL:
+            return
+
+        if row.kind == ROW_NAMESPACE:
+            self._close_suite()
+            self._open_suite(row.name)
+            return
+
+        if self._suite_name != row.group:
+            self._close_suite()
+            self._open_suite(row.group)
+
+        self.stream.write(
+            f"    <testcase classname={_quote(row.namespace)} "
+            + f"name={_quote(row.class_name)} file={_quote(row.file_name)}"
+        )
+
+        message = self._failure_message(row.metrics)
+        if message is None:
+            self.stream.write(" />\n")
+            return
+
+        uncovered_lines = _format_ranges(row.uncovered_line_numbers)
+        self.stream.write(">\n")
+        self.stream.write(
+            f'      <failure type="coverage" message={_quote(message)}>'
+            + f"Uncovered lines: {_html().escape(uncovered_lines)}</failure>\n"
+        )
+        self.stream.write("    </testcase>\n")
+
+    def end(self):
+        self._close_suite()
+        self.stream.write("</testsuites>\n")
+
+    def _open_suite(self, name: str):
+        self.stream.write(f"  <testsuite name={_quote(name)}>\n")
+        self._suite_name = name
+
+    def _close_suite(self):
+        if self._suite_name is not None:
+            self.stream.write("  </testsuite>\n")
+            self._suite_name = None
+
+    def _failure_message(self, metrics: CoverageMetrics) -> Optional[str]:
+        threshold = self.config.warning_threshold
+        if not threshold:
+            return None
+
+        for label, (covered, total) in (
+            ("Line", metrics.line_counts),
+            ("Branch", metrics.branch_counts),
+        ):
+            if is_below_percent(covered, total, threshold):
+                rate = _format_percent(covered / total)
+                return f"{label} coverage {rate} is below {threshold:g}%"
+
+        return None
+
+
+RENDERERS: Dict[str, Type[Renderer]] = {
+    "jsonl": JsonLinesRenderer,
+    "csv": CsvRenderer,
+    "markdown": MarkdownRenderer,
+    "junit": JUnitRenderer,
+}
+
+
+def render_report(
+    format_name: str,
+    coverage_items: Union[Iterable[CoverageItem], CoverageTable],
+    config: FormatterConfig,
+    stream: TextIO,
+    metrics: Optional[ReportMetrics] = None,
+):
+    """Writes a coverage report to a text stream with the renderer of a format.
+
+    Args:
+        format_name (str): Output format, one of `RENDERERS`.
+        coverage_items (Union[Iterable[CoverageItem], CoverageTable]): CoverageItems
+            to report.
+        config (FormatterConfig): Formatting configuration
+        stream (TextIO): Stream to write to (e.g. sys.stdout or an open file).
+        metrics (ReportMetrics, optional): Metrics previously computed for the items.
+            Computed when not given. Defaults to None.
+
+    Raises:
+        ValueError: The output format is unknown.
+    """
+    rows = iter_report_rows(coverage_items, metrics, config.namespace_depth)
+    render_rows(format_name, rows, config, stream)
+
+
+def render_rows(
+    format_name: str,
+    rows: Iterable[ReportRow],
+    config: FormatterConfig,
+    stream: TextIO,
+):
+    """Writes report rows to a text stream with the renderer of a format.
+
+    Args:
+        format_name (str): Output format, one of `RENDERERS`.
+        rows (Iterable[ReportRow]): Rows to write.
+        config (FormatterConfig): Formatting configuration
+        stream (TextIO): Stream to write to (e.g. sys.stdout or an open file).
+
+    Raises:
+        ValueError: The output format is unknown.
+    """
+    renderer_type = RENDERERS.get(format_name)
+    if renderer_type is None:
+        raise ValueError(f"Unknown output format: {format_name}")
+
+    renderer_type(stream, config).render(rows)
+
+
+def _class_row(table: CoverageTable, row: int, group: str) -> ReportRow:
+    return ReportRow(
+        ROW_CLASS,
+        table.names[row],
+        table.class_namespaces[row],
+        CoverageMetrics(
+            table.coverable_lines[row],
+            table.covered_lines[row],
+            table.branches[row],
+            table.covered_branches[row],
+        ),
+        class_name=table.class_names[row],
+        file_name=table.file_names[row],
+        uncovered_line_numbers=table.uncovered_line_numbers[row]
+        | table.uncovered_branch_line_numbers[row],
+        group=group,
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def _html():
+    import html  # pylint: disable=import-outside-toplevel
+
+    return html
+
+
+def _format_rate(rate: Optional[float]) -> str:
+    return format(rate, ".4f") if rate is not None else ""
+
+
+def _format_percent(rate: Optional[float]) -> str:
+    return format(rate, ".0%") if rate is not None else "n/a"
+
+
+def _format_ranges(numbers: LineSet) -> str:
+    return ", ".join(
+        str(start) if start == end else f"{start}-{end}"
+        for start, end in numbers.ranges()
+    )
+
+
+def _escape_markdown(text: str) -> str:
+    return _html().escape(text, quote=False).replace("|", "\\|")
+
+
+def _quote(value: str) -> str:
+    return f'"{_html().escape(value, quote=True)}"'
@@ -0,0 +1,299 @@
+"""Contains a long-running report server keeping parsed coverage files in memory,
+and the client used to request reports from it."""
+
+import contextlib
+import io
+import json
+import os
+import socket
+import socketserver
+import tempfile
+from collections import OrderedDict
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from cobertura_console_reporter.coverage_item import CoverageItem
+from cobertura_console_reporter.watch import FileSignature, file_signature
+
+DEFAULT_MAX_ITEMS = 1_000_000
+REQUEST_QUEUE_SIZE = 64
+RECEIVE_SIZE = 64 * 1024
+
+_CacheKey = Tuple[str, Optional[str], Optional[str]]
+
+
+class ServerResponse(NamedTuple):
+    """Output of a report rendered by a server."""
+
+    exit_code: int
+    stdout: str
+    stderr: str
+
+
+def is_supported() -> bool:
+    """Whether Unix domain sockets, used to reach the server, are available
+
+    Returns:
+        bool: True if the platform supports Unix domain sockets.
+    """
+    return hasattr(socket, "AF_UNIX")
+
+
+def default_socket_path() -> str:
+    """Default socket path of the server of the current user
+
+    The socket is placed in a directory of its own, which the server creates so that
+    only the current user can access it.
+
+    Returns:
+        str: path in the user runtime directory, or the temporary directory
+    """
+    directory = os.environ.get("XDG_RUNTIME_DIR") or tempfile.gettempdir()
+    return os.path.join(
+        directory, f"cobertura-console-reporter-{os.getuid()}", "server.sock"
+    )
+
+
+class ParsedFileCache:
+    """LRU cache of parsed coverage files, kept in memory by the report server.
+
+    Entries are keyed on the absolute path of a file and the package and class
+    filters, and hold the size and modification time of the file when it was
+    parsed, so files that changed are parsed again. The least recently used
+    entries are evicted once more than `max_items` CoverageItems are cached.
+    """
+
+    def __init__(self, max_items: int = DEFAULT_MAX_ITEMS):
+        self.max_items = max_items
+        self.item_count = 0
+        self._entries: (
+            "OrderedDict[_CacheKey, Tuple[FileSignature, List[CoverageItem]]]"
+        ) = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def parse_each(
+        self,
+        file_paths: List[str],
+        package_name: Optional[str],
+        class_pattern: Optional[str],
+        parse_each: Callable[[List[str]], Dict[str, List[CoverageItem]]],
+    ) -> Dict[str, List[CoverageItem]]:
+        """Returns the objects of each file, parsing only files not cached.
+
+        Args:
+            file_paths (List[str]): paths to the coverage.cobertura.xml files
+            package_name (Optional[str]): Package filter used when parsing.
+            class_pattern (Optional[str]): Class filter used when parsing.
+            parse_each (Callable[[List[str]], Dict[str, List[CoverageItem]]]):
+                Function parsing files that are not cached, e.g. a call to
+                `parser.parse_each_file` with the same filters.
+
+        Returns:
+            Dict[str, List[CoverageItem]]: Objects of each file, keyed by file path.
+        """
+        parsed: Dict[str, List[CoverageItem]] = {}
+        missing: Dict[str, Optional[FileSignature]] = {}
+
+        for file_path in file_paths:
+            key = (os.path.abspath(file_path), package_name, class_pattern)
+            # read before parsing, so a file written meanwhile is parsed again later
+            signature = file_signature(file_path)
+            entry = self._entries.get(key)
+
+            if entry is not None and signature is not None and entry[0] == signature:
+                self._entries.move_to_end(key)
+                parsed[file_path] = entry[1]
+            else:
+                missing[file_path] = signature
+
+        if missing:
+            for file_path, coverage_items in parse_each(list(missing)).items():
+                parsed[file_path] = coverage_items
+                self._store(
+                    (os.path.abspath(file_path), package_name, class_pattern),
+                    missing[file_path],
+                    coverage_items,
+                )
+
+        return parsed
+
+    def _store(
+        self,
+        key: _CacheKey,
+        signature: Optional[FileSignature],
+        coverage_items: List[CoverageItem],
+    ):
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self.item_count -= len(previous[1])
+
+        if signature is None:
+            return
+
+        self._entries[key] = (signature, coverage_items)
+        self.item_count += len(coverage_items)
+
+        # the entry just stored is kept even when larger than the limit
+        while self.item_count > self.max_items and len(self._entries) > 1:
+            _, (_, evicted) = self._entries.popitem(last=False)
+            self.item_count -= len(evicted)
+
+
+class ReportServer(socketserver.UnixStreamServer):
+    """Renders reports requested over a Unix domain socket.
+
+    Requests are handled one at a time: reports are rendered by redirecting the
+    standard streams and changing to the client's working directory, which are
+    process-wide. Clients waiting for a file being parsed would otherwise parse it
+    themselves, and find it cached once their turn comes. The socket, and its
+    directory when the server creates it, are only accessible to the user running
+    the server.
+    """
+
+    request_queue_size = REQUEST_QUEUE_SIZE
+
+    def __init__(self, socket_path: str, run_report: Callable[[List[str]], int]):
+        self.run_report = run_report
+
+        os.makedirs(os.path.dirname(socket_path) or os.curdir, 0o700, exist_ok=True)
+        umask = os.umask(0o177)
+        try:
+            super().__init__(socket_path, _RequestHandler)
+        finally:
+            os.umask(umask)
+
+    def render(self, argv: List[str], cwd: str) -> ServerResponse:
+        """Renders a report in a working directory, capturing its output.
+
+        Args:
+            argv (List[str]): Command-line arguments of the report.
+            cwd (str): Working directory of the client.
+
+        Returns:
+            ServerResponse: an instance of a ServerResponse
+        """
+        stdout = io.StringIO()
+        stderr = io.StringIO()
+        server_cwd = os.getcwd()
+
+        try:
+            os.chdir(cwd)
+            with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+                exit_code = self.run_report(argv) or 0
+        except SystemExit as ex:
+            exit_code = _exit_code(ex.code, stderr)
+        except Exception as error:  # pylint: disable=broad-exception-caught
+            stderr.write(f"Failed to create report: {error}\n")
+            exit_code = 1
+        finally:
+            os.chdir(server_cwd)
+
+        return ServerResponse(exit_code, stdout.getvalue(), stderr.getvalue())
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    """Reads a JSON request line and writes back a JSON response line."""
+
+    server: ReportServer
+
+    def handle(self):
+        line = self.rfile.readline()
+        if not line:
+            # connections probing whether a server is listening send nothing
+            return
+
+        try:
+            request = json.loads(line)
+            response = self.server.render(list(request["argv"]), request["cwd"])
+        except (ValueError, KeyError, TypeError) as error:
+            response = ServerResponse(2, "", f"Invalid request: {error}\n")
+
+        self.wfile.write(json.dumps(response._asdict()).encode("utf-8") + b"\n")
+
+
+def serve(socket_path: str, run_report: Callable[[List[str]], int]):
+    """Serves report requests until interrupted.
+
+    Args:
+        socket_path (str): path of the Unix domain socket to listen on
+        run_report (Callable[[List[str]], int]): Function rendering the report of
+            command-line arguments to the standard streams, returning or exiting with
+            the exit code.
+
+    Raises:
+        RuntimeError: Another server is listening on the socket.
+    """
+    if os.path.exists(socket_path):
+        if _is_listening(socket_path):
+            raise RuntimeError(f"A server is already listening on {socket_path}")
+        os.unlink(socket_path)
+
+    with ReportServer(socket_path, run_report) as server:
+        try:
+            server.serve_forever()
+        finally:
+            os.unlink(socket_path)
+
+
+def request_report(
+    socket_path: str, argv: List[str], cwd: str
+) -> Optional[ServerResponse]:
+    """Requests a report from a server.
+
+    Args:
+        socket_path (str): path of the server's Unix domain socket
+        argv (List[str]): Command-line arguments of the report.
+        cwd (str): Working directory that relative paths are resolved against.
+
+    Only sockets owned by the current user and inaccessible to anyone else are
+    connected to: another user could otherwise create the socket of a predictable
+    path first, and answer with reports and exit codes of their own.
+
+    Returns:
+        Optional[ServerResponse]: The server's response, or None if no server is
+            listening, the socket is not private to the user or the request failed.
+    """
+    if not is_supported() or not _is_private(socket_path):
+        return None
+
+    request = json.dumps({"argv": argv, "cwd": cwd}).encode("utf-8") + b"\n"
+
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+            connection.connect(socket_path)
+            connection.sendall(request)
+            connection.shutdown(socket.SHUT_WR)
+            response = b"".join(iter(lambda: connection.recv(RECEIVE_SIZE), b""))
+
+        data = json.loads(response)
+        return ServerResponse(int(data["exit_code"]), data["stdout"], data["stderr"])
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def _is_private(socket_path: str) -> bool:
+    try:
+        status = os.stat(socket_path)
+    except OSError:
+        return False
+    return status.st_uid == os.getuid() and status.st_mode & 0o077 == 0
+
+
+def _is_listening(socket_path: str) -> bool:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+        try:
+            connection.connect(socket_path)
+        except OSError:
+            return False
+    return True
+
+
+def _exit_code(code, stderr: io.StringIO) -> int:
+    # mirrors how the interpreter exits with the argument of sys.exit
+    if code is None:
+        return 0
+    if isinstance(code, int):
+        return code
+    stderr.write(f"{code}\n")
+    return 1
@@ -0,0 +1,287 @@
+"""Contains coverage thresholds used to fail builds when coverage is too low."""
+
+import functools
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Tuple
+
+if TYPE_CHECKING:  # pragma: no cover
+    from fractions import Fraction
+
+LEVEL_TOTAL = "total"
+LEVEL_PACKAGE = "package"
+LEVEL_NAMESPACE = "namespace"
+LEVEL_CLASS = "class"
+LEVELS = (LEVEL_TOTAL, LEVEL_PACKAGE, LEVEL_NAMESPACE, LEVEL_CLASS)
+
+METRIC_LINE = "line"
+METRIC_BRANCH = "branch"
+METRICS = (METRIC_LINE, METRIC_BRANCH)
+
+# Exit code bits, combined when thresholds of several levels are not met. 1 and 2
+# are already used for missing files and invalid arguments.
+EXIT_CODES = {
+    LEVEL_TOTAL: 4,
+    LEVEL_PACKAGE: 8,
+    LEVEL_NAMESPACE: 16,
+    LEVEL_CLASS: 32,
+}
+
+
+@dataclass
+class Threshold:
+    """Minimum line and branch coverage percentages (None when not enforced)."""
+
+    line: Optional[float] = None
+    branch: Optional[float] = None
+
+    def merged(self, override: "Threshold") -> "Threshold":
+        """Returns this threshold with the values set by another one replaced.
+
+        Args:
+            override (Threshold): Threshold whose values take precedence.
+
+        Returns:
+            Threshold: an instance of a Threshold
+        """
+        return Threshold(
+            override.line if override.line is not None else self.line,
+            override.branch if override.branch is not None else self.branch,
+        )
+
+
+@dataclass
+class ThresholdViolation:
+    """A class, namespace, package or report total below a coverage threshold."""
+
+    level: str
+    name: str
+    metric: str
+    rate: float
+    threshold: float
+
+    def __str__(self) -> str:
+        name = f" {self.name}" if self.name else ""
+        return (
+            f"{self.level}{name}: {self.metric} coverage {self.rate:.1%} is below "
+            + f"{self.threshold:g}%"
+        )
+
+
+@dataclass
+class Thresholds:
+    """Fail thresholds of each report level.
+
+    Namespace overrides replace the namespace and class level thresholds of a
+    namespace and its child namespaces; the longest matching namespace wins.
+    """
+
+    levels: Dict[str, Threshold] = field(default_factory=dict)
+    namespace_overrides: Dict[str, Dict[str, Threshold]] = field(default_factory=dict)
+    _resolved: Dict[Tuple[str, str], Threshold] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+
+    def __bool__(self) -> bool:
+        return any(
+            threshold.line is not None or threshold.branch is not None
+            for thresholds in (self.levels, *self.namespace_overrides.values())
+            for threshold in thresholds.values()
+        )
+
+    def set(self, level: str, metric: str, percent: float):
+        """Sets the threshold of a level and metric.
+
+        Args:
+            level (str): One of `LEVELS`.
+            metric (str): One of `METRICS`.
+            percent (float): Minimum coverage percentage.
+        """
+        threshold = self.levels.setdefault(level, Threshold())
+        setattr(threshold, metric, percent)
+        self._resolved.clear()
+
+    def threshold(self, level: str, namespace: str = "") -> Threshold:
+        """Threshold of a level, with the overrides of a namespace applied.
+
+        Args:
+            level (str): One of `LEVELS`.
+            namespace (str, optional): Namespace of the namespace or class checked.
+                Defaults to "".
+
+        Returns:
+            Threshold: an instance of a Threshold
+        """
+        key = (level, namespace)
+        resolved = self._resolved.get(key)
+
+        if resolved is None:
+            resolved = self.levels.get(level, Threshold())
+            override = self._find_override(namespace)
+            if override is not None and level in override:
+                resolved = resolved.merged(override[level])
+            self._resolved[key] = resolved
+
+        return resolved
+
+    # pylint: disable-next=too-many-arguments,too-many-positional-arguments
+    def check(
+        self,
+        violations: List[ThresholdViolation],
+        level: str,
+        name: str,
+        line_counts: Tuple[int, int],
+        branch_counts: Tuple[int, int],
+        namespace: str = "",
+    ):
+        """Appends a violation for each coverage below its threshold.
+
+        Counts are compared exactly, so coverage at a threshold meets it.
+
+        Args:
+            violations (List[ThresholdViolation]): List to append violations to.
+            level (str): One of `LEVELS`.
+            name (str): Name of the class, namespace or package checked.
+            line_counts (Tuple[int, int]): Covered and coverable lines.
+            branch_counts (Tuple[int, int]): Covered and total branches.
+            namespace (str, optional): Namespace used to look up overrides. Defaults
+                to "".
+        """
+        threshold = self.threshold(level, namespace)
+
+        for metric, (covered, total), percent in (
+            (METRIC_LINE, line_counts, threshold.line),
+            (METRIC_BRANCH, branch_counts, threshold.branch),
+        ):
+            if is_below_percent(covered, total, percent):
+                violations.append(
+                    ThresholdViolation(level, name, metric, covered / total, percent)
+                )
+
+    def _find_override(self, namespace: str) -> Optional[Dict[str, Threshold]]:
+        while True:
+            override = self.namespace_overrides.get(namespace)
+            if override is not None or "." not in namespace:
+                return override
+            namespace = namespace.rsplit(".", 1)[0]
+
+
+def is_below_percent(covered: int, total: int, percent: Optional[float]) -> bool:
+    """Whether a coverage ratio is below a percentage, compared exactly.
+
+    `covered / total * 100` is not exact in floating point (e.g. 29 of 100 lines
+    gives 28.999999999999996), so the counts are compared to the percentage as it
+    was written instead.
+
+    Args:
+        covered (int): Covered lines or branches.
+        total (int): Coverable lines or branches.
+        percent (Optional[float]): Percentage, e.g. a threshold (None when not set).
+
+    Returns:
+        bool: True if there is something to cover and less than `percent` of it is.
+    """
+    if total <= 0 or percent is None:
+        return False
+
+    return covered * 100 < _exact_percent(percent) * total
+
+
+def load_thresholds(file_path: str) -> Thresholds:
+    """Loads thresholds from a JSON file.
+
+    The file maps levels to thresholds, e.g.
+    `{"total": {"line": 80}, "class": {"line": 50, "branch": 40}}`, and may contain a
+    "namespaces" object mapping namespaces to level thresholds that override them,
+    e.g. `{"namespaces": {"App.Legacy": {"class": {"line": 0}}}}`.
+
+    Args:
+        file_path (str): path to the JSON file
+
+    Raises:
+        ValueError: The file contains unknown levels or metrics.
+
+    Returns:
+        Thresholds: an instance of Thresholds
+    """
+    import json  # pylint: disable=import-outside-toplevel
+
+    with open(file_path, encoding="utf-8") as file:
+        data = json.load(file)
+
+    overrides = data.pop("namespaces", {})
+
+    return Thresholds(
+        _parse_levels(data),
+        {namespace: _parse_levels(levels) for namespace, levels in overrides.items()},
+    )
+
+
+def parse_threshold_spec(spec: str) -> Tuple[str, str, float]:
+    """Parses a command-line threshold such as "class:line=50" or "branch=80".
+
+    The level defaults to "total" when omitted.
+
+    Args:
+        spec (str): Threshold in the form [LEVEL:]METRIC=PERCENT.
+
+    Raises:
+        ValueError: The threshold is malformed.
+
+    Returns:
+        Tuple[str, str, float]: Level, metric and percentage.
+    """
+    target, _, percent = spec.partition("=")
+    level, _, metric = target.rpartition(":")
+    level = level or LEVEL_TOTAL
+
+    try:
+        if level in LEVELS and metric in METRICS:
+            return level, metric, float(percent)
+    except ValueError:
+        pass
+
+    raise ValueError(
+        f"Invalid threshold: {spec} (expected [LEVEL:]METRIC=PERCENT, with LEVEL "
+        + f"one of {', '.join(LEVELS)} and METRIC one of {', '.join(METRICS)})"
+    )
+
+
+def exit_code(violations: Iterable[ThresholdViolation]) -> int:
+    """Process exit code for threshold violations.
+
+    Args:
+        violations (Iterable[ThresholdViolation]): Violations found.
+
+    Returns:
+        int: 0 without violations, otherwise the `EXIT_CODES` bits of each level
+            with violations.
+    """
+    code = 0
+    for violation in violations:
+        code |= EXIT_CODES[violation.level]
+    return code
+
+
+@functools.lru_cache(maxsize=None)
+def _exact_percent(percent: float) -> "Fraction":
+    # imported on demand: only runs with thresholds or colors compare percentages
+    from fractions import Fraction  # pylint: disable=import-outside-toplevel
+
+    # the shortest repr of a float is the decimal it was parsed from, e.g. "29.1"
+    return Fraction(repr(float(percent)))
+
+
+def _parse_levels(data: dict) -> Dict[str, Threshold]:
+    levels = {}
+
+    for level, values in data.items():
+        if level not in LEVELS:
+            raise ValueError(f"Unknown threshold level: {level}")
+
+        unknown = set(values) - set(METRICS)
+        if unknown:
+            raise ValueError(f"Unknown threshold metric: {', '.join(sorted(unknown))}")
+
+        levels[level] = Threshold(**values)
+
+    return levels
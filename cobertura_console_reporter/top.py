@@ -0,0 +1,74 @@
+"""Contains selection of the worst-covered classes or namespaces of a report."""
+
+import heapq
+from typing import Callable, Dict, Iterable, List, Tuple
+
+from cobertura_console_reporter.renderers import ReportRow
+
+SORT_UNCOVERED_LINES = "uncovered-lines"
+SORT_LINE_RATE = "line-rate"
+SORT_BRANCH_RATE = "branch-rate"
+SORT_UNCOVERED_BRANCHES = "uncovered-branches"
+
+
+def _uncovered_lines(row: ReportRow) -> int:
+    return row.metrics.coverable_lines - row.metrics.covered_lines
+
+
+def _uncovered_branches(row: ReportRow) -> int:
+    return row.metrics.branches - row.metrics.covered_branches
+
+
+def _by_uncovered_lines(row: ReportRow) -> Tuple:
+    return (-_uncovered_lines(row), -_uncovered_branches(row), row.name)
+
+
+def _by_uncovered_branches(row: ReportRow) -> Tuple:
+    return (-_uncovered_branches(row), -_uncovered_lines(row), row.name)
+
+
+def _by_line_rate(row: ReportRow) -> Tuple:
+    rate = row.metrics.line_rate
+    # rows without coverable lines have nothing to cover, so they rank last
+    return (rate is None, rate or 0.0, -_uncovered_lines(row), row.name)
+
+
+def _by_branch_rate(row: ReportRow) -> Tuple:
+    rate = row.metrics.branch_rate
+    return (rate is None, rate or 0.0, -_uncovered_branches(row), row.name)
+
+
+SORT_KEYS: Dict[str, Callable[[ReportRow], Tuple]] = {
+    SORT_UNCOVERED_LINES: _by_uncovered_lines,
+    SORT_LINE_RATE: _by_line_rate,
+    SORT_BRANCH_RATE: _by_branch_rate,
+    SORT_UNCOVERED_BRANCHES: _by_uncovered_branches,
+}
+
+
+def select_top_rows(
+    rows: Iterable[ReportRow], count: int, sort_key: str = SORT_UNCOVERED_LINES
+) -> List[ReportRow]:
+    """Selects the worst-covered rows, worst first.
+
+    Rows are consumed one at a time and only the `count` worst rows seen so far are
+    kept in a bounded heap, so selection takes O(n log count) time and O(count)
+    memory instead of sorting every row.
+
+    Args:
+        rows (Iterable[ReportRow]): Class or namespace rows to select from.
+        count (int): Number of rows to select.
+        sort_key (str, optional): Ranking, one of `SORT_KEYS`. Defaults to
+            "uncovered-lines".
+
+    Raises:
+        ValueError: The sort key is unknown.
+
+    Returns:
+        List[ReportRow]: Up to `count` rows, worst first.
+    """
+    key = SORT_KEYS.get(sort_key)
+    if key is None:
+        raise ValueError(f"Unknown sort key: {sort_key}")
+
+    return heapq.nsmallest(count, rows, key=key)
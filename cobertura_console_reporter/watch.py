@@ -0,0 +1,239 @@
+"""Contains file watching used to re-render reports when coverage files change."""
+
+import ctypes
+import ctypes.util
+import itertools
+import os
+import select
+import sys
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from cobertura_console_reporter.coverage_item import CoverageItem
+from cobertura_console_reporter.parser import merge_coverage_items
+
+DEFAULT_POLL_INTERVAL = 1.0
+DEFAULT_DEBOUNCE = 0.5
+
+FileSignature = Tuple[int, int]
+_ParsedFile = Tuple[Optional[FileSignature], List[CoverageItem]]
+
+_IN_MODIFY = 0x00000002
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_INOTIFY_MASK = _IN_MODIFY | _IN_CLOSE_WRITE | _IN_MOVED_TO | _IN_CREATE | _IN_DELETE
+_INOTIFY_READ_SIZE = 64 * 1024
+
+
+def file_signature(file_path: str) -> Optional[FileSignature]:
+    """Size and modification time of a file, used to detect changes.
+
+    Args:
+        file_path (str): path to the file
+
+    Returns:
+        Optional[FileSignature]: (size, mtime in nanoseconds), or None if the file
+            does not exist.
+    """
+    try:
+        stat = os.stat(file_path)
+    except OSError:
+        return None
+    return stat.st_size, stat.st_mtime_ns
+
+
+class FileWatcher:
+    """Waits for a set of files to change.
+
+    On Linux the directories containing the files are watched with inotify, so
+    changes are picked up as soon as they are written. Elsewhere, or when inotify is
+    unavailable, files are polled every `poll_interval` seconds. Changes are only
+    reported once files have stopped changing for `debounce` seconds, so reports that
+    are still being written are not read partially.
+    """
+
+    def __init__(
+        self,
+        list_files: Callable[[], List[str]],
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+        debounce: float = DEFAULT_DEBOUNCE,
+        use_inotify: bool = True,
+    ):
+        self.list_files = list_files
+        self.poll_interval = poll_interval
+        self.debounce = debounce
+        self._inotify = _Inotify.create() if use_inotify else None
+        self._snapshot = self._take_snapshot()
+
+    @property
+    def uses_inotify(self) -> bool:
+        """Whether changes are detected with inotify rather than polling."""
+        return self._inotify is not None
+
+    def wait_for_changes(self) -> List[str]:
+        """Blocks until one or more files change, are created or are removed.
+
+        Returns:
+            List[str]: paths of the files that changed
+        """
+        while True:
+            self._wait(self.poll_interval)
+            snapshot = self._take_snapshot()
+
+            if snapshot == self._snapshot:
+                continue
+
+            while True:
+                time.sleep(self.debounce)
+                settled = self._take_snapshot()
+                if settled == snapshot:
+                    break
+                snapshot = settled
+
+            changed = [
+                file_path
+                for file_path in dict.fromkeys(
+                    itertools.chain(self._snapshot, snapshot)
+                )
+                if self._snapshot.get(file_path) != snapshot.get(file_path)
+            ]
+            self._snapshot = snapshot
+            return changed
+
+    def close(self):
+        """Stops watching files."""
+        if self._inotify is not None:
+            self._inotify.close()
+            self._inotify = None
+
+    def __enter__(self) -> "FileWatcher":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _take_snapshot(self) -> Dict[str, Optional[FileSignature]]:
+        file_paths = self.list_files()
+
+        if self._inotify is not None:
+            for file_path in file_paths:
+                self._inotify.watch(os.path.dirname(os.path.abspath(file_path)))
+
+        return {file_path: file_signature(file_path) for file_path in file_paths}
+
+    def _wait(self, timeout: float):
+        if self._inotify is None:
+            time.sleep(timeout)
+        else:
+            self._inotify.wait(timeout)
+
+
+class ParsedFiles:
+    """Keeps parsed coverage files in memory and re-parses only files that changed.
+
+    Results are keyed on each file's size and modification time. Merging does not
+    modify parsed objects, so results of unchanged files are reused as they are.
+    """
+
+    def __init__(
+        self, parse_each: Callable[[List[str]], Dict[str, List[CoverageItem]]]
+    ):
+        self.parse_each = parse_each
+        self._entries: Dict[str, _ParsedFile] = {}
+
+    def parse(self, file_paths: List[str]) -> List[CoverageItem]:
+        """Returns the merged objects of several coverage files.
+
+        Args:
+            file_paths (List[str]): paths to the coverage.cobertura.xml files
+
+        Returns:
+            List[CoverageItem]: List of objects representing test-covered .NET
+                classes.
+        """
+        signatures = {file_path: file_signature(file_path) for file_path in file_paths}
+        changed = [
+            file_path
+            for file_path, signature in signatures.items()
+            if file_path not in self._entries
+            or self._entries[file_path][0] != signature
+        ]
+
+        if changed:
+            for file_path, coverage_items in self.parse_each(changed).items():
+                self._entries[file_path] = (signatures[file_path], coverage_items)
+
+        return merge_coverage_items(
+            itertools.chain.from_iterable(
+                self._entries[file_path][1] for file_path in signatures
+            )
+        )
+
+    def retain(self, file_paths: List[str]):
+        """Drops results of files other than the given ones.
+
+        Args:
+            file_paths (List[str]): paths of the files to keep in memory
+        """
+        kept = set(file_paths)
+        for file_path in [path for path in self._entries if path not in kept]:
+            del self._entries[file_path]
+
+    def __contains__(self, file_path: str) -> bool:
+        return file_path in self._entries
+
+
+class _Inotify:
+    """Thin ctypes wrapper around the Linux inotify API."""
+
+    def __init__(self, libc: ctypes.CDLL, file_descriptor: int):
+        self._libc = libc
+        self._file_descriptor = file_descriptor
+        self._directories = set()
+
+    @staticmethod
+    def create() -> Optional["_Inotify"]:
+        """Creates an inotify instance, or returns None if inotify is unavailable."""
+        if not sys.platform.startswith("linux"):
+            return None
+
+        try:
+            libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+            file_descriptor = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        except (OSError, AttributeError):
+            return None
+
+        if file_descriptor < 0:
+            return None
+
+        return _Inotify(libc, file_descriptor)
+
+    def watch(self, directory: str):
+        """Watches a directory for file changes, unless it is already watched."""
+        if directory in self._directories or not os.path.isdir(directory):
+            return
+
+        watch_descriptor = self._libc.inotify_add_watch(
+            self._file_descriptor, os.fsencode(directory), _INOTIFY_MASK
+        )
+        if watch_descriptor >= 0:
+            self._directories.add(directory)
+
+    def wait(self, timeout: float):
+        """Blocks until a watched directory changes or `timeout` seconds pass."""
+        readable, _, _ = select.select([self._file_descriptor], [], [], timeout)
+        if readable:
+            self._drain()
+
+    def close(self):
+        """Closes the inotify instance."""
+        os.close(self._file_descriptor)
+
+    def _drain(self):
+        try:
+            while os.read(self._file_descriptor, _INOTIFY_READ_SIZE):
+                pass
+        except BlockingIOError:
+            pass
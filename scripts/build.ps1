@@ -1,11 +1,16 @@
 param(
     [Parameter(Mandatory = $true)]
     [Alias("v")]
-    [string]$Version
+    [string]$Version,
+
+    # Builds a directory distribution (dist/ccr/ccr.exe) instead of a single file.
+    # It starts faster since nothing is unpacked on each invocation.
+    [switch]$OneDir
 )
 
 $ErrorActionPreference = "Stop"
 $rootDir = (get-item $PSScriptRoot).Parent.FullName
 
 & "$rootDir/scripts/support/create-version-txt.ps1" -Version $Version -OutFile "$rootDir/build/version.txt"
-pyinstaller "$rootDir/cobertura_console_reporter/__main__.py" --name ccr --onefile --version-file "$rootDir/build/version.txt"
+$distMode = if ($OneDir) { "--onedir" } else { "--onefile" }
+pyinstaller "$rootDir/cobertura_console_reporter/__main__.py" --name ccr $distMode --version-file "$rootDir/build/version.txt"
@@ -4,17 +4,22 @@ set -euo pipefail
 ROOT_DIR="$(cd -P "$(dirname "${BASH_SOURCE[0]}")/.." && pwd)"
 
 VERSION=""
+DIST_MODE="--onefile"
 
 usage() {
   cat <<EOF
-Usage: $(basename "$0") -v <version> | --version <version>
+Usage: $(basename "$0") -v <version> | --version <version> [--onedir]
 Example: $(basename "$0") -v v1.2.3
+
+  --onedir  Build a directory distribution (dist/ccr/ccr) instead of a single
+            file. It starts faster since nothing is unpacked on each invocation.
 EOF
 }
 
 while [[ $# -gt 0 ]]; do
   case "$1" in
     -v|--version) VERSION="${2:-}"; shift 2;;
+    --onedir) DIST_MODE="--onedir"; shift;;
     -h|--help) usage; exit 0;;
     *) echo "Unknown argument: $1" >&2; usage; exit 2;;
   esac
@@ -33,6 +38,6 @@ export SETUPTOOLS_SCM_PRETEND_VERSION="$VER_STRIPPED"
 
 python -m PyInstaller "$ROOT_DIR/cobertura_console_reporter/__main__.py" \
   --name ccr \
-  --onefile \
+  "$DIST_MODE" \
   --version-file "$ROOT_DIR/build/version.txt" \
   --copy-metadata cobertura-console-reporter
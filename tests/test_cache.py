@@ -0,0 +1,62 @@
+import os
+
+from cobertura_console_reporter import parser
+from cobertura_console_reporter.cache import CACHE_FILE_EXTENSION, ParseCache
+
+SINGLE_PACKAGE_FILE = "sample_data/coverage.cobertura.single-package.xml"
+MULTI_PACKAGE_FILE = "sample_data/coverage.cobertura.multi-package.xml"
+
+
+def test_load_when_file_not_cached_returns_none(tmp_path):
+    cache = ParseCache(str(tmp_path))
+
+    assert cache.load(SINGLE_PACKAGE_FILE) is None
+
+
+def test_load_when_file_cached_returns_stored_items(tmp_path):
+    cache = ParseCache(str(tmp_path), hash_content=True)
+    items = parser.parse(SINGLE_PACKAGE_FILE)
+
+    cache.store(SINGLE_PACKAGE_FILE, items)
+
+    assert cache.load(SINGLE_PACKAGE_FILE) == items
+
+
+def test_load_when_package_filter_differs_returns_none(tmp_path):
+    cache = ParseCache(str(tmp_path))
+
+    cache.store(MULTI_PACKAGE_FILE, parser.parse(MULTI_PACKAGE_FILE))
+
+    assert cache.load(MULTI_PACKAGE_FILE, "SampleApp.Domain") is None
+
+
+def test_load_when_file_modified_returns_none(tmp_path):
+    file_path = tmp_path / "coverage.cobertura.xml"
+    file_path.write_bytes(open(SINGLE_PACKAGE_FILE, "rb").read())
+    cache = ParseCache(str(tmp_path / "cache"))
+
+    cache.store(str(file_path), parser.parse(str(file_path)))
+    os.utime(file_path, ns=(0, 0))
+
+    assert cache.load(str(file_path)) is None
+
+
+def test_store_when_cache_exceeds_max_bytes_evicts_least_recently_used(tmp_path):
+    cache = ParseCache(str(tmp_path), max_bytes=1)
+
+    cache.store(SINGLE_PACKAGE_FILE, parser.parse(SINGLE_PACKAGE_FILE))
+    cache.store(MULTI_PACKAGE_FILE, parser.parse(MULTI_PACKAGE_FILE))
+
+    entries = [
+        name for name in os.listdir(tmp_path) if name.endswith(CACHE_FILE_EXTENSION)
+    ]
+    assert len(entries) <= 1
+
+
+def test_parse_files_with_cache_returns_cached_results(tmp_path):
+    cache = ParseCache(str(tmp_path))
+    expected = parser.parse_files([SINGLE_PACKAGE_FILE], cache=cache)
+
+    results = parser.parse_files([SINGLE_PACKAGE_FILE], cache=cache)
+
+    assert results == expected
@@ -0,0 +1,75 @@
+import gzip
+import io
+import lzma
+import sys
+
+import pytest
+
+from cobertura_console_reporter import parser
+from cobertura_console_reporter.coverage_input import is_file_path, open_coverage_file
+
+SINGLE_PACKAGE_FILE = "sample_data/coverage.cobertura.single-package.xml"
+
+
+def _content():
+    with open(SINGLE_PACKAGE_FILE, "rb") as file:
+        return file.read()
+
+
+def test_open_coverage_file_with_plain_file_returns_content():
+    with open_coverage_file(SINGLE_PACKAGE_FILE) as stream:
+        assert stream.read() == _content()
+
+
+@pytest.mark.parametrize(
+    "extension,compress", [(".gz", gzip.compress), (".xz", lzma.compress)]
+)
+def test_open_coverage_file_with_compressed_file_returns_decompressed_content(
+    tmp_path, extension, compress
+):
+    file_path = tmp_path / f"coverage.cobertura.xml{extension}"
+    file_path.write_bytes(compress(_content()))
+
+    with open_coverage_file(str(file_path)) as stream:
+        assert stream.read() == _content()
+
+
+def test_open_coverage_file_with_stdin_returns_content(monkeypatch):
+    stdin = io.TextIOWrapper(io.BufferedReader(io.BytesIO(gzip.compress(_content()))))
+    monkeypatch.setattr(sys, "stdin", stdin)
+
+    with open_coverage_file("-") as stream:
+        assert stream.read() == _content()
+
+
+def test_is_file_path_returns_false_for_stdin_and_streams():
+    assert is_file_path(SINGLE_PACKAGE_FILE)
+    assert not is_file_path("-")
+    assert not is_file_path(io.BytesIO())
+
+
+def test_open_coverage_file_with_unbuffered_stream_decompresses_and_leaves_it_open():
+    source = io.BytesIO(lzma.compress(_content()))
+
+    with open_coverage_file(source) as stream:
+        assert stream.read() == _content()
+
+    assert not source.closed
+
+
+@pytest.mark.parametrize("backend", parser.BACKENDS)
+def test_parse_with_gzip_bytes_io_returns_same_results(backend):
+    stream = io.BytesIO(gzip.compress(_content()))
+
+    results = parser.parse(stream, backend=backend)
+
+    assert results == parser.parse(SINGLE_PACKAGE_FILE)
+
+
+@pytest.mark.parametrize("backend", parser.BACKENDS)
+def test_parse_with_compressed_file_object_returns_same_results(backend):
+    stream = io.BufferedReader(io.BytesIO(gzip.compress(_content())))
+
+    results = parser.parse(stream, backend=backend)
+
+    assert results == parser.parse(SINGLE_PACKAGE_FILE)
@@ -59,3 +59,21 @@ def test_get_class_namespace_when_name_does_not_contain_period_returns_empty_str
     )
 
     assert item.class_namespace == ""
+
+
+def test_set_name_updates_class_name_and_namespace():
+    item = CoverageItem(
+        name="Program",
+        file_name="Program.cs",
+        coverable_lines=100,
+        covered_lines=65,
+        uncovered_line_numbers=[10, 11],
+        branches=12,
+        covered_branches=6,
+        uncovered_branch_line_numbers=[],
+    )
+
+    item.name = "SampleApp.Program"
+
+    assert item.class_namespace == "SampleApp"
+    assert item.class_name == "Program"
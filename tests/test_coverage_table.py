@@ -0,0 +1,53 @@
+from cobertura_console_reporter.coverage_item import CoverageItem
+from cobertura_console_reporter.coverage_table import CoverageTable
+
+
+def _items():
+    return [
+        CoverageItem(
+            name="SampleApp.Domain.Services.FirstService",
+            file_name="Services\\FirstService.cs",
+            coverable_lines=100,
+            covered_lines=65,
+            uncovered_line_numbers=[10, 11],
+            branches=12,
+            covered_branches=6,
+            uncovered_branch_line_numbers=[11, 12],
+        ),
+        CoverageItem(
+            name="Program",
+            file_name="Program.cs",
+            coverable_lines=10,
+            covered_lines=10,
+            uncovered_line_numbers=[],
+            branches=0,
+            covered_branches=0,
+            uncovered_branch_line_numbers=[],
+        ),
+    ]
+
+
+def test_from_items_stores_namespace_and_class_name_columns():
+    table = CoverageTable.from_items(_items())
+
+    assert table.class_namespaces == ["SampleApp.Domain.Services", ""]
+    assert table.class_names == ["FirstService", "Program"]
+
+
+def test_from_items_stores_count_columns():
+    table = CoverageTable.from_items(_items())
+
+    assert list(table.coverable_lines) == [100, 10]
+    assert list(table.covered_branches) == [6, 0]
+
+
+def test_iter_returns_equal_items():
+    items = _items()
+
+    assert list(CoverageTable.from_items(items)) == items
+
+
+def test_from_items_when_given_table_returns_same_table():
+    table = CoverageTable.from_items(_items())
+
+    assert CoverageTable.from_items(table) is table
@@ -0,0 +1,37 @@
+from cobertura_console_reporter.coverage_item import CoverageItem
+from cobertura_console_reporter.diff import diff_coverage_items
+
+
+def _item(name, covered_lines=5, uncovered_line_numbers=(6, 7, 8, 9, 10)):
+    return CoverageItem(
+        name, f"{name}.cs", 10, covered_lines, list(uncovered_line_numbers), 0, 0, []
+    )
+
+
+def test_diff_coverage_items_returns_only_changed_and_added_items():
+    baseline = [_item("A.Unchanged"), _item("A.Changed")]
+    current = [
+        _item("A.Unchanged"),
+        _item("A.Changed", covered_lines=6, uncovered_line_numbers=(7, 8, 9, 10)),
+        _item("A.Added"),
+    ]
+
+    diff = diff_coverage_items(current, baseline)
+
+    assert [item.name for item in diff.changed] == ["A.Changed", "A.Added"]
+
+
+def test_diff_coverage_items_when_only_uncovered_lines_changed_returns_item():
+    baseline = [_item("A.Moved")]
+    current = [_item("A.Moved", uncovered_line_numbers=(1, 2, 3, 4, 5))]
+
+    diff = diff_coverage_items(current, baseline)
+
+    assert [item.name for item in diff.changed] == ["A.Moved"]
+
+
+def test_diff_coverage_items_returns_removed_items():
+    diff = diff_coverage_items([_item("A.Kept")], [_item("A.Kept"), _item("A.Gone")])
+
+    assert [item.name for item in diff.removed] == ["A.Gone"]
+    assert set(diff.baseline) == {"A.Kept", "A.Gone"}
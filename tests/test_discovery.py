@@ -0,0 +1,83 @@
+import os
+import shutil
+
+from cobertura_console_reporter.discovery import (
+    find_coverage_files,
+    iter_coverage_files,
+    project_directory,
+)
+
+SINGLE_PACKAGE_FILE = "sample_data/coverage.cobertura.single-package.xml"
+
+
+def _write_report(path, mtime_ns=None):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    shutil.copy(SINGLE_PACKAGE_FILE, path)
+    if mtime_ns is not None:
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+    return str(path)
+
+
+def test_iter_coverage_files_finds_nested_reports(tmp_path):
+    first = _write_report(
+        tmp_path / "A.Tests" / "TestResults" / "1" / "coverage.cobertura.xml"
+    )
+    second = _write_report(tmp_path / "B.Tests" / "coverage.cobertura.xml.gz")
+    (tmp_path / "B.Tests" / "coverage.cobertura.xml.ccrindex").write_bytes(b"")
+    (tmp_path / "B.Tests" / "other.xml").write_text("<coverage />")
+
+    found = {discovered.path for discovered in iter_coverage_files(str(tmp_path))}
+
+    assert found == {first, second}
+
+
+def test_iter_coverage_files_skips_build_directories(tmp_path):
+    for directory in ("bin", "obj", "node_modules", ".git"):
+        _write_report(tmp_path / "A.Tests" / directory / "coverage.cobertura.xml")
+
+    assert not list(iter_coverage_files(str(tmp_path)))
+
+
+def test_iter_coverage_files_when_directory_missing_yields_nothing(tmp_path):
+    assert not list(iter_coverage_files(str(tmp_path / "missing")))
+
+
+def test_project_directory_returns_parent_of_test_results():
+    file_path = os.path.join(
+        "src", "A.Tests", "TestResults", "1", "coverage.cobertura.xml"
+    )
+
+    assert project_directory(file_path) == os.path.join("src", "A.Tests")
+
+
+def test_project_directory_outside_test_results_returns_file_directory():
+    file_path = os.path.join("reports", "1", "coverage.cobertura.xml")
+
+    assert project_directory(file_path) == os.path.join("reports", "1")
+
+
+def test_find_coverage_files_returns_sorted_paths(tmp_path):
+    second = _write_report(
+        tmp_path / "B.Tests" / "TestResults" / "1" / "coverage.cobertura.xml"
+    )
+    first = _write_report(
+        tmp_path / "A.Tests" / "TestResults" / "2" / "coverage.cobertura.xml"
+    )
+
+    assert find_coverage_files([str(tmp_path), str(tmp_path)]) == [first, second]
+
+
+def test_find_coverage_files_keeps_newest_file_per_project(tmp_path):
+    _write_report(
+        tmp_path / "A.Tests" / "TestResults" / "1" / "coverage.cobertura.xml", 1
+    )
+    newest = _write_report(
+        tmp_path / "A.Tests" / "TestResults" / "2" / "coverage.cobertura.xml", 2
+    )
+    other = _write_report(
+        tmp_path / "B.Tests" / "TestResults" / "3" / "coverage.cobertura.xml", 1
+    )
+
+    result = find_coverage_files([str(tmp_path)], newest_per_project=True)
+
+    assert result == [newest, other]
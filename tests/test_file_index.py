@@ -0,0 +1,137 @@
+import gzip
+import os
+import shutil
+
+import pytest
+
+from cobertura_console_reporter import parser
+from cobertura_console_reporter.file_index import (
+    build_index,
+    index_path,
+    load_index,
+    write_index,
+)
+
+MULTI_PACKAGE_FILE = "sample_data/coverage.cobertura.multi-package.xml"
+SPLIT_CLASSES_FILE = "sample_data/coverage.cobertura.split-classes.xml"
+
+
+def _copy(tmp_path, file_path=MULTI_PACKAGE_FILE):
+    target = tmp_path / "coverage.cobertura.xml"
+    shutil.copyfile(file_path, target)
+    return str(target)
+
+
+def test_build_index_records_packages_and_classes():
+    index = build_index(MULTI_PACKAGE_FILE)
+
+    assert [package.name for package in index.packages] == [
+        "SampleApp.Domain",
+        "SampleApp.Common",
+    ]
+    assert [name for name, _, _ in index.packages[0].classes] == [
+        "SampleApp.Domain.Services.SomeService"
+    ]
+    assert index.size == os.path.getsize(MULTI_PACKAGE_FILE)
+
+
+def test_build_index_records_parent_name_of_compiler_generated_classes():
+    index = build_index(SPLIT_CLASSES_FILE)
+
+    names = {name for package in index.packages for name, _, _ in package.classes}
+
+    assert all("/" not in name for name in names)
+
+
+def test_build_index_when_file_compressed_raises_value_error(tmp_path):
+    file_path = tmp_path / "coverage.cobertura.xml.gz"
+    with open(MULTI_PACKAGE_FILE, "rb") as file:
+        file_path.write_bytes(gzip.compress(file.read()))
+
+    with pytest.raises(ValueError):
+        build_index(str(file_path))
+
+
+def test_load_index_returns_written_index(tmp_path):
+    file_path = _copy(tmp_path)
+
+    index = write_index(file_path)
+
+    assert os.path.exists(index_path(file_path))
+    assert load_index(file_path) == index
+
+
+def test_load_index_when_file_changed_returns_none(tmp_path):
+    file_path = _copy(tmp_path)
+    write_index(file_path)
+
+    with open(file_path, "a", encoding="utf-8") as file:
+        file.write("\n")
+
+    assert load_index(file_path) is None
+
+
+def test_load_index_when_not_indexed_returns_none(tmp_path):
+    assert load_index(_copy(tmp_path)) is None
+
+
+def test_find_spans_merges_adjacent_matching_classes():
+    index = build_index(SPLIT_CLASSES_FILE)
+
+    spans = index.find_spans(class_pattern="*")
+
+    assert len(spans) == 1
+
+
+@pytest.mark.parametrize(
+    "package_name,class_pattern",
+    [
+        ("SampleApp.Domain", None),
+        ("SampleApp.Common", None),
+        (None, "*.SomeService"),
+        ("SampleApp.Domain", "SampleApp.Common.*"),
+        ("Unknown", None),
+    ],
+)
+def test_parse_with_index_returns_same_results_as_without(
+    tmp_path, package_name, class_pattern
+):
+    file_path = _copy(tmp_path)
+    expected = parser.parse(file_path, package_name, class_pattern=class_pattern)
+
+    write_index(file_path)
+
+    assert parser.parse(file_path, package_name, class_pattern=class_pattern) == (
+        expected
+    )
+
+
+def test_parse_files_with_index_and_split_returns_same_results(tmp_path):
+    file_path = _copy(tmp_path)
+    expected = parser.parse_files([file_path], "SampleApp.Domain")
+
+    write_index(file_path)
+
+    assert (
+        parser.parse_files([file_path], "SampleApp.Domain", jobs=1, split=True)
+        == expected
+    )
+
+
+def test_parse_with_class_pattern_returns_matching_classes():
+    results = parser.parse(MULTI_PACKAGE_FILE, class_pattern="SampleApp.Common.*")
+
+    assert results
+    assert all(result.name.startswith("SampleApp.Common.") for result in results)
+
+
+def test_parse_with_index_does_not_read_whole_file(tmp_path, monkeypatch):
+    file_path = _copy(tmp_path)
+    write_index(file_path)
+
+    def iter_parse(*args):
+        raise AssertionError("whole file parsed")
+
+    monkeypatch.setattr(parser, "iter_parse", iter_parse)
+
+    assert len(parser.parse(file_path, "SampleApp.Domain")) == 1
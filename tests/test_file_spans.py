@@ -0,0 +1,110 @@
+import gzip
+
+import pytest
+
+from cobertura_console_reporter import parser
+from cobertura_console_reporter.file_spans import can_split, find_file_spans, read_span
+
+SINGLE_PACKAGE_FILE = "sample_data/coverage.cobertura.single-package.xml"
+MULTI_PACKAGE_FILE = "sample_data/coverage.cobertura.multi-package.xml"
+SPLIT_CLASSES_FILE = "sample_data/coverage.cobertura.split-classes.xml"
+
+
+def _read(file_path):
+    with open(file_path, "rb") as file:
+        return file.read()
+
+
+def test_find_file_spans_when_packages_are_small_groups_them():
+    spans = find_file_spans(MULTI_PACKAGE_FILE, 1024 * 1024)
+
+    assert len(spans) == 1
+    assert spans[0].prefix == b"<packages>"
+    assert _read(MULTI_PACKAGE_FILE)[spans[0].start :].startswith(b"<package ")
+
+
+def test_find_file_spans_when_package_is_large_splits_between_classes():
+    content = _read(SINGLE_PACKAGE_FILE)
+
+    spans = find_file_spans(SINGLE_PACKAGE_FILE, 1)
+
+    assert len(spans) == 2
+    assert all(content[span.start :].startswith(b"<class ") for span in spans)
+    assert spans[0].end == spans[1].start
+    assert spans[0].prefix.startswith(b'<package name="SampleApp.Domain"')
+
+
+def test_read_span_returns_standalone_document():
+    span = find_file_spans(SINGLE_PACKAGE_FILE, 1)[1]
+
+    document = read_span(SINGLE_PACKAGE_FILE, span)
+
+    assert document.startswith(b'<package name="SampleApp.Domain"')
+    assert document.endswith(b"</classes></package>")
+
+
+def test_find_file_spans_with_package_filter_skips_other_packages():
+    spans = find_file_spans(MULTI_PACKAGE_FILE, 1024 * 1024, "SampleApp.Domain")
+
+    assert len(spans) == 1
+    assert (
+        b"SampleApp.Common"
+        not in _read(MULTI_PACKAGE_FILE)[spans[0].start : spans[0].end]
+    )
+
+
+@pytest.mark.parametrize("backend", parser.BACKENDS)
+@pytest.mark.parametrize(
+    "file_path", [SINGLE_PACKAGE_FILE, MULTI_PACKAGE_FILE, SPLIT_CLASSES_FILE]
+)
+def test_parse_split_files_returns_same_results_as_parse(file_path, backend):
+    results = parser.parse_split_files(
+        [file_path], jobs=1, backend=backend, min_span_size=1
+    )
+
+    assert results == [parser.parse(file_path, backend=backend)]
+
+
+def test_parse_split_files_with_package_filter_returns_filtered_results():
+    results = parser.parse_split_files(
+        [MULTI_PACKAGE_FILE], "SampleApp.Domain", 1, min_span_size=1
+    )
+
+    assert results == [parser.parse(MULTI_PACKAGE_FILE, "SampleApp.Domain")]
+
+
+def test_parse_split_files_with_workers_returns_results_of_each_file():
+    results = parser.parse_split_files(
+        [SINGLE_PACKAGE_FILE, MULTI_PACKAGE_FILE], jobs=2, min_span_size=1
+    )
+
+    assert results == [
+        parser.parse(SINGLE_PACKAGE_FILE),
+        parser.parse(MULTI_PACKAGE_FILE),
+    ]
+
+
+def test_can_split_when_file_compressed_returns_false(tmp_path):
+    file_path = tmp_path / "coverage.cobertura.xml.gz"
+    file_path.write_bytes(gzip.compress(_read(SINGLE_PACKAGE_FILE)))
+
+    assert not can_split(str(file_path))
+    assert parser.parse_split_files([str(file_path)], jobs=1) == [
+        parser.parse(SINGLE_PACKAGE_FILE)
+    ]
+
+
+def test_can_split_when_file_not_utf8_returns_false(tmp_path):
+    file_path = tmp_path / "coverage.cobertura.xml"
+    file_path.write_bytes(b'<?xml version="1.0" encoding="windows-1252"?><coverage/>')
+
+    assert not can_split(str(file_path))
+    assert can_split(SINGLE_PACKAGE_FILE)
+
+
+def test_parse_files_with_split_returns_same_results():
+    file_paths = [SINGLE_PACKAGE_FILE, MULTI_PACKAGE_FILE]
+
+    assert parser.parse_files(file_paths, jobs=2, split=True) == parser.parse_files(
+        file_paths, jobs=1
+    )
@@ -1,10 +1,16 @@
+import io
 import textwrap
 
 from colorama import Fore, Style
 
 from cobertura_console_reporter.coverage_item import CoverageItem
-from cobertura_console_reporter.formatter import format_coverage_items
+from cobertura_console_reporter.formatter import (
+    format_coverage_items,
+    write_coverage_items,
+    write_top_rows,
+)
 from cobertura_console_reporter.formatter_config import FormatterConfig
+from cobertura_console_reporter.renderers import iter_class_rows
 
 
 def test_format_coverage_items_returns_formatted_string():
@@ -287,3 +293,196 @@ def test_format_coverage_items_when_colorized_and_branch_coverage_below_threshol
     )
 
     assert Fore.YELLOW in result
+
+
+def test_format_coverage_items_when_colorized_and_coverage_at_threshold_returns_green_text():
+    items = [
+        CoverageItem(
+            name="Program",
+            file_name="Program.cs",
+            coverable_lines=100,
+            covered_lines=57,
+            uncovered_line_numbers=[],
+            branches=100,
+            covered_branches=57,
+            uncovered_branch_line_numbers=[],
+        )
+    ]
+
+    result = format_coverage_items(
+        items, FormatterConfig(colorize=True, warning_threshold=57)
+    )
+
+    assert Fore.YELLOW not in result
+    assert Fore.GREEN in result
+
+
+def test_write_coverage_items_writes_formatted_rows_to_stream():
+    items = [
+        CoverageItem(
+            name="Program",
+            file_name="Program.cs",
+            coverable_lines=100,
+            covered_lines=50,
+            uncovered_line_numbers=[10, 11],
+            branches=25,
+            covered_branches=10,
+            uncovered_branch_line_numbers=[],
+        )
+    ]
+    stream = io.StringIO()
+
+    write_coverage_items(items, FormatterConfig.no_color(), stream)
+
+    assert stream.getvalue() == format_coverage_items(items, FormatterConfig.no_color())
+    assert "Program     |      50%  |         40%  |  10-11" in stream.getvalue()
+
+
+def test_format_coverage_items_when_colorized_and_coverage_rounds_up_to_threshold_returns_yellow_text():
+    items = [
+        CoverageItem(
+            name="Program",
+            file_name="Program.cs",
+            coverable_lines=1000,
+            covered_lines=899,
+            uncovered_line_numbers=[],
+            branches=0,
+            covered_branches=0,
+            uncovered_branch_line_numbers=[],
+        )
+    ]
+
+    result = format_coverage_items(
+        items, FormatterConfig(colorize=True, warning_threshold=90)
+    )
+
+    assert "90%" in result
+    assert Fore.YELLOW in result
+
+
+def test_write_coverage_items_with_baseline_returns_coverage_changes():
+    items = [
+        CoverageItem(
+            name="A.B.C",
+            file_name="C.cs",
+            coverable_lines=100,
+            covered_lines=50,
+            uncovered_line_numbers=[10, 11],
+            branches=25,
+            covered_branches=10,
+            uncovered_branch_line_numbers=[],
+        ),
+        CoverageItem(
+            name="A.B.D",
+            file_name="D.cs",
+            coverable_lines=10,
+            covered_lines=10,
+            uncovered_line_numbers=[],
+            branches=0,
+            covered_branches=0,
+            uncovered_branch_line_numbers=[],
+        ),
+    ]
+    baseline = {
+        "A.B.C": CoverageItem(
+            name="A.B.C",
+            file_name="C.cs",
+            coverable_lines=100,
+            covered_lines=40,
+            uncovered_line_numbers=[10, 11],
+            branches=25,
+            covered_branches=10,
+            uncovered_branch_line_numbers=[],
+        )
+    }
+
+    expected = f"""\
+        ------------|-----------|--------------|-------------|----------------|---------------------
+        Class Name  |  % Lines  |  % Branches  |  +/- Lines  |  +/- Branches  |  Uncovered Line #s
+        ------------|-----------|--------------|-------------|----------------|---------------------
+        A.B         |      55%  |         40%  |       +15%  |           +0%  |                   
+          C         |      50%  |         40%  |       +10%  |           +0%  |  10-11            
+          D         |     100%  |         n/a  |        new  |           new  |                   
+        ------------|-----------|--------------|-------------|----------------|---------------------
+        """
+    stream = io.StringIO()
+
+    write_coverage_items(items, FormatterConfig.no_color(), stream, baseline=baseline)
+
+    assert stream.getvalue() == textwrap.dedent(expected)
+
+
+def test_write_coverage_items_with_shown_names_aggregates_all_classes():
+    items = [
+        CoverageItem("A.C", "C.cs", 100, 50, [1], 0, 0, []),
+        CoverageItem("A.E", "E.cs", 100, 100, [], 0, 0, []),
+    ]
+    baseline = {
+        "A.C": CoverageItem("A.C", "C.cs", 100, 40, [1], 0, 0, []),
+        "A.E": CoverageItem("A.E", "E.cs", 100, 100, [], 0, 0, []),
+    }
+
+    expected = """\
+        ------------|-----------|--------------|-------------|----------------|---------------------
+        Class Name  |  % Lines  |  % Branches  |  +/- Lines  |  +/- Branches  |  Uncovered Line #s
+        ------------|-----------|--------------|-------------|----------------|---------------------
+        A           |      75%  |         n/a  |        +5%  |           n/a  |                   
+          C         |      50%  |         n/a  |       +10%  |           n/a  |  1                
+        ------------|-----------|--------------|-------------|----------------|---------------------
+        """
+    stream = io.StringIO()
+
+    write_coverage_items(
+        items,
+        FormatterConfig.no_color(),
+        stream,
+        baseline=baseline,
+        shown_names={"A.C"},
+    )
+
+    assert stream.getvalue() == textwrap.dedent(expected)
+
+
+def test_write_top_rows_writes_ranked_table():
+    items = [
+        CoverageItem("A.B.Worst", "Worst.cs", 10, 2, [1, 2], 4, 1, [1]),
+        CoverageItem("A.Other", "Other.cs", 10, 9, [3], 0, 0, []),
+    ]
+
+    expected = f"""\
+        -----------|-----------|--------------|-------------------|----------------------
+        Name       |  % Lines  |  % Branches  |  Uncovered Lines  |  Uncovered Branches
+        -----------|-----------|--------------|-------------------|----------------------
+        A.B.Worst  |      20%  |         25%  |                8  |                   3
+        A.Other    |      90%  |         n/a  |                1  |                   0
+        -----------|-----------|--------------|-------------------|----------------------
+        """
+    stream = io.StringIO()
+
+    write_top_rows(list(iter_class_rows(items)), FormatterConfig.no_color(), stream)
+
+    assert stream.getvalue() == textwrap.dedent(expected)
+
+
+def test_write_coverage_items_with_namespace_depth_collapses_namespaces():
+    items = [
+        CoverageItem("A.B.C.First", "First.cs", 10, 5, [1, 2], 0, 0, []),
+        CoverageItem("A.B.Second", "Second.cs", 10, 10, [], 0, 0, []),
+    ]
+
+    expected = """\
+        -------------|-----------|--------------|---------------------
+        Class Name   |  % Lines  |  % Branches  |  Uncovered Line #s
+        -------------|-----------|--------------|---------------------
+        A            |      75%  |         n/a  |                   
+          B.Second   |     100%  |         n/a  |                   
+          B.C.First  |      50%  |         n/a  |  1-2              
+        -------------|-----------|--------------|---------------------
+        """
+    stream = io.StringIO()
+
+    write_coverage_items(
+        items, FormatterConfig(colorize=False, namespace_depth=1), stream
+    )
+
+    assert stream.getvalue() == textwrap.dedent(expected)
@@ -0,0 +1,36 @@
+from array import array
+
+from cobertura_console_reporter.line_hits import LineHits, merge_line_hits
+
+
+def _line_hits(lines, branch_lines=()):
+    line_hits = LineHits()
+    for line_number, hits in lines:
+        line_hits.add_line(line_number, hits)
+    for line_number, covered, total in branch_lines:
+        line_hits.add_branch(line_number, covered, total)
+    return line_hits
+
+
+def test_merge_line_hits_sums_hits_of_lines_reported_more_than_once():
+    result = merge_line_hits(
+        [
+            _line_hits([(10, 0), (11, 2)]),
+            _line_hits([(10, 3), (12, 0)]),
+        ]
+    )
+
+    assert dict(zip(result.line_numbers, result.hits)) == {10: 3, 11: 2, 12: 0}
+
+
+def test_merge_line_hits_keeps_highest_branch_coverage_per_line():
+    result = merge_line_hits(
+        [
+            _line_hits([(10, 1)], [(10, 1, 2)]),
+            _line_hits([(10, 1)], [(10, 2, 2)]),
+        ]
+    )
+
+    assert result.branch_line_numbers == array("I", [10])
+    assert result.covered_branches == array("I", [2])
+    assert result.branches == array("I", [2])
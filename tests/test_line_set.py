@@ -0,0 +1,63 @@
+from cobertura_console_reporter.line_set import LineSet
+
+
+def test_iter_returns_sorted_unique_numbers():
+    line_set = LineSet([12, 3, 10, 3, 11])
+
+    assert list(line_set) == [3, 10, 11, 12]
+
+
+def test_len_returns_number_of_unique_numbers():
+    line_set = LineSet([12, 3, 10, 3, 11])
+
+    assert len(line_set) == 4
+    assert len(LineSet([100_000])) == 1
+
+
+def test_contains_returns_true_only_for_members():
+    line_set = LineSet([1, 64, 1000])
+
+    assert 64 in line_set
+    assert 1000 in line_set
+    assert 63 not in line_set
+    assert 1001 not in line_set
+    assert -1 not in line_set
+
+
+def test_contains_of_union_and_bitmap_returns_true_only_for_members():
+    union = LineSet([1, 2]) | LineSet([100_000])
+    from_bits = LineSet.from_bits(union.bits)
+
+    for line_set in (union, from_bits, LineSet(union)):
+        assert 100_000 in line_set
+        assert 2 in line_set
+        assert 3 not in line_set
+        assert 100_008 not in line_set
+
+
+def test_or_returns_union():
+    result = LineSet([1, 2, 10]) | LineSet([2, 3, 20])
+
+    assert list(result) == [1, 2, 3, 10, 20]
+
+
+def test_ranges_returns_runs_of_consecutive_numbers():
+    line_set = LineSet([10, 11, 12, 15, 17, 18])
+
+    assert list(line_set.ranges()) == [(10, 12), (15, 15), (17, 18)]
+
+
+def test_ranges_when_empty_returns_no_ranges():
+    assert not list(LineSet().ranges())
+    assert not LineSet()
+
+
+def test_eq_compares_members_of_line_sets():
+    assert LineSet([2, 1]) == LineSet([1, 2])
+    assert hash(LineSet([2, 1])) == hash(LineSet([1, 2]))
+    assert LineSet([1, 2]) != LineSet([1, 3])
+
+
+def test_eq_with_other_types_is_false():
+    assert LineSet([1, 2]) != [1, 2]
+    assert LineSet() != frozenset()
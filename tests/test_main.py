@@ -0,0 +1,150 @@
+import socket
+import socketserver
+import sys
+import tracemalloc
+
+import pytest
+
+from cobertura_console_reporter import __main__, profiling
+
+SINGLE_PACKAGE_FILE = "sample_data/coverage.cobertura.single-package.xml"
+MULTI_PACKAGE_FILE = "sample_data/coverage.cobertura.multi-package.xml"
+
+
+def _run(argv):
+    with pytest.raises(SystemExit) as ex:
+        __main__._run(argv)
+    return ex.value.code
+
+
+@pytest.fixture(name="without_unix_sockets")
+def fixture_without_unix_sockets(monkeypatch):
+    # as on Windows, where the server module cannot be imported
+    monkeypatch.delattr(socket, "AF_UNIX", raising=False)
+    monkeypatch.delattr(socketserver, "UnixStreamServer", raising=False)
+    monkeypatch.delitem(sys.modules, "cobertura_console_reporter.server", raising=False)
+
+
+@pytest.mark.usefixtures("without_unix_sockets")
+def test_run_with_server_without_unix_sockets_reports_in_process(capsys):
+    exit_code = _run(["-f", SINGLE_PACKAGE_FILE, "--server"])
+
+    assert exit_code == 0
+    assert "SampleApp.Domain.Services" in capsys.readouterr().out
+    assert "cobertura_console_reporter.server" not in sys.modules
+
+
+@pytest.mark.usefixtures("without_unix_sockets")
+def test_serve_without_unix_sockets_exits_with_error(capsys):
+    with pytest.raises(SystemExit) as ex:
+        __main__._serve([])
+
+    assert ex.value.code == 1
+    assert "requires Unix domain sockets" in capsys.readouterr().err
+
+
+def test_run_when_file_missing_stops_profiler(capsys):
+    exit_code = _run(["-f", "missing.xml", "--profile"])
+
+    assert exit_code == 1
+    assert "File not found: missing.xml" in capsys.readouterr().out
+    assert not profiling.is_active()
+    assert not tracemalloc.is_tracing()
+
+
+def test_run_with_top_namespaces_and_depth_ranks_collapsed_namespaces(tmp_path):
+    output_file = tmp_path / "report.txt"
+
+    exit_code = _run(
+        [
+            "-f",
+            MULTI_PACKAGE_FILE,
+            "--depth",
+            "1",
+            "--top",
+            "5",
+            "--top-level",
+            "namespace",
+            "-o",
+            str(output_file),
+        ]
+    )
+
+    names = [
+        line.split("|")[0].strip() for line in output_file.read_text().splitlines()
+    ]
+    assert exit_code == 0
+    assert names[3:-1] == ["SampleApp"]
+
+
+@pytest.mark.parametrize("jobs", ["0", "-1"])
+def test_run_when_jobs_below_one_exits_with_error(capsys, jobs):
+    exit_code = _run(["-f", SINGLE_PACKAGE_FILE, "--jobs", jobs])
+
+    assert exit_code == 2
+    assert "--jobs must be at least 1" in capsys.readouterr().err
+
+
+@pytest.mark.parametrize("output_format", ["jsonl", "csv", "markdown", "junit"])
+def test_run_when_baseline_with_other_format_exits_with_error(capsys, output_format):
+    exit_code = _run(
+        [
+            "-f",
+            SINGLE_PACKAGE_FILE,
+            "--baseline",
+            MULTI_PACKAGE_FILE,
+            "--format",
+            output_format,
+        ]
+    )
+
+    assert exit_code == 2
+    assert "--baseline only supports the console format" in capsys.readouterr().err
+
+
+def test_run_when_coverage_and_baseline_read_from_stdin_exits_with_error(capsys):
+    exit_code = _run(["-f", "-", "--baseline", "-"])
+
+    assert exit_code == 2
+    assert "stdin (-) can only be read once" in capsys.readouterr().err
+
+
+def test_run_when_coverage_and_patch_read_from_stdin_exits_with_error(capsys):
+    exit_code = _run(["-f", "-", "--patch", "-"])
+
+    assert exit_code == 2
+    assert "stdin (-) can only be read once" in capsys.readouterr().err
+
+
+@pytest.mark.parametrize("top", ["0", "-1"])
+def test_run_when_top_below_one_exits_with_error(capsys, top):
+    exit_code = _run(["-f", SINGLE_PACKAGE_FILE, "--top", top])
+
+    assert exit_code == 2
+    assert "--top must be at least 1" in capsys.readouterr().err
+
+
+@pytest.mark.parametrize(
+    "fail_under,expected_exit_code,expected_message",
+    [
+        (["line=90"], 0, ""),
+        (["total:line=99"], 4, "total: line coverage 97.4% is below 99%"),
+        (["package:line=99"], 8, "package SampleApp.Domain: line coverage"),
+        (["namespace:line=99"], 16, "namespace SampleApp.Domain.Services: line"),
+        (["class:line=99"], 32, "class SampleApp.Domain.Services.SomeService: line"),
+        (["total:line=99", "class:branch=80"], 36, "branch coverage 75.0%"),
+    ],
+)
+def test_run_with_fail_under_exits_with_bits_of_failed_levels(
+    capsys, tmp_path, fail_under, expected_exit_code, expected_message
+):
+    argv = ["-f", MULTI_PACKAGE_FILE, "-o", str(tmp_path / "report.txt")]
+    for spec in fail_under:
+        argv += ["--fail-under", spec]
+
+    exit_code = _run(argv)
+
+    stderr = capsys.readouterr().err
+    assert exit_code == expected_exit_code
+    assert expected_message in stderr
+    assert ("Coverage threshold not met" in stderr) == (expected_exit_code != 0)
@@ -0,0 +1,119 @@
+from cobertura_console_reporter.coverage_item import CoverageItem
+from cobertura_console_reporter.coverage_table import CoverageTable
+from cobertura_console_reporter.metrics import compute_metrics
+from cobertura_console_reporter.thresholds import (
+    LEVEL_CLASS,
+    LEVEL_NAMESPACE,
+    LEVEL_TOTAL,
+    Thresholds,
+)
+
+
+def _table():
+    return CoverageTable.from_items(
+        [
+            CoverageItem("A.B.First", "First.cs", 10, 5, [], 4, 1, []),
+            CoverageItem("A.B.Second", "Second.cs", 30, 30, [], 0, 0, []),
+            CoverageItem("Program", "Program.cs", 0, 0, [], 0, 0, []),
+        ]
+    )
+
+
+def test_compute_metrics_returns_row_rates():
+    metrics = compute_metrics(_table())
+
+    assert metrics.line_rates == [0.5, 1.0, None]
+    assert metrics.branch_rates == [0.25, None, None]
+
+
+def test_compute_metrics_returns_namespace_aggregates():
+    tree = compute_metrics(_table()).namespace_tree
+
+    assert tree.node("A.B").metrics.coverable_lines == 40
+    assert tree.node("A.B").metrics.line_rate == 35 / 40
+    assert tree.node("A.B").metrics.branch_rate == 0.25
+    assert tree.node("").metrics.line_rate is None
+
+
+def test_compute_metrics_returns_totals_of_parent_namespaces():
+    tree = compute_metrics(_table()).namespace_tree
+
+    assert tree.node("A").metrics.coverable_lines == 0
+    assert tree.node("A").total.covered_lines == 35
+    assert tree.node("").total.coverable_lines == 40
+
+
+def test_compute_metrics_returns_report_total():
+    metrics = compute_metrics(_table())
+
+    assert metrics.total.covered_lines == 35
+    assert metrics.total.branches == 4
+
+
+def test_compute_metrics_returns_package_aggregates():
+    table = CoverageTable.from_items(
+        [
+            CoverageItem("A.First", "First.cs", 10, 5, [], 0, 0, [], package_name="A"),
+            CoverageItem("A.Second", "Second.cs", 10, 10, [], 0, 0, [], None, "A"),
+            CoverageItem("B.Third", "Third.cs", 4, 1, [], 0, 0, [], None, "B"),
+        ]
+    )
+
+    metrics = compute_metrics(table)
+
+    assert metrics.packages["A"].line_rate == 0.75
+    assert metrics.packages["B"].line_rate == 0.25
+
+
+def test_compute_metrics_when_no_thresholds_returns_no_violations():
+    metrics = compute_metrics(_table())
+
+    assert metrics.violations == []
+
+
+def test_compute_metrics_returns_violations_ordered_by_level():
+    thresholds = Thresholds()
+    thresholds.set(LEVEL_CLASS, "line", 60)
+    thresholds.set(LEVEL_NAMESPACE, "branch", 50)
+    thresholds.set(LEVEL_TOTAL, "line", 90)
+
+    metrics = compute_metrics(_table(), thresholds)
+
+    assert [(v.level, v.name, v.metric) for v in metrics.violations] == [
+        (LEVEL_TOTAL, "", "line"),
+        (LEVEL_NAMESPACE, "A.B", "branch"),
+        (LEVEL_CLASS, "A.B.First", "line"),
+    ]
+
+
+def test_compute_metrics_checks_namespace_thresholds_of_collapsed_groups():
+    table = CoverageTable.from_items(
+        [
+            CoverageItem("A.B.First", "First.cs", 10, 9, [], 0, 0, []),
+            CoverageItem("A.C.Second", "Second.cs", 10, 5, [], 0, 0, []),
+        ]
+    )
+    thresholds = Thresholds()
+    thresholds.set(LEVEL_NAMESPACE, "line", 80)
+
+    metrics = compute_metrics(table, thresholds, namespace_depth=1)
+
+    # "A" declares no class of its own, but is displayed with both classes
+    assert [(v.level, v.name, v.rate) for v in metrics.violations] == [
+        (LEVEL_NAMESPACE, "A", 0.7)
+    ]
+
+
+def test_compute_metrics_without_depth_checks_namespaces_declaring_classes():
+    table = CoverageTable.from_items(
+        [
+            CoverageItem("A.B.First", "First.cs", 10, 9, [], 0, 0, []),
+            CoverageItem("A.C.Second", "Second.cs", 10, 5, [], 0, 0, []),
+        ]
+    )
+    thresholds = Thresholds()
+    thresholds.set(LEVEL_NAMESPACE, "line", 80)
+
+    metrics = compute_metrics(table, thresholds)
+
+    assert [v.name for v in metrics.violations] == ["A.C"]
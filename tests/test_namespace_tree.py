@@ -0,0 +1,71 @@
+from cobertura_console_reporter.coverage_item import CoverageItem
+from cobertura_console_reporter.coverage_table import CoverageTable
+from cobertura_console_reporter.metrics import compute_metrics
+from cobertura_console_reporter.namespace_tree import collapse_namespace
+
+
+def _tree():
+    return compute_metrics(
+        CoverageTable.from_items(
+            [
+                CoverageItem("A.B.C.First", "First.cs", 10, 5, [], 4, 2, []),
+                CoverageItem("A.B.Second", "Second.cs", 10, 10, [], 0, 0, []),
+                CoverageItem("A.BC.Third", "Third.cs", 20, 0, [], 2, 0, []),
+                CoverageItem("Program", "Program.cs", 4, 4, [], 0, 0, []),
+                CoverageItem("A.B.C.Fourth", "Fourth.cs", 6, 3, [], 0, 0, []),
+            ]
+        )
+    ).namespace_tree
+
+
+def test_groups_yields_each_namespace_in_sorted_order():
+    groups = list(_tree().groups())
+
+    assert [(group.name, group.rows) for group in groups] == [
+        ("", [3]),
+        ("A.B", [1]),
+        ("A.B.C", [0, 4]),
+        ("A.BC", [2]),
+    ]
+
+
+def test_groups_yields_counts_of_the_namespace_only():
+    groups = {group.name: group.metrics for group in _tree().groups()}
+
+    assert groups["A.B"].coverable_lines == 10
+    assert groups["A.B.C"].coverable_lines == 16
+
+
+def test_groups_with_depth_collapses_deeper_namespaces():
+    groups = list(_tree().groups(depth=2))
+
+    assert [(group.name, group.rows) for group in groups] == [
+        ("", [3]),
+        ("A.B", [1, 0, 4]),
+        ("A.BC", [2]),
+    ]
+    assert groups[1].metrics.coverable_lines == 26
+    assert groups[1].metrics.covered_lines == 18
+
+
+def test_node_total_aggregates_subtree():
+    tree = _tree()
+
+    assert tree.node("A").total.coverable_lines == 46
+    assert tree.node("A").total.branches == 6
+    assert tree.root.total.coverable_lines == 50
+    assert tree.node("A").rows == []
+
+
+def test_group_metrics_matches_groups():
+    tree = _tree()
+
+    assert tree.group_metrics("A.B") is tree.node("A.B").metrics
+    assert tree.group_metrics("A.B", depth=2) is tree.node("A.B").total
+    assert tree.group_metrics("X") is None
+
+
+def test_collapse_namespace_returns_ancestor_at_depth():
+    assert collapse_namespace("A.B.C", 2) == "A.B"
+    assert collapse_namespace("A", 2) == "A"
+    assert collapse_namespace("A.B.C") == "A.B.C"
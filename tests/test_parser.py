@@ -1,4 +1,9 @@
+from array import array
+
+import pytest
+
 from cobertura_console_reporter import parser
+from cobertura_console_reporter.coverage_item import CoverageItem
 
 
 def test_parse_with_single_package_file_returns_correct_number_of_results():
@@ -69,7 +74,7 @@ def test_parse_return_results_with_uncovered_line_numbers():
         if r.name == "SampleApp.Domain.Services.SomeService"
     ]
 
-    assert next(iter(item)) == [40]
+    assert list(next(iter(item))) == [40]
 
 
 def test_parse_return_results_with_branches():
@@ -103,4 +108,126 @@ def test_parse_return_results_with_uncovered_branch_lines():
         if r.name == "SampleApp.Domain.Services.SomeService"
     ]
 
-    assert next(iter(item)) == [31, 39]
+    assert list(next(iter(item))) == [31, 39]
+
+
+def test_iter_parse_with_multiple_class_definitions_for_class_yields_each_definition():
+    results = list(
+        parser.iter_parse("sample_data/coverage.cobertura.split-classes.xml")
+    )
+
+    assert len(results) == 2
+    assert all(r.name == "SampleApp.WebAPI.Controllers.SomeController" for r in results)
+
+
+def test_iter_parse_with_multi_package_file_yields_only_filtered_package():
+    results = list(
+        parser.iter_parse(
+            "sample_data/coverage.cobertura.multi-package.xml", "SampleApp.Domain"
+        )
+    )
+
+    assert [r.name for r in results] == [
+        r.name
+        for r in parser.parse(
+            "sample_data/coverage.cobertura.multi-package.xml", "SampleApp.Domain"
+        )
+    ]
+
+
+def test_merge_coverage_items_merges_by_name_preserving_first_seen_order():
+    items = [
+        CoverageItem("B", "B.cs", 10, 5, [1], 2, 1, [1]),
+        CoverageItem("A", "A.cs", 10, 10, [], 0, 0, []),
+        CoverageItem("B", "B.cs", 4, 4, [], 2, 2, []),
+    ]
+
+    results = parser.merge_coverage_items(items)
+
+    assert [r.name for r in results] == ["B", "A"]
+    assert results[0].coverable_lines == 14
+    assert results[0].covered_branches == 3
+
+
+def test_parse_files_merges_classes_reported_by_several_files():
+    results = parser.parse_files(
+        [
+            "sample_data/coverage.cobertura.single-package.xml",
+            "sample_data/coverage.cobertura.split-classes.xml",
+        ],
+        jobs=2,
+    )
+
+    assert [r.name for r in results] == [
+        "SampleApp.Domain.Services.SomeService",
+        "SampleApp.Domain.Services.StringExtensions",
+        "SampleApp.WebAPI.Controllers.SomeController",
+    ]
+
+
+def test_parse_files_when_same_file_parsed_twice_does_not_double_count_lines():
+    file_path = "sample_data/coverage.cobertura.single-package.xml"
+
+    results = parser.parse_files([file_path, file_path], jobs=1)
+
+    assert [(r.coverable_lines, r.covered_lines, r.branches) for r in results] == [
+        (r.coverable_lines, r.covered_lines, r.branches)
+        for r in parser.parse(file_path)
+    ]
+
+
+def test_merge_coverage_items_when_line_uncovered_in_one_run_only_reports_it_covered():
+    first, second = [
+        parser.parse("sample_data/coverage.cobertura.single-package.xml")[0]
+        for _ in range(2)
+    ]
+    second.line_hits["Services\\SomeService.cs"].hits[:] = array(
+        "I", [1] * len(second.line_hits["Services\\SomeService.cs"].hits)
+    )
+
+    result = parser.merge_coverage_items([first, second])[0]
+
+    assert result.coverable_lines == first.coverable_lines
+    assert result.covered_lines == result.coverable_lines
+    assert not result.uncovered_line_numbers
+
+
+@pytest.mark.parametrize(
+    "file_path",
+    [
+        "sample_data/coverage.cobertura.single-package.xml",
+        "sample_data/coverage.cobertura.multi-package.xml",
+        "sample_data/coverage.cobertura.split-classes.xml",
+        "sample_data/coverage.cobertura.no-coverage.xml",
+    ],
+)
+def test_parse_with_expat_backend_returns_same_results_as_etree(file_path):
+    assert parser.parse(file_path, backend="expat") == parser.parse(
+        file_path, backend="etree"
+    )
+
+
+def test_parse_with_expat_backend_and_package_filter_returns_filtered_results():
+    results = parser.parse(
+        "sample_data/coverage.cobertura.multi-package.xml",
+        "SampleApp.Domain",
+        backend="expat",
+    )
+    assert len(results) == 1
+
+
+@pytest.mark.parametrize("backend", parser.BACKENDS)
+def test_parse_sets_package_name_of_each_class(backend):
+    results = parser.parse(
+        "sample_data/coverage.cobertura.multi-package.xml", backend=backend
+    )
+
+    assert {r.name: r.package_name for r in results} == {
+        "SampleApp.Domain.Services.SomeService": "SampleApp.Domain",
+        "SampleApp.Common.StringExtensions": "SampleApp.Common",
+    }
+
+
+def test_parse_with_unknown_backend_raises_value_error():
+    with pytest.raises(ValueError):
+        parser.parse("sample_data/coverage.cobertura.single-package.xml", backend="dom")
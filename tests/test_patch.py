@@ -0,0 +1,68 @@
+import io
+import textwrap
+
+from cobertura_console_reporter import parser
+from cobertura_console_reporter.patch import (
+    LineIntervals,
+    compute_patch_coverage,
+    parse_unified_diff,
+)
+
+DIFF = textwrap.dedent("""\
+    diff --git a/src/SampleApp.Domain/Services/SomeService.cs b/src/SampleApp.Domain/Services/SomeService.cs
+    index 1111111..2222222 100644
+    --- a/src/SampleApp.Domain/Services/SomeService.cs
+    +++ b/src/SampleApp.Domain/Services/SomeService.cs
+    @@ -36,6 +36,8 @@ public class SomeService
+     context
+     context
+     context
+    -removed
+    +added
+    +added
+     context
+    +added
+    diff --git a/Deleted.cs b/Deleted.cs
+    --- a/Deleted.cs
+    +++ /dev/null
+    @@ -1,2 +0,0 @@
+    -removed
+    -removed
+    """)
+
+
+def test_line_intervals_merges_adjacent_ranges():
+    intervals = LineIntervals([(10, 12), (1, 3), (13, 15)])
+
+    assert list(intervals.starts) == [1, 10]
+    assert list(intervals.ends) == [3, 15]
+    assert len(intervals) == 9
+
+
+def test_line_intervals_contains_returns_true_only_inside_ranges():
+    intervals = LineIntervals([(1, 3), (10, 15)])
+
+    assert 1 in intervals
+    assert 12 in intervals
+    assert 4 not in intervals
+    assert 16 not in intervals
+
+
+def test_parse_unified_diff_returns_added_line_ranges():
+    changed_lines = parse_unified_diff(io.StringIO(DIFF))
+
+    intervals = changed_lines["src/SampleApp.Domain/Services/SomeService.cs"]
+    assert list(zip(intervals.starts, intervals.ends)) == [(39, 40), (42, 42)]
+    assert "Deleted.cs" not in changed_lines
+
+
+def test_compute_patch_coverage_matches_windows_file_names_by_suffix():
+    items = parser.parse("sample_data/coverage.cobertura.single-package.xml")
+
+    results = compute_patch_coverage(items, parse_unified_diff(io.StringIO(DIFF)))
+
+    assert len(results) == 1
+    assert results[0].file_name == "src/SampleApp.Domain/Services/SomeService.cs"
+    assert results[0].changed_lines == 3
+    assert results[0].covered_lines == 2
+    assert list(results[0].uncovered_line_numbers) == [40]
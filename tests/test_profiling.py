@@ -0,0 +1,107 @@
+import json
+import time
+
+from cobertura_console_reporter import parser, profiling
+from cobertura_console_reporter.profiling import Profiler, format_json, format_table
+
+SINGLE_PACKAGE_FILE = "sample_data/coverage.cobertura.single-package.xml"
+
+
+def test_stage_when_no_profiler_running_does_nothing():
+    with profiling.stage(profiling.STAGE_PARSE) as record:
+        record.items += 1
+
+    assert not profiling.is_active()
+
+
+def test_profiler_records_calls_and_items_per_stage():
+    with Profiler(trace_memory=False) as profiler:
+        for _ in range(2):
+            with profiling.stage(profiling.STAGE_PARSE) as record:
+                record.items += 3
+
+    stats = profiler.stats[profiling.STAGE_PARSE]
+
+    assert stats.calls == 2
+    assert stats.items == 6
+    assert stats.peak_memory is None
+    assert not profiling.is_active()
+
+
+def test_profiler_excludes_nested_stages_from_parent_time():
+    with Profiler(trace_memory=False) as profiler:
+        with profiling.stage(profiling.STAGE_PARSE):
+            with profiling.stage(profiling.STAGE_MERGE):
+                time.sleep(0.05)
+
+    assert profiler.stats[profiling.STAGE_MERGE].wall_time >= 0.05
+    assert profiler.stats[profiling.STAGE_PARSE].wall_time < 0.05
+    assert profiler.wall_time >= 0.05
+
+
+def test_profiler_records_peak_memory():
+    with Profiler() as profiler:
+        with profiling.stage(profiling.STAGE_RENDER):
+            data = bytearray(4 * 1024 * 1024)
+            del data
+
+    assert profiler.stats[profiling.STAGE_RENDER].peak_memory >= 4 * 1024 * 1024
+
+
+def test_profiler_calls_hooks_with_stats_of_each_stage_run():
+    calls = []
+
+    with Profiler(trace_memory=False, hooks=[calls.append]):
+        with profiling.stage(profiling.STAGE_READ) as record:
+            record.items += 2
+        with profiling.stage(profiling.STAGE_READ):
+            pass
+
+    assert [(stats.name, stats.calls) for stats in calls] == [("read", 1)] * 2
+    assert [stats.items for stats in calls] == [2, 0]
+
+
+def test_profiler_records_parser_stages():
+    with Profiler() as profiler:
+        results = parser.parse(SINGLE_PACKAGE_FILE)
+
+    assert profiler.stats[profiling.STAGE_PARSE].items == 2
+    assert profiler.stats[profiling.STAGE_MERGE].items == len(results)
+
+
+def test_profiler_writes_cprofile_dump(tmp_path):
+    dump_path = tmp_path / "run.prof"
+
+    with Profiler(trace_memory=False, cprofile_path=str(dump_path)):
+        parser.parse(SINGLE_PACKAGE_FILE)
+
+    assert dump_path.stat().st_size > 0
+
+
+def test_format_table_lists_stages_in_pipeline_order():
+    with Profiler(trace_memory=False) as profiler:
+        with profiling.stage(profiling.STAGE_WRITE):
+            pass
+        with profiling.stage(profiling.STAGE_PARSE):
+            pass
+
+    lines = format_table(profiler).splitlines()
+
+    assert lines[0].split() == ["Stage", "Calls", "Wall", "ms", "CPU", "ms"] + [
+        "Peak",
+        "MiB",
+        "Items",
+    ]
+    assert [line.split()[0] for line in lines[2:]] == ["parse", "write", "total"]
+
+
+def test_format_json_writes_stages_and_totals():
+    with Profiler() as profiler:
+        with profiling.stage(profiling.STAGE_PARSE) as record:
+            record.items += 1
+
+    data = json.loads(format_json(profiler))
+
+    assert data["stages"][0]["name"] == "parse"
+    assert data["stages"][0]["items"] == 1
+    assert data["wall_time"] >= data["stages"][0]["wall_time"]
@@ -0,0 +1,142 @@
+import csv
+import io
+import json
+import xml.etree.ElementTree as ET
+
+import pytest
+
+from cobertura_console_reporter.coverage_item import CoverageItem
+from cobertura_console_reporter.formatter_config import FormatterConfig
+from cobertura_console_reporter.renderers import (
+    ROW_CLASS,
+    ROW_NAMESPACE,
+    ROW_TOTAL,
+    RENDERERS,
+    iter_report_rows,
+    render_report,
+)
+
+CONFIG = FormatterConfig(colorize=False, warning_threshold=90)
+
+
+def _items():
+    return [
+        CoverageItem("A.B.First", "First.cs", 10, 5, [3, 4, 5, 9, 10], 4, 1, [3]),
+        CoverageItem("A.B.Second", "Second.cs", 30, 30, [], 0, 0, []),
+        CoverageItem("Program", "Program.cs", 2, 2, [], 0, 0, []),
+    ]
+
+
+def _render(format_name):
+    output = io.StringIO()
+    render_report(format_name, _items(), CONFIG, output)
+    return output.getvalue()
+
+
+def test_iter_report_rows_yields_namespaces_before_their_classes():
+    rows = list(iter_report_rows(_items()))
+
+    assert [(row.kind, row.name) for row in rows] == [
+        (ROW_CLASS, "Program"),
+        (ROW_NAMESPACE, "A.B"),
+        (ROW_CLASS, "A.B.First"),
+        (ROW_CLASS, "A.B.Second"),
+        (ROW_TOTAL, "Total"),
+    ]
+
+
+def test_iter_report_rows_yields_aggregated_metrics():
+    rows = list(iter_report_rows(_items()))
+
+    assert rows[1].metrics.coverable_lines == 40
+    assert rows[1].metrics.covered_lines == 35
+    assert rows[-1].metrics.coverable_lines == 42
+
+
+def test_render_report_when_jsonl_writes_an_object_per_row():
+    records = [json.loads(line) for line in _render("jsonl").splitlines()]
+
+    assert len(records) == 5
+    assert records[2]["name"] == "A.B.First"
+    assert records[2]["line_rate"] == 0.5
+    assert records[2]["uncovered_lines"] == [[3, 5], [9, 10]]
+    assert records[0]["branch_rate"] is None
+
+
+def test_render_report_when_csv_writes_header_and_rows():
+    rows = list(csv.DictReader(io.StringIO(_render("csv"))))
+
+    assert len(rows) == 5
+    assert rows[2]["class_name"] == "First"
+    assert rows[2]["line_rate"] == "0.5000"
+    assert rows[2]["uncovered_lines"] == "3-5, 9-10"
+    assert rows[0]["branch_rate"] == ""
+
+
+def test_render_report_when_markdown_writes_table():
+    lines = _render("markdown").splitlines()
+
+    assert lines[0] == "| Class Name | % Lines | % Branches | Uncovered Line #s |"
+    assert "| **A.B** | 88% | 25% |  |" in lines
+    assert "| &nbsp;&nbsp;First | 50% | 25% | 3-5, 9-10 |" in lines
+    assert lines[-1] == "| **Total** | 88% | 25% |  |"
+
+
+def test_render_report_when_junit_reports_classes_below_threshold_as_failures():
+    root = ET.fromstring(_render("junit"))
+
+    suites = root.findall("testsuite")
+    failures = root.findall(".//testcase/failure/..")
+
+    assert [suite.get("name") for suite in suites] == ["", "A.B"]
+    assert [testcase.get("name") for testcase in failures] == ["First"]
+
+
+def test_render_report_when_junit_and_coverage_at_threshold_reports_no_failure():
+    output = io.StringIO()
+    items = [CoverageItem("A.First", "First.cs", 100, 57, [], 100, 57, [])]
+
+    render_report("junit", items, FormatterConfig(False, 57), output)
+
+    assert ET.fromstring(output.getvalue()).find(".//failure") is None
+
+
+def test_iter_report_rows_with_namespace_depth_sets_class_groups():
+    rows = list(iter_report_rows(_items(), namespace_depth=1))
+
+    assert [(row.name, row.group, row.display_name) for row in rows] == [
+        ("Program", "", "Program"),
+        ("A", "", "A"),
+        ("A.B.First", "A", "B.First"),
+        ("A.B.Second", "A", "B.Second"),
+        ("Total", "", "Total"),
+    ]
+
+
+def test_render_report_when_markdown_with_namespace_depth_shows_collapsed_names():
+    output = io.StringIO()
+
+    render_report("markdown", _items(), FormatterConfig(False, 90, 1), output)
+
+    lines = output.getvalue().splitlines()
+    assert "| **A** | 88% | 25% |  |" in lines
+    assert "| &nbsp;&nbsp;B.First | 50% | 25% | 3-5, 9-10 |" in lines
+
+
+def test_render_report_when_junit_with_namespace_depth_writes_suite_per_group():
+    output = io.StringIO()
+
+    render_report("junit", _items(), FormatterConfig(False, 90, 1), output)
+
+    suites = ET.fromstring(output.getvalue()).findall("testsuite")
+    assert [suite.get("name") for suite in suites] == ["", "A"]
+    assert [testcase.get("classname") for testcase in suites[1]] == ["A.B", "A.B"]
+
+
+def test_render_report_when_format_unknown_raises_value_error():
+    with pytest.raises(ValueError):
+        render_report("yaml", _items(), CONFIG, io.StringIO())
+
+
+def test_renderers_include_all_formats():
+    assert set(RENDERERS) == {"jsonl", "csv", "markdown", "junit"}
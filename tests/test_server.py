@@ -0,0 +1,203 @@
+import os
+import shutil
+import sys
+import tempfile
+import threading
+
+import pytest
+
+from cobertura_console_reporter import parser, server
+from cobertura_console_reporter.server import (
+    ParsedFileCache,
+    ReportServer,
+    ServerResponse,
+    request_report,
+)
+
+SINGLE_PACKAGE_FILE = "sample_data/coverage.cobertura.single-package.xml"
+MULTI_PACKAGE_FILE = "sample_data/coverage.cobertura.multi-package.xml"
+
+requires_unix_sockets = pytest.mark.skipif(
+    not server.is_supported(), reason="Unix domain sockets are not supported"
+)
+
+
+class _ParseRecorder:
+    def __init__(self):
+        self.parsed_paths = []
+
+    def __call__(self, file_paths):
+        self.parsed_paths.append(file_paths)
+        return parser.parse_each_file(file_paths)
+
+
+@pytest.fixture(name="socket_path")
+def fixture_socket_path():
+    # socket paths are limited to about a hundred bytes, tmp_path may be longer
+    directory = tempfile.mkdtemp(prefix="ccr")
+    yield os.path.join(directory, "server.sock")
+    shutil.rmtree(directory)
+
+
+@pytest.fixture(name="running_server")
+def fixture_running_server(socket_path):
+    def run_report(argv):
+        print(" ".join(argv))
+        print(os.getcwd(), file=sys.stderr)
+        if argv == ["fail"]:
+            sys.exit(3)
+        if argv == ["error"]:
+            raise ValueError("broken")
+        return 0
+
+    report_server = ReportServer(socket_path, run_report)
+    thread = threading.Thread(target=report_server.serve_forever, daemon=True)
+    thread.start()
+    yield report_server
+    report_server.shutdown()
+    report_server.server_close()
+    thread.join()
+
+
+def test_parse_each_returns_items_of_each_file():
+    cache = ParsedFileCache()
+
+    result = cache.parse_each(
+        [SINGLE_PACKAGE_FILE, MULTI_PACKAGE_FILE], None, None, parser.parse_each_file
+    )
+
+    assert result == parser.parse_each_file([SINGLE_PACKAGE_FILE, MULTI_PACKAGE_FILE])
+
+
+def test_parse_each_only_parses_files_not_cached():
+    cache = ParsedFileCache()
+    recorder = _ParseRecorder()
+    cache.parse_each([SINGLE_PACKAGE_FILE], None, None, recorder)
+
+    cache.parse_each([SINGLE_PACKAGE_FILE, MULTI_PACKAGE_FILE], None, None, recorder)
+
+    assert recorder.parsed_paths == [[SINGLE_PACKAGE_FILE], [MULTI_PACKAGE_FILE]]
+
+
+def test_parse_each_parses_modified_files_again(tmp_path):
+    file_path = str(tmp_path / "coverage.cobertura.xml")
+    shutil.copy(SINGLE_PACKAGE_FILE, file_path)
+    cache = ParsedFileCache()
+    recorder = _ParseRecorder()
+    cache.parse_each([file_path], None, None, recorder)
+    os.utime(file_path, ns=(0, 0))
+
+    cache.parse_each([file_path], None, None, recorder)
+
+    assert recorder.parsed_paths == [[file_path], [file_path]]
+
+
+def test_parse_each_keeps_separate_entries_per_filter():
+    cache = ParsedFileCache()
+    recorder = _ParseRecorder()
+    cache.parse_each([MULTI_PACKAGE_FILE], None, None, recorder)
+
+    cache.parse_each([MULTI_PACKAGE_FILE], None, "Other*", recorder)
+
+    assert len(recorder.parsed_paths) == 2
+    assert len(cache) == 2
+
+
+def test_parse_each_evicts_least_recently_used_files():
+    item_count = len(parser.parse(SINGLE_PACKAGE_FILE))
+    cache = ParsedFileCache(max_items=item_count + 1)
+    recorder = _ParseRecorder()
+    cache.parse_each([SINGLE_PACKAGE_FILE], None, None, recorder)
+
+    cache.parse_each([MULTI_PACKAGE_FILE], None, None, recorder)
+    cache.parse_each([SINGLE_PACKAGE_FILE], None, None, recorder)
+
+    assert recorder.parsed_paths == [
+        [SINGLE_PACKAGE_FILE],
+        [MULTI_PACKAGE_FILE],
+        [SINGLE_PACKAGE_FILE],
+    ]
+    assert len(cache) == 1
+    assert cache.item_count == item_count
+
+
+def test_parse_each_keeps_newest_file_larger_than_limit():
+    cache = ParsedFileCache(max_items=1)
+
+    cache.parse_each([MULTI_PACKAGE_FILE], None, None, parser.parse_each_file)
+
+    assert len(cache) == 1
+
+
+def test_parse_each_does_not_cache_missing_files(tmp_path):
+    file_path = str(tmp_path / "missing.xml")
+    cache = ParsedFileCache()
+
+    result = cache.parse_each([file_path], None, None, lambda paths: {file_path: []})
+
+    assert result == {file_path: []}
+    assert len(cache) == 0
+
+
+@requires_unix_sockets
+def test_request_report_returns_output_of_report(running_server, tmp_path):
+    response = request_report(
+        running_server.server_address, ["--show-branches"], str(tmp_path)
+    )
+
+    assert response == ServerResponse(0, "--show-branches\n", f"{tmp_path}\n")
+
+
+@requires_unix_sockets
+def test_request_report_returns_exit_code_of_report(running_server, tmp_path):
+    response = request_report(running_server.server_address, ["fail"], str(tmp_path))
+
+    assert response is not None
+    assert response.exit_code == 3
+
+
+@requires_unix_sockets
+def test_request_report_when_report_fails_returns_error(running_server, tmp_path):
+    response = request_report(running_server.server_address, ["error"], str(tmp_path))
+
+    assert response is not None
+    assert response.exit_code == 1
+    assert "Failed to create report: broken" in response.stderr
+
+
+@requires_unix_sockets
+def test_request_report_when_no_server_returns_none(socket_path):
+    assert request_report(socket_path, [], os.getcwd()) is None
+
+
+@requires_unix_sockets
+def test_serve_when_server_listening_raises(running_server):
+    with pytest.raises(RuntimeError):
+        server.serve(running_server.server_address, lambda argv: 0)
+
+
+@requires_unix_sockets
+def test_request_report_when_socket_accessible_to_others_returns_none(
+    running_server, tmp_path
+):
+    os.chmod(running_server.server_address, 0o666)
+
+    assert request_report(running_server.server_address, [], str(tmp_path)) is None
+
+
+@requires_unix_sockets
+def test_report_server_creates_private_socket_directory(socket_path):
+    directory = os.path.join(os.path.dirname(socket_path), "server")
+
+    with ReportServer(os.path.join(directory, "server.sock"), lambda argv: 0):
+        assert os.stat(directory).st_mode & 0o777 == 0o700
+
+
+@requires_unix_sockets
+def test_default_socket_path_is_in_directory_of_user(monkeypatch, tmp_path):
+    monkeypatch.setenv("XDG_RUNTIME_DIR", str(tmp_path))
+
+    socket_path = server.default_socket_path()
+
+    assert os.path.dirname(os.path.dirname(socket_path)) == str(tmp_path)
+    assert str(os.getuid()) in os.path.basename(os.path.dirname(socket_path))
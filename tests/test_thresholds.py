@@ -0,0 +1,125 @@
+import json
+
+import pytest
+
+from cobertura_console_reporter.thresholds import (
+    EXIT_CODES,
+    LEVEL_CLASS,
+    LEVEL_NAMESPACE,
+    LEVEL_TOTAL,
+    Threshold,
+    Thresholds,
+    ThresholdViolation,
+    exit_code,
+    is_below_percent,
+    load_thresholds,
+    parse_threshold_spec,
+)
+
+
+def test_parse_threshold_spec_without_level_returns_total():
+    assert parse_threshold_spec("line=80") == (LEVEL_TOTAL, "line", 80.0)
+
+
+def test_parse_threshold_spec_with_level_returns_level():
+    assert parse_threshold_spec("class:branch=42.5") == (LEVEL_CLASS, "branch", 42.5)
+
+
+@pytest.mark.parametrize("spec", ["line", "lines=80", "module:line=80", "line=high"])
+def test_parse_threshold_spec_when_malformed_raises_value_error(spec):
+    with pytest.raises(ValueError):
+        parse_threshold_spec(spec)
+
+
+def test_thresholds_when_empty_is_false():
+    assert not Thresholds()
+    assert Thresholds({LEVEL_TOTAL: Threshold(line=80)})
+
+
+def test_threshold_applies_longest_matching_namespace_override():
+    thresholds = Thresholds(
+        {LEVEL_CLASS: Threshold(line=80, branch=70)},
+        {
+            "App": {LEVEL_CLASS: Threshold(line=60)},
+            "App.Legacy": {LEVEL_CLASS: Threshold(line=10)},
+        },
+    )
+
+    assert thresholds.threshold(LEVEL_CLASS, "App.Legacy.Data") == Threshold(10, 70)
+    assert thresholds.threshold(LEVEL_CLASS, "App.Web") == Threshold(60, 70)
+    assert thresholds.threshold(LEVEL_CLASS, "Other") == Threshold(80, 70)
+
+
+def test_check_appends_violations_below_threshold():
+    thresholds = Thresholds({LEVEL_NAMESPACE: Threshold(line=80, branch=50)})
+    violations = []
+
+    thresholds.check(violations, LEVEL_NAMESPACE, "App", (79, 100), (0, 0))
+    thresholds.check(violations, LEVEL_NAMESPACE, "Lib", (80, 100), (1, 2))
+
+    assert violations == [ThresholdViolation(LEVEL_NAMESPACE, "App", "line", 0.79, 80)]
+
+
+@pytest.mark.parametrize(
+    "covered, total, percent", [(29, 100, 29), (57, 100, 57), (291, 1000, 29.1)]
+)
+def test_check_at_exact_threshold_appends_no_violation(covered, total, percent):
+    thresholds = Thresholds({LEVEL_TOTAL: Threshold(line=percent)})
+    violations = []
+
+    thresholds.check(violations, LEVEL_TOTAL, "", (covered, total), (0, 0))
+
+    assert not violations
+
+
+@pytest.mark.parametrize(
+    "covered, total, percent, expected",
+    [
+        (28, 100, 29, True),
+        (29, 100, 29, False),
+        (290, 1000, 29.1, True),
+        (291, 1000, 29.1, False),
+        (0, 0, 100, False),
+        (1, 3, None, False),
+    ],
+)
+def test_is_below_percent_compares_exactly(covered, total, percent, expected):
+    assert is_below_percent(covered, total, percent) is expected
+
+
+def test_load_thresholds_reads_levels_and_namespace_overrides(tmp_path):
+    file_path = tmp_path / "thresholds.json"
+    file_path.write_text(
+        json.dumps(
+            {
+                "total": {"line": 80},
+                "namespaces": {"App.Legacy": {"namespace": {"branch": 0}}},
+            }
+        )
+    )
+
+    thresholds = load_thresholds(str(file_path))
+
+    assert thresholds.levels == {LEVEL_TOTAL: Threshold(line=80)}
+    assert thresholds.namespace_overrides == {
+        "App.Legacy": {LEVEL_NAMESPACE: Threshold(branch=0)}
+    }
+
+
+def test_load_thresholds_when_level_unknown_raises_value_error(tmp_path):
+    file_path = tmp_path / "thresholds.json"
+    file_path.write_text(json.dumps({"module": {"line": 80}}))
+
+    with pytest.raises(ValueError):
+        load_thresholds(str(file_path))
+
+
+def test_exit_code_combines_levels():
+    violations = [
+        ThresholdViolation(LEVEL_TOTAL, "", "line", 0.5, 80),
+        ThresholdViolation(LEVEL_CLASS, "A", "line", 0.5, 80),
+        ThresholdViolation(LEVEL_CLASS, "B", "branch", 0.5, 80),
+    ]
+
+    assert exit_code(violations) == EXIT_CODES[LEVEL_TOTAL] | EXIT_CODES[LEVEL_CLASS]
+    assert exit_code([]) == 0
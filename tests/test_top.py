@@ -0,0 +1,81 @@
+import pytest
+
+from cobertura_console_reporter.coverage_item import CoverageItem
+from cobertura_console_reporter.metrics import compute_metrics
+from cobertura_console_reporter.coverage_table import CoverageTable
+from cobertura_console_reporter.renderers import iter_class_rows, iter_namespace_rows
+from cobertura_console_reporter.top import (
+    SORT_BRANCH_RATE,
+    SORT_LINE_RATE,
+    SORT_UNCOVERED_BRANCHES,
+    SORT_UNCOVERED_LINES,
+    select_top_rows,
+)
+
+
+def _items():
+    return [
+        CoverageItem("A.Small", "Small.cs", 4, 1, [], 10, 9, []),
+        CoverageItem("A.Large", "Large.cs", 100, 80, [], 4, 0, []),
+        CoverageItem("B.Covered", "Covered.cs", 10, 10, [], 2, 2, []),
+        CoverageItem("B.Empty", "Empty.cs", 0, 0, [], 0, 0, []),
+    ]
+
+
+@pytest.mark.parametrize(
+    "sort_key,expected",
+    [
+        (SORT_UNCOVERED_LINES, ["A.Large", "A.Small"]),
+        (SORT_LINE_RATE, ["A.Small", "A.Large"]),
+        (SORT_BRANCH_RATE, ["A.Large", "A.Small"]),
+        (SORT_UNCOVERED_BRANCHES, ["A.Large", "A.Small"]),
+    ],
+)
+def test_select_top_rows_returns_worst_rows_first(sort_key, expected):
+    rows = select_top_rows(iter_class_rows(_items()), 2, sort_key)
+
+    assert [row.name for row in rows] == expected
+
+
+def test_select_top_rows_ranks_rows_without_coverable_lines_last():
+    rows = select_top_rows(iter_class_rows(_items()), 4, SORT_LINE_RATE)
+
+    assert rows[-1].name == "B.Empty"
+
+
+def test_select_top_rows_when_count_exceeds_rows_returns_all_rows():
+    rows = select_top_rows(iter_class_rows(_items()), 10)
+
+    assert len(rows) == 4
+
+
+def test_select_top_rows_with_namespace_rows_ranks_namespaces():
+    metrics = compute_metrics(CoverageTable.from_items(_items()))
+
+    rows = select_top_rows(iter_namespace_rows(metrics), 1, SORT_LINE_RATE)
+
+    assert [row.name for row in rows] == ["A"]
+
+
+def test_select_top_rows_when_sort_key_unknown_raises_value_error():
+    with pytest.raises(ValueError):
+        select_top_rows(iter_class_rows(_items()), 1, "name")
+
+
+def test_select_top_rows_with_namespace_depth_ranks_collapsed_namespaces():
+    metrics = compute_metrics(
+        CoverageTable.from_items(
+            [
+                CoverageItem("A.B.First", "First.cs", 10, 5, [], 0, 0, []),
+                CoverageItem("A.C.Second", "Second.cs", 10, 10, [], 0, 0, []),
+                CoverageItem("D.Third", "Third.cs", 10, 8, [], 0, 0, []),
+            ]
+        )
+    )
+
+    rows = select_top_rows(iter_namespace_rows(metrics, 1), 5, SORT_LINE_RATE)
+
+    assert [(row.name, row.metrics.line_rate) for row in rows] == [
+        ("A", 0.75),
+        ("D", 0.8),
+    ]
@@ -0,0 +1,101 @@
+import os
+import shutil
+import threading
+
+import pytest
+
+from cobertura_console_reporter import parser
+from cobertura_console_reporter.watch import FileWatcher, ParsedFiles, file_signature
+
+SINGLE_PACKAGE_FILE = "sample_data/coverage.cobertura.single-package.xml"
+MULTI_PACKAGE_FILE = "sample_data/coverage.cobertura.multi-package.xml"
+
+
+def test_file_signature_when_file_missing_returns_none(tmp_path):
+    assert file_signature(str(tmp_path / "missing.xml")) is None
+
+
+def test_file_signature_when_file_modified_changes(tmp_path):
+    file_path = tmp_path / "coverage.cobertura.xml"
+    file_path.write_text("<coverage />")
+    signature = file_signature(str(file_path))
+
+    file_path.write_text("<coverage></coverage>")
+
+    assert file_signature(str(file_path)) != signature
+
+
+def test_parsed_files_parse_returns_merged_items():
+    parsed_files = ParsedFiles(parser.parse_each_file)
+
+    result = parsed_files.parse([SINGLE_PACKAGE_FILE, MULTI_PACKAGE_FILE])
+
+    assert result == parser.parse_files([SINGLE_PACKAGE_FILE, MULTI_PACKAGE_FILE])
+
+
+def test_parsed_files_parse_only_parses_changed_files(tmp_path):
+    first = str(tmp_path / "first.xml")
+    second = str(tmp_path / "second.xml")
+    shutil.copy(SINGLE_PACKAGE_FILE, first)
+    shutil.copy(MULTI_PACKAGE_FILE, second)
+    parsed_paths = []
+
+    def parse_each(file_paths):
+        parsed_paths.append(file_paths)
+        return parser.parse_each_file(file_paths)
+
+    parsed_files = ParsedFiles(parse_each)
+    parsed_files.parse([first, second])
+    os.utime(second, ns=(0, 0))
+
+    parsed_files.parse([first, second])
+
+    assert parsed_paths == [[first, second], [second]]
+
+
+def test_parsed_files_retain_drops_other_files():
+    parsed_files = ParsedFiles(parser.parse_each_file)
+    parsed_files.parse([SINGLE_PACKAGE_FILE, MULTI_PACKAGE_FILE])
+
+    parsed_files.retain([MULTI_PACKAGE_FILE])
+
+    assert SINGLE_PACKAGE_FILE not in parsed_files
+    assert MULTI_PACKAGE_FILE in parsed_files
+
+
+@pytest.mark.parametrize("use_inotify", [True, False])
+def test_file_watcher_wait_for_changes_returns_changed_files(tmp_path, use_inotify):
+    first = tmp_path / "first.xml"
+    second = tmp_path / "second.xml"
+    first.write_text("<coverage />")
+    second.write_text("<coverage />")
+
+    with FileWatcher(
+        lambda: [str(first), str(second)],
+        poll_interval=0.05,
+        debounce=0.05,
+        use_inotify=use_inotify,
+    ) as watcher:
+        timer = threading.Timer(0.1, second.write_text, ["<coverage></coverage>"])
+        timer.start()
+
+        changed = watcher.wait_for_changes()
+        timer.join()
+
+    assert changed == [str(second)]
+
+
+def test_file_watcher_wait_for_changes_returns_new_files(tmp_path):
+    file_path = tmp_path / "coverage.cobertura.xml"
+
+    def list_files():
+        return [str(path) for path in tmp_path.glob("*.xml")]
+
+    with FileWatcher(list_files, poll_interval=0.05, debounce=0.05) as watcher:
+        timer = threading.Timer(0.1, file_path.write_text, ["<coverage />"])
+        timer.start()
+
+        changed = watcher.wait_for_changes()
+        timer.join()
+
+    assert changed == [str(file_path)]